@@ -4,7 +4,16 @@
 #           verdict synthesis, token cap per expert, council summary
 # =============================================================
 
-from Everything_else.model_registry import load_model_from_config, get_stop_sequence
+import time
+
+from Everything_else.model_registry import (
+    get_persona, prefetch_model, get_config_section, get_config_fingerprint, DEFAULT_N_CTX
+)
+from Everything_else.council_scheduler import ExpertJob, get_scheduler, stream_expert
+from Everything_else.expert_router import ExpertRouter, match_experts
+from Everything_else.council_cache import make_key
+from Everything_else.council_context import CouncilNotes, fit_prompt, token_counter
+from Everything_else.inference_telemetry import TELEMETRY
 
 # User-facing names for expert display
 PRETTY_NAMES = {
@@ -68,60 +77,29 @@ DEFAULT_SEQUENCE = [
 ]
 
 
-# =============================================================
-# COUNCIL ENTRY POINT — STREAMING LOGIC
-# =============================================================
-def run_council_streaming(user_prompt):
-    # === 1. SUMMARIZER STEP ===
-    summarizer_prompt = f"""
-You are the AI Council Summarizer.
+_ROUTER = None
 
-Your job:
-1. Summarize the user's request in one clear sentence.
-2. Choose 5 experts to respond ONLY from this list: Logic, Math, Coding, Emotion, Survival, Finance, Psychology, Medical, Cyber, History, People, Politics, Mental Health, and Conspiracy.
-3. Output EXACTLY:
 
-**Task Summary:** <one sentence>
-**Experts:** <comma-separated list>
+def get_router():
+    global _ROUTER
+    if _ROUTER is None:
+        _ROUTER = ExpertRouter(FIELD_DESCRIPTIONS)
+    return _ROUTER
 
-User prompt:
-{user_prompt.strip()}
 
-Do not repeat the user prompt or create more than 1 task summary.
-"""
-    llm_fn, scfg = load_model_from_config("jynx_summarizer")
-    summary_buffer = ""
+def set_router(router):
+    """Route with `router` from now on (ChatPage installs one with the user's key)."""
+    global _ROUTER
+    _ROUTER = router
 
-    for chunk in llm_fn(
-        summarizer_prompt,
-        stream_override=True,
-        max_tokens=scfg.get("max_tokens", 200),
-        temperature=scfg.get("temperature", 0.7),
-        stop=get_stop_sequence("jynx_summarizer"),
-    ):
-        token = chunk.get("choices", [{}])[0].get("text") or \
-                chunk.get("choices", [{}])[0].get("delta", {}).get("content", "")
-        if token:
-            summary_buffer += token
-            yield ("summary", token)
 
-    yield ("summary_done", summary_buffer)
-
-    # === 2. DETERMINE EXPERTS ===
-    lower = summary_buffer.lower()
-    mentioned = [k for k in EXPERT_MAP if k in lower]
-    expert_ids = [EXPERT_MAP[k] for k in mentioned] or ["jynx_expert_logic"]
-    expert_ids = expert_ids[:4]  # Cap max experts
-
-    # === 3. EXPERT RESPONSES ===
-    previous_notes = ""
-
-    for expert_id in expert_ids:
-        expert_name = PRETTY_NAMES.get(expert_id, expert_id)
-        field = FIELD_DESCRIPTIONS.get(expert_id, "your area of expertise")
-        yield ("expert_start", expert_name)
-
-        expert_prompt = f"""
+# =============================================================
+# EXPERT HELPERS
+# =============================================================
+def _expert_prompt(expert_id, user_prompt, previous_notes):
+    expert_name = PRETTY_NAMES.get(expert_id, expert_id)
+    field = FIELD_DESCRIPTIONS.get(expert_id, "your area of expertise")
+    return f"""
 You are the {expert_name}, a strict domain expert in {field}.
 
 Your Job:
@@ -133,7 +111,7 @@ User prompt:
 {user_prompt}
 
 Earlier experts:
-{previous_notes or "None yet."}
+{previous_notes}
 
 - Refer to others by name and introduce a new perspective based on your expertise.
 - Find a way to challenge earlier views.
@@ -141,34 +119,31 @@ Earlier experts:
 
 Your Response:
 """
-        llm_fn, ecfg = load_model_from_config(expert_id)
-        expert_buffer = ""
-        token_count = 0
-        token_limit = ecfg.get("generation_token_limit", 400)
 
-        for chunk in llm_fn(
-            expert_prompt,
-            stream_override=True,
-            max_tokens=ecfg.get("max_tokens", 2048),
-            temperature=ecfg.get("temperature", 0.7),
-            stop=get_stop_sequence(expert_id),
-        ):
-            token = chunk.get("choices", [{}])[0].get("text") or \
-                    chunk.get("choices", [{}])[0].get("delta", {}).get("content", "")
-            if token:
-                expert_buffer += token
-                token_count += 1
-                yield ("expert_token", expert_name, token)
-                if token_count >= token_limit:
-                    break
 
-        previous_notes += f"{expert_name} says:\n{expert_buffer}\n\n"
-        yield ("expert_done", expert_name, expert_buffer)
+def _rebuttal_prompt(expert_id, user_prompt, opening_notes):
+    expert_name = PRETTY_NAMES.get(expert_id, expert_id)
+    field = FIELD_DESCRIPTIONS.get(expert_id, "your area of expertise")
+    return f"""
+You are the {expert_name}, a strict domain expert in {field}.
+
+User prompt:
+{user_prompt}
+
+Opening answers from the council:
+{opening_notes}
+
+Your Job:
+- In ONE short paragraph, challenge the weakest point another expert made, by name.
+- Or sharpen your own answer with what the others missed.
+- Do NOT repeat your opening answer.
+
+Your Rebuttal:
+"""
 
-    # === 4. FINAL VERDICT ===
-    yield ("verdict_start", "")
 
-    verdict_prompt = f"""
+def _verdict_prompt(user_prompt, summary, notes_text):
+    return f"""
 You are the Final Verdict AI.
 
 Your job:
@@ -182,23 +157,252 @@ Original prompt:
 {user_prompt}
 
 Summary:
-{summary_buffer.strip()}
+{summary.strip()}
 
 Expert responses:
-{previous_notes.strip()}
+{notes_text.strip()}
 
 Final Verdict:
 """
 
-    llm_fn, vcfg = load_model_from_config("jynx_summarizer")
+
+# Chat template tokens wrapped around every prompt
+TEMPLATE_OVERHEAD = 32
+
+
+def _fit(persona, build, notes, council_config, answer_tokens, budget=None):
+    """
+    build(notes_text) for `persona`, with the earlier answers squeezed so the
+    prompt, system prompt and room for the answer fit its n_ctx.
+    """
+    n_ctx = persona.config.get("n_ctx", DEFAULT_N_CTX)
+    with token_counter(persona) as count:
+        reserve = (min(answer_tokens, council_config.get("answer_reserve", 512))
+                   + count(persona.config.get("system_prompt", "")) + TEMPLATE_OVERHEAD)
+        return fit_prompt(build, notes, count, n_ctx, reserve, budget)
+
+
+def _expert_job(expert_id, prompt, max_tokens=None):
+    config = get_persona(expert_id).config
+    limit = min(config.get("max_tokens", 2048), config.get("generation_token_limit", 400))
+    return ExpertJob(
+        expert_id,
+        PRETTY_NAMES.get(expert_id, expert_id),
+        prompt,
+        max_tokens=min(max_tokens or limit, limit),
+        temperature=config.get("temperature", 0.7),
+    )
+
+
+# =============================================================
+# COUNCIL ENTRY POINT — STREAMING LOGIC
+# =============================================================
+def run_council_streaming(user_prompt, cancel=None, mode=None, skip_summary=None,
+                          cache=None, force_refresh=False):
+    """
+    Yield council events as they stream. If `cancel` (a CancelToken) fires,
+    the current stage stops at the next token and ("cancelled", "") ends the run.
+
+    mode "chain" (default) runs experts one after another, each reading the
+    earlier answers. "sequential", "batched" or "parallel" pick a scheduler
+    from council_scheduler for an independent opening round plus a short
+    rebuttal round; expert_token events of different experts may then arrive
+    interleaved. Defaults to models.yaml council.mode.
+
+    With council.router enabled, experts are picked locally from the prompt
+    before the summary starts, so their weights warm while it streams.
+    skip_summary (default council.skip_summary) drops the summarizer call.
+
+    With a CouncilCache, a finished run is stored and the same question to
+    the same experts with unchanged models/config is replayed instantly,
+    preceded by ("cache_hit", ""). force_refresh ignores a stored run.
+    """
+    council_config = get_config_section("council")
+    use_router = council_config.get("router", True)
+    mode = mode or council_config.get("mode", "chain")
+    if skip_summary is None:
+        skip_summary = council_config.get("skip_summary", False)
+    skip_summary = bool(skip_summary and use_router)
+
+    routed = get_router().route(user_prompt) if use_router else None
+
+    key = None
+    if cache is not None:
+        # Without the router any expert may be chosen, so all of them count
+        model_ids = ["jynx_summarizer"] + (routed or list(EXPERT_MAP.values()))
+        fingerprint = get_config_fingerprint(model_ids, sections=("council",))
+        key = make_key(user_prompt, routed, fingerprint, {"mode": mode, "skip_summary": skip_summary})
+        events = None if force_refresh else cache.get(key)
+        if events:
+            TELEMETRY.record({"kind": "council", "total_s": 0.0, "stages": [], "cached": True})
+            yield ("cache_hit", "")
+            yield from events
+            return
+
+    events = []
+    for event in _run_council(user_prompt, cancel, mode, skip_summary, routed, council_config):
+        events.append(event)
+        yield event
+
+    # Only complete runs are worth replaying
+    if key is not None and events and events[-1] == ("done", ""):
+        cache.put(key, events)
+
+
+def _run_council(user_prompt, cancel, mode, skip_summary, routed, council_config):
+    if routed:
+        prefetch_model(routed[0])
+
+    # === 1. SUMMARIZER STEP ===
+    summarizer_prompt = f"""
+You are the AI Council Summarizer.
+
+Your job:
+1. Summarize the user's request in one clear sentence.
+2. Choose 5 experts to respond ONLY from this list: Logic, Math, Coding, Emotion, Survival, Finance, Psychology, Medical, Cyber, History, People, Politics, Mental Health, and Conspiracy.
+3. Output EXACTLY:
+
+**Task Summary:** <one sentence>
+**Experts:** <comma-separated list>
+
+User prompt:
+{user_prompt.strip()}
+
+Do not repeat the user prompt or create more than 1 task summary.
+"""
+    council_start = stage_start = time.perf_counter()
+    stages = []
+
+    if skip_summary:
+        summary_buffer = "**Experts:** " + ", ".join(PRETTY_NAMES.get(e, e) for e in routed)
+        yield ("summary", summary_buffer)
+    else:
+        # Personas share one pooled Llama — switching roles never reloads weights
+        summarizer = get_persona("jynx_summarizer")
+        summary_buffer = ""
+
+        for chunk in summarizer(
+            summarizer_prompt,
+            stream_override=True,
+            max_tokens=summarizer.config.get("max_tokens", 200),
+            temperature=summarizer.config.get("temperature", 0.7),
+            stop=summarizer.stop,
+            cancel=cancel,
+        ):
+            token = chunk.get("choices", [{}])[0].get("text") or \
+                    chunk.get("choices", [{}])[0].get("delta", {}).get("content", "")
+            if token:
+                summary_buffer += token
+                yield ("summary", token)
+
+    if cancel is not None and cancel.cancelled:
+        yield ("cancelled", "")
+        return
+    yield ("summary_done", summary_buffer)
+    stages.append(("Summary", time.perf_counter() - stage_start))
+
+    # === 2. DETERMINE EXPERTS ===
+    mentioned = [] if skip_summary else match_experts(summary_buffer, EXPERT_MAP)[:4]
+    if routed:
+        expert_ids = routed
+        # The summarizer's picks teach the router for next time
+        if mentioned:
+            get_router().record(user_prompt, mentioned)
+    else:
+        expert_ids = mentioned or ["jynx_expert_logic"]
+        prefetch_model(expert_ids[0])
+
+    # === 3. EXPERT RESPONSES ===
+    # Earlier answers as later stages see them — a fixed budget however many experts spoke
+    notes = CouncilNotes(council_config.get("notes_tokens", 600))
+
+    if mode == "chain":
+        for i, expert_id in enumerate(expert_ids):
+            # Warm the next stage's weights while this expert streams
+            next_id = expert_ids[i + 1] if i + 1 < len(expert_ids) else "jynx_summarizer"
+            prefetch_model(next_id)
+
+            stage_start = time.perf_counter()
+            expert_name = PRETTY_NAMES.get(expert_id, expert_id)
+            yield ("expert_start", expert_name)
+
+            expert = get_persona(expert_id)
+            expert_prompt = _fit(
+                expert,
+                lambda text: _expert_prompt(expert_id, user_prompt, text or "None yet."),
+                notes, council_config, expert.config.get("generation_token_limit", 400),
+            )
+            expert_buffer = yield from stream_expert(expert_name, expert, expert_prompt, cancel)
+
+            if cancel is not None and cancel.cancelled:
+                yield ("cancelled", "")
+                return
+            notes.add(f"{expert_name} says:", expert_buffer)
+            yield ("expert_done", expert_name, expert_buffer)
+            stages.append((expert_name, time.perf_counter() - stage_start))
+    else:
+        # Independent opening round, then a short rebuttal round
+        scheduler = get_scheduler(mode, council_config.get("max_workers"))
+        prefetch_model("jynx_summarizer")
+
+        stage_start = time.perf_counter()
+        jobs = [
+            _expert_job(expert_id, _expert_prompt(
+                expert_id, user_prompt, "None — every expert answers independently this round."))
+            for expert_id in dict.fromkeys(expert_ids)
+        ]
+        for job in jobs:
+            job.prompt = _fit(get_persona(job.expert_id), lambda _, p=job.prompt: p,
+                              notes, council_config, job.max_tokens)
+        opening = yield from scheduler.run_round(jobs, cancel)
+        if cancel is not None and cancel.cancelled:
+            yield ("cancelled", "")
+            return
+        for job in jobs:
+            notes.add(f"{job.name} says:", opening.get(job.name, ""))
+        stages.append((f"Opening round ({scheduler.name})", time.perf_counter() - stage_start))
+
+        if council_config.get("rebuttal", True) and len(jobs) > 1:
+            stage_start = time.perf_counter()
+            rebuttals = [
+                _expert_job(job.expert_id, "", max_tokens=council_config.get("rebuttal_tokens", 150))
+                for job in jobs
+            ]
+            for job in rebuttals:
+                job.name = f"{job.name} (Rebuttal)"
+                job.prompt = _fit(
+                    get_persona(job.expert_id),
+                    lambda text, expert_id=job.expert_id: _rebuttal_prompt(expert_id, user_prompt, text),
+                    notes, council_config, job.max_tokens,
+                )
+            replies = yield from scheduler.run_round(rebuttals, cancel)
+            if cancel is not None and cancel.cancelled:
+                yield ("cancelled", "")
+                return
+            for job in rebuttals:
+                notes.add(f"{job.name}:", replies.get(job.name, ""))
+            stages.append((f"Rebuttal round ({scheduler.name})", time.perf_counter() - stage_start))
+
+    # === 4. FINAL VERDICT ===
+    stage_start = time.perf_counter()
+    yield ("verdict_start", "")
+
+    verdict = get_persona("jynx_summarizer")
+    verdict_prompt = _fit(
+        verdict,
+        lambda text: _verdict_prompt(user_prompt, summary_buffer, text),
+        notes, council_config, verdict.config.get("max_tokens", 1024),
+        budget=council_config.get("verdict_notes_tokens", 1200),
+    )
     verdict_buffer = ""
 
-    for chunk in llm_fn(
+    for chunk in verdict(
         verdict_prompt,
         stream_override=True,
-        max_tokens=vcfg.get("max_tokens", 1024),
-        temperature=vcfg.get("temperature", 0.7),
-        stop=get_stop_sequence("jynx_summarizer"),
+        max_tokens=verdict.config.get("max_tokens", 1024),
+        temperature=verdict.config.get("temperature", 0.7),
+        stop=verdict.stop,
+        cancel=cancel,
     ):
         token = chunk.get("choices", [{}])[0].get("text") or \
                 chunk.get("choices", [{}])[0].get("delta", {}).get("content", "")
@@ -206,5 +410,10 @@ Final Verdict:
             verdict_buffer += token
             yield ("verdict_token", token)
 
+    if cancel is not None and cancel.cancelled:
+        yield ("cancelled", "")
+        return
     yield ("verdict_done", verdict_buffer)
+    stages.append(("Final Verdict", time.perf_counter() - stage_start))
+    TELEMETRY.record({"kind": "council", "total_s": time.perf_counter() - council_start, "stages": stages})
     yield ("done", "")
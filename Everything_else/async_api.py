@@ -0,0 +1,144 @@
+# ============================================================
+#   async_api.py — Asyncio Front End for Chat and the Council
+# ============================================================
+#
+# The registry and council are synchronous generators built for a QThread.
+# This module runs each request on its own worker thread and hands the
+# results to asyncio through a bounded queue, so scripts, a local server
+# or tests can drive many requests at once without Qt:
+#
+#   async for text in achat("jynx_default", "Where do I find water?"):
+#       ...
+#   async for event in acouncil("Plan a week off-grid", timeout=300):
+#       ...
+#
+# Backpressure: a worker blocks once `maxsize` items wait unread, so a
+# slow consumer slows decoding instead of buffering the whole reply.
+# Timeouts (`timeout` for the whole request, `idle_timeout` between
+# items) raise GenerationTimeout. Timing out, cancelling the task or
+# closing the stream early (aclose(), or `async with aclosing(...)` around
+# a loop that may break) fires the CancelToken and stops decoding at the
+# next token. Requests on the same weights take turns (ModelPool.decode_lock);
+# requests on different models, loads and disk I/O overlap.
+
+import asyncio
+import concurrent.futures
+import threading
+
+from Everything_else.cancellation import CancelToken
+from Everything_else.inference_telemetry import chunk_text
+from Everything_else.model_registry import get_persona, load_model_from_config
+
+DEFAULT_QUEUE_SIZE = 64
+
+# How often a worker blocked on a full queue checks for cancellation
+POLL_S = 0.1
+
+
+class GenerationTimeout(TimeoutError):
+    """A request produced nothing within its timeout; decoding was cancelled."""
+
+
+async def stream(factory, cancel=None, maxsize=DEFAULT_QUEUE_SIZE, timeout=None, idle_timeout=None):
+    """
+    Run the synchronous generator `factory(cancel)` on a worker thread and
+    yield its items. This is the bridge the other functions are built on.
+    """
+    cancel = cancel or CancelToken()
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize)
+
+    def put(message):
+        # Blocks the worker while the queue is full
+        future = asyncio.run_coroutine_threadsafe(queue.put(message), loop)
+        while True:
+            try:
+                future.result(timeout=POLL_S)
+                return True
+            except concurrent.futures.TimeoutError:
+                if cancel.cancelled:
+                    future.cancel()
+                    return False
+
+    def produce():
+        try:
+            items = factory(cancel)
+            try:
+                for item in items:
+                    if cancel.cancelled or not put(("item", item)):
+                        return
+            finally:
+                close = getattr(items, "close", None)
+                if close:
+                    close()
+        except Exception as exc:
+            put(("error", exc))
+            return
+        put(("done", None))
+
+    worker = threading.Thread(target=produce, name="ghostdrive-async", daemon=True)
+    worker.start()
+
+    deadline = loop.time() + timeout if timeout is not None else None
+    try:
+        while True:
+            wait = idle_timeout
+            if deadline is not None:
+                left = max(0.0, deadline - loop.time())
+                wait = left if wait is None else min(wait, left)
+            try:
+                kind, payload = await asyncio.wait_for(queue.get(), wait)
+            except asyncio.TimeoutError:
+                cancel.cancel("timeout")
+                raise GenerationTimeout(f"Request timed out after waiting {wait:.1f}s") from None
+            if kind == "done":
+                return
+            if kind == "error":
+                raise payload
+            yield payload
+    finally:
+        if worker.is_alive():
+            cancel.cancel()
+            await asyncio.to_thread(worker.join)
+
+
+def achat(model_id, prompt, max_tokens=None, temperature=None, cancel=None,
+          timeout=None, idle_timeout=None, maxsize=DEFAULT_QUEUE_SIZE):
+    """Stream one persona reply as text pieces."""
+
+    def generate(token):
+        persona = get_persona(model_id)
+        result = persona(prompt, stream_override=True, max_tokens=max_tokens,
+                         temperature=temperature, cancel=token)
+        try:
+            for chunk in result:
+                text = chunk_text(chunk)
+                if text:
+                    yield text
+        finally:
+            result.close()
+
+    return stream(generate, cancel, maxsize, timeout, idle_timeout)
+
+
+def acouncil(user_prompt, cancel=None, mode=None, skip_summary=None, cache=None,
+             force_refresh=False, timeout=None, idle_timeout=None, maxsize=DEFAULT_QUEUE_SIZE):
+    """Stream council events, the same tuples as run_council_streaming."""
+    from Everything_else.ai_council import run_council_streaming
+
+    def generate(token):
+        return run_council_streaming(user_prompt, cancel=token, mode=mode, skip_summary=skip_summary,
+                                     cache=cache, force_refresh=force_refresh)
+
+    return stream(generate, cancel, maxsize, timeout, idle_timeout)
+
+
+async def complete(model_id, prompt, **kwargs):
+    """The whole persona reply as one string; takes achat's keyword arguments."""
+    return "".join([text async for text in achat(model_id, prompt, **kwargs)])
+
+
+async def load(model_id):
+    """Load (or find in the pool) a model without blocking the event loop."""
+    persona, _config = await asyncio.to_thread(load_model_from_config, model_id)
+    return persona
@@ -0,0 +1,270 @@
+# ============================================================
+#   batched_decode.py — Several Prompts, One Context, One Pass
+# ============================================================
+#
+# Council experts that live in the same GGUF can be decoded together:
+# every sequence gets its own seq_id in a single llama context and each
+# llama_decode() call advances all of them by one token. Decoding is
+# memory-bandwidth bound, so N sequences cost little more than one.
+#
+# Uses the low-level llama_cpp API on a fresh context over the pooled
+# model's weights; the Llama object's own context and KV cache are left
+# untouched. open_batch() raises BatchedDecodeUnavailable when the
+# installed llama_cpp can't do this, and callers decode sequentially.
+# Callers hold the model's decode lock for the whole batch.
+
+import codecs
+import time
+
+
+class BatchedDecodeUnavailable(RuntimeError):
+    pass
+
+
+class SequenceRequest:
+    def __init__(self, prompt, max_tokens=400, temperature=0.7, top_p=0.95, top_k=40, stop=None, guard=None):
+        self.prompt = prompt
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.top_p = top_p
+        self.top_k = top_k
+        self.stop = [s for s in (stop or []) if s]
+        # RepetitionGuard: a looping sequence ends early, freeing its batch slot
+        self.guard = guard
+
+
+def sample_token(logits, temperature, top_k, top_p, rng):
+    """Temperature / top-k / top-p sampling over one row of logits."""
+    import numpy as np
+
+    if temperature <= 0:
+        return int(np.argmax(logits))
+
+    logits = logits.astype(np.float64) / temperature
+    if 0 < top_k < len(logits):
+        candidates = np.argpartition(logits, -top_k)[-top_k:]
+    else:
+        candidates = np.arange(len(logits))
+
+    probs = np.exp(logits[candidates] - logits[candidates].max())
+    probs /= probs.sum()
+
+    if top_p < 1.0:
+        order = np.argsort(-probs)
+        keep = order[:int(np.searchsorted(np.cumsum(probs[order]), top_p)) + 1]
+        candidates, probs = candidates[keep], probs[keep] / probs[keep].sum()
+
+    return int(rng.choice(candidates, p=probs))
+
+
+class _Sequence:
+    """Per-sequence decode state: position, UTF-8 decoder and stop-string hold-back."""
+
+    def __init__(self, seq_id, request, tokens):
+        self.seq_id = seq_id
+        self.request = request
+        self.tokens = tokens
+        self.pos = len(tokens)
+        self.generated = 0
+        self.next_token = None
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.pending = ""
+        self.hold = max((len(s) for s in request.stop), default=1) - 1
+        self.done = False
+
+    def feed(self, piece):
+        """Add detokenized bytes; return text that is safe to emit now."""
+        self.pending += self.decoder.decode(piece)
+        hits = [i for i in (self.pending.find(s) for s in self.request.stop) if i >= 0]
+        if hits:
+            text, self.pending, self.done = self.pending[:min(hits)], "", True
+            return text
+        safe = max(0, len(self.pending) - self.hold)
+        text, self.pending = self.pending[:safe], self.pending[safe:]
+        return text
+
+    def flush(self):
+        text = self.pending + self.decoder.decode(b"", final=True)
+        self.pending = ""
+        return text
+
+
+class LlamaBatchContext:
+    """
+    A fresh multi-sequence llama context over `llm`'s weights: prefill()
+    and step() run llama_decode and sample each sequence's next token.
+    """
+
+    def __init__(self, llm, sequences, n_batch=512, seed=None):
+        try:
+            import llama_cpp
+            import numpy as np
+        except ImportError as e:
+            raise BatchedDecodeUnavailable(str(e)) from e
+
+        for name in ("llama_batch_init", "llama_batch_free", "llama_decode",
+                     "llama_get_logits_ith", "llama_new_context_with_model", "llama_free"):
+            if not hasattr(llama_cpp, name):
+                raise BatchedDecodeUnavailable(f"llama_cpp.{name} is not available")
+
+        self._llama_cpp = llama_cpp
+        self.n_batch = n_batch
+        self.n_vocab = llm.n_vocab()
+        self.rng = np.random.default_rng(seed)
+
+        # Unified KV cache: every sequence needs its own cells
+        n_ctx = sum(len(s.tokens) + s.request.max_tokens for s in sequences)
+        params = llama_cpp.llama_context_default_params()
+        params.n_ctx = n_ctx
+        params.n_batch = max(n_batch, len(sequences))
+        if hasattr(params, "n_seq_max"):
+            params.n_seq_max = len(sequences)
+        try:
+            params.n_threads = llm.context_params.n_threads
+            params.n_threads_batch = llm.context_params.n_threads_batch
+        except AttributeError:
+            pass
+
+        self.ctx = llama_cpp.llama_new_context_with_model(llm.model, params)
+        if not self.ctx:
+            raise BatchedDecodeUnavailable(f"could not create a {n_ctx}-token batch context")
+        self.batch = llama_cpp.llama_batch_init(params.n_batch, 0, len(sequences))
+
+    def close(self):
+        if self.batch is not None:
+            self._llama_cpp.llama_batch_free(self.batch)
+            self.batch = None
+        if self.ctx:
+            self._llama_cpp.llama_free(self.ctx)
+            self.ctx = None
+
+    def _decode(self, entries):
+        """entries: [(token, pos, seq_id, want_logits)] → {batch index: logits copy}."""
+        import numpy as np
+
+        batch = self.batch
+        batch.n_tokens = len(entries)
+        for i, (token, pos, seq_id, want_logits) in enumerate(entries):
+            batch.token[i] = token
+            batch.pos[i] = pos
+            batch.n_seq_id[i] = 1
+            batch.seq_id[i][0] = seq_id
+            batch.logits[i] = want_logits
+
+        status = self._llama_cpp.llama_decode(self.ctx, batch)
+        if status != 0:
+            raise RuntimeError(f"llama_decode failed with status {status}")
+
+        rows = {}
+        for i, entry in enumerate(entries):
+            if entry[3]:
+                ptr = self._llama_cpp.llama_get_logits_ith(self.ctx, i)
+                rows[i] = np.ctypeslib.as_array(ptr, shape=(self.n_vocab,)).copy()
+        return rows
+
+    def _sample(self, seq, logits):
+        r = seq.request
+        seq.next_token = sample_token(logits, r.temperature, r.top_k, r.top_p, self.rng)
+
+    def prefill(self, seq):
+        """Evaluate `seq`'s prompt and sample its first token."""
+        tokens = seq.tokens
+        for start in range(0, len(tokens), self.n_batch):
+            chunk = tokens[start:start + self.n_batch]
+            last = start + len(chunk) == len(tokens)
+            entries = [(tok, start + j, seq.seq_id, last and j == len(chunk) - 1)
+                       for j, tok in enumerate(chunk)]
+            rows = self._decode(entries)
+        self._sample(seq, rows[len(entries) - 1])
+
+    def step(self, active):
+        """Feed every active sequence's token back in one llama_decode; sample the next."""
+        entries = [(seq.next_token, seq.pos, seq.seq_id, True) for seq in active]
+        rows = self._decode(entries)
+        for i, seq in enumerate(active):
+            seq.pos += 1
+            self._sample(seq, rows[i])
+
+
+class BatchedDecoder:
+    """
+    Decode several prompts against one model at once.
+    stream() yields (index, text) for new text and (index, None) when a
+    sequence finishes, in whatever order the sequences produce them.
+
+    The decode context comes from `llm.batch_context(sequences)` when the
+    model provides one (FakeLlama does), else a LlamaBatchContext.
+    """
+
+    def __init__(self, llm, requests, n_batch=512, seed=None):
+        self.llm = llm
+        self.requests = list(requests)
+        self.eos = llm.token_eos()
+        self.sequences = [
+            _Sequence(i, r, llm.tokenize(r.prompt.encode("utf-8"), special=True))
+            for i, r in enumerate(self.requests)
+        ]
+        make_context = getattr(llm, "batch_context", None)
+        if make_context is not None:
+            self.context = make_context(self.sequences)
+        else:
+            self.context = LlamaBatchContext(llm, self.sequences, n_batch=n_batch, seed=seed)
+        self.prompt_tokens = sum(len(s.tokens) for s in self.sequences)
+        self.tokens_saved = 0
+
+    def close(self):
+        self.context.close()
+
+    # --------------------------------------------------------
+    # Decode loop
+    # --------------------------------------------------------
+    def stream(self, cancel=None):
+        try:
+            started = time.perf_counter()
+            for seq in self.sequences:
+                self.context.prefill(seq)
+            self.prompt_eval_s = time.perf_counter() - started
+
+            active = list(self.sequences)
+            while active:
+                if cancel is not None and cancel.cancelled:
+                    return
+
+                # Emit the sampled tokens, then feed them back in one batch
+                still_active = []
+                for seq in active:
+                    token = seq.next_token
+                    if token == self.eos or seq.generated >= seq.request.max_tokens:
+                        seq.done = True
+                    else:
+                        seq.generated += 1
+                        text = seq.feed(self.llm.detokenize([token]))
+                        if text:
+                            yield seq.seq_id, text
+                            guard = seq.request.guard
+                            if guard is not None and guard.feed(text):
+                                seq.done = True
+                                self.tokens_saved += seq.request.max_tokens - seq.generated
+                    if seq.done:
+                        tail = seq.flush()
+                        if tail:
+                            yield seq.seq_id, tail
+                        yield seq.seq_id, None
+                    else:
+                        still_active.append(seq)
+                active = still_active
+                if not active:
+                    break
+                self.context.step(active)
+        finally:
+            self.close()
+
+
+def open_batch(llm, requests, n_batch=512):
+    """BatchedDecoder for `requests`, or BatchedDecodeUnavailable."""
+    try:
+        return BatchedDecoder(llm, requests, n_batch=n_batch)
+    except BatchedDecodeUnavailable:
+        raise
+    except Exception as e:
+        raise BatchedDecodeUnavailable(str(e)) from e
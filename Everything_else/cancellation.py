@@ -0,0 +1,41 @@
+# ============================================================
+#   cancellation.py — Cooperative Cancellation for Generation
+# ============================================================
+#
+# A CancelToken is handed to a persona call or a council run. Decoding
+# checks it between tokens and stops by closing the llama generator,
+# which leaves the shared Llama instance ready for the next request.
+
+import threading
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = None
+
+    def cancel(self, reason="cancelled"):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """Sleep up to `timeout` seconds; returns True if cancelled meanwhile."""
+        return self._event.wait(timeout)
+
+
+def cancellable(stream, cancel):
+    """Yield from `stream` until `cancel` fires, then close the stream."""
+    try:
+        for chunk in stream:
+            if cancel is not None and cancel.cancelled:
+                break
+            yield chunk
+    finally:
+        close = getattr(stream, "close", None)
+        if close:
+            close()
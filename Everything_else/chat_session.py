@@ -0,0 +1,164 @@
+# ============================================================
+#   chat_session.py — Multi-Turn Chat on a Reused llama Context
+# ============================================================
+#
+# A ChatSession remembers the turns of one conversation and sends them
+# with every new prompt. The formatted conversation only grows at the
+# end, and llama.cpp skips the tokens its KV cache already holds, so a
+# turn evaluates roughly the new user message plus the previous reply's
+# closing tokens — about what single-turn chat costs.
+#
+# When the prompt would leave less than reply_reserve tokens of n_ctx,
+# the oldest turns are shifted out until keep_ratio of the window is in
+# use. Shifting in one larger step means the conversation is re-evaluated
+# once per shift rather than on every turn after the window is full.
+#   policy: window     — shifted turns are forgotten
+#   policy: summarize  — shifted turns are folded into a short running
+#                        summary (written by the summarizer persona) that
+#                        rides along in the system prompt
+#
+# Settings live in models.yaml `chat:`.
+
+from Everything_else.model_registry import (
+    get_persona, get_config_section, format_prompt, DEFAULT_N_CTX
+)
+from Everything_else.council_context import token_counter
+from Everything_else.inference_telemetry import chunk_text
+
+DEFAULTS = {
+    "history": True,
+    "policy": "window",
+    "keep_ratio": 0.5,
+    "reply_reserve": 512,
+    "summary_tokens": 160,
+    "summarizer": "jynx_summarizer",
+}
+
+POLICIES = ("window", "summarize")
+
+SUMMARY_PROMPT = (
+    "Summarize this conversation in a few sentences for your own memory. "
+    "Keep names, numbers, decisions and open questions.\n\n{text}"
+)
+
+
+def _result_text(result):
+    """Text of a non-streamed completion or chat completion."""
+    if not isinstance(result, dict):
+        return "".join(chunk_text(c) for c in result)
+    choice = (result.get("choices") or [{}])[0]
+    return choice.get("text") or (choice.get("message") or {}).get("content") or ""
+
+
+class ChatSession:
+    def __init__(self, persona, policy="window", keep_ratio=0.5, reply_reserve=512,
+                 summary_tokens=160, summarizer="jynx_summarizer", history=True, n_ctx=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown chat policy '{policy}' (use {', '.join(POLICIES)})")
+        self.persona = persona
+        self.policy = policy
+        self.keep_ratio = keep_ratio
+        self.reply_reserve = reply_reserve
+        self.summary_tokens = summary_tokens
+        self.summarizer = summarizer
+        self.history = history
+        self.n_ctx = n_ctx
+        self.turns = []
+        self.summary = ""
+        self.shifted = 0
+
+    @classmethod
+    def from_config(cls, persona):
+        settings = dict(DEFAULTS)
+        settings.update(get_config_section("chat"))
+        return cls(
+            persona,
+            policy=settings["policy"],
+            keep_ratio=float(settings["keep_ratio"]),
+            reply_reserve=int(settings["reply_reserve"]),
+            summary_tokens=int(settings["summary_tokens"]),
+            summarizer=settings["summarizer"],
+            history=bool(settings["history"]),
+        )
+
+    def reset(self):
+        """Start a new conversation."""
+        self.turns = []
+        self.summary = ""
+
+    def context_note(self):
+        return f"Earlier in this conversation: {self.summary}" if self.summary else None
+
+    # --------------------------------------------------------
+    # Turns
+    # --------------------------------------------------------
+    def send(self, prompt, max_tokens=None, temperature=None, cancel=None):
+        """Stream the reply to `prompt` (persona chunks); the turn is kept once it ends."""
+        if not self.history:
+            return self.persona(prompt, stream_override=True, max_tokens=max_tokens,
+                                temperature=temperature, cancel=cancel)
+        self._make_room(prompt, max_tokens)
+        stream = self.persona(prompt, stream_override=True, max_tokens=max_tokens,
+                              temperature=temperature, cancel=cancel,
+                              history=list(self.turns), context_note=self.context_note())
+        return self._record(prompt, stream)
+
+    def _record(self, prompt, stream):
+        parts = []
+        try:
+            for chunk in stream:
+                parts.append(chunk_text(chunk))
+                yield chunk
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+            # A stopped reply stays too: it was shown and it is in the KV cache
+            reply = "".join(parts).strip()
+            if reply:
+                self.turns.append((prompt, reply))
+
+    # --------------------------------------------------------
+    # Context window
+    # --------------------------------------------------------
+    def _prompt_tokens(self, prompt, count):
+        persona = self.persona
+        note = self.context_note()
+        system_prompt = persona.config.get("system_prompt", "You are a helpful assistant.")
+        if note:
+            system_prompt = f"{system_prompt}\n\n{note}"
+        return count(format_prompt(prompt, persona.model_id, system_prompt,
+                                   getattr(persona, "template", None), history=self.turns))
+
+    def _make_room(self, prompt, max_tokens):
+        with token_counter(self.persona) as count:
+            self._shift(prompt, max_tokens, count)
+
+    def _shift(self, prompt, max_tokens, count):
+        n_ctx = self.n_ctx or self.persona.config.get("n_ctx", DEFAULT_N_CTX)
+        reply = min(max_tokens or self.persona.config.get("max_tokens", 256), self.reply_reserve)
+        if not self.turns or self._prompt_tokens(prompt, count) <= n_ctx - reply:
+            return
+
+        target = int((n_ctx - reply) * self.keep_ratio)
+        shifted = []
+        while self.turns and self._prompt_tokens(prompt, count) > target:
+            shifted.append(self.turns.pop(0))
+        self.shifted += len(shifted)
+        print(f"[Jynx] Chat window full: shifted out {len(shifted)} earlier turns ({self.policy})")
+        if self.policy == "summarize":
+            self._summarize(shifted)
+
+    def _summarize(self, shifted):
+        text = "\n".join(f"Q: {user}\nA: {reply}" for user, reply in shifted)
+        if self.summary:
+            text = f"Summary so far: {self.summary}\n{text}"
+        try:
+            result = get_persona(self.summarizer)(SUMMARY_PROMPT.format(text=text), stream_override=False,
+                                                  max_tokens=self.summary_tokens)
+            summary = _result_text(result).strip()
+        except Exception as e:
+            print(f"[Jynx] Chat summary failed, keeping the window only: {e}")
+            return
+        if summary:
+            self.summary = summary
@@ -4,6 +4,7 @@ from jynx_operator_ui import execute_command
 
 PROTOCOLS = {
     "status_report": "Summarize current system status and health.",
+    "perf_report": "Summarize inference latency and throughput.",
     "soul_vent": "Encrypted journal entry",
     "blackout_mode": "Disable Wi-Fi",
     "reconnect_wifi": "Reconnect Wi-Fi",
@@ -0,0 +1,151 @@
+# ============================================================
+#   council_cache.py — Encrypted Replay Cache for Council Runs
+# ============================================================
+#
+# A finished council run is stored as its event list, encrypted with the
+# session's Fernet key. Asking the same (normalized) question of the same
+# experts with unchanged models/config replays those events instantly
+# instead of re-running summarizer, experts and verdict.
+#
+# Nothing derived from the prompt is readable on disk: entries live in
+# randomly named files and the key → file index is encrypted too.
+# Eviction is least-recently-used under a byte cap.
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(SCRIPT_DIR, "cache", "council")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+INDEX_NAME = "index.enc"
+
+
+def normalize_prompt(prompt):
+    """Case, whitespace and trailing punctuation don't change the question."""
+    text = re.sub(r"\s+", " ", prompt.lower()).strip()
+    return text.rstrip(" ?!.")
+
+
+def make_key(prompt, expert_ids, fingerprint, options=None):
+    payload = json.dumps({
+        "prompt": normalize_prompt(prompt),
+        "experts": sorted(expert_ids or []),
+        "fingerprint": fingerprint,
+        "options": options or {},
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CouncilCache:
+    def __init__(self, fernet, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.fernet = fernet
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None
+
+    @classmethod
+    def for_user(cls, username, fernet, max_bytes=DEFAULT_MAX_BYTES):
+        return cls(fernet, os.path.join(DEFAULT_CACHE_DIR, username), max_bytes)
+
+    # --------------------------------------------------------
+    # Encrypted index
+    # --------------------------------------------------------
+    def _index_path(self):
+        return os.path.join(self.cache_dir, INDEX_NAME)
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self._index_path(), "rb") as f:
+                    self._index = json.loads(self.fernet.decrypt(f.read()))
+            except FileNotFoundError:
+                self._index = {}
+            except Exception as e:
+                # Wrong key or corrupt file — start over rather than fail the council
+                print(f"[Jynx] Council cache index unreadable, starting fresh: {e}")
+                self._index = {}
+        return self._index
+
+    def _write(self, path, data):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.fernet.encrypt(data))
+        os.replace(tmp, path)
+
+    def _save_index(self):
+        self._write(self._index_path(), json.dumps(self._index).encode("utf-8"))
+
+    # --------------------------------------------------------
+    # Entries
+    # --------------------------------------------------------
+    def get(self, key):
+        """Stored event list for `key`, or None."""
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is None:
+                return None
+            path = os.path.join(self.cache_dir, entry["file"])
+            try:
+                with open(path, "rb") as f:
+                    events = json.loads(self.fernet.decrypt(f.read()))
+            except Exception:
+                index.pop(key, None)
+                self._save_index()
+                return None
+            entry["last_used"] = time.time()
+            self._save_index()
+        return [tuple(e) for e in events]
+
+    def put(self, key, events):
+        data = json.dumps([list(e) for e in events]).encode("utf-8")
+        with self._lock:
+            index = self._load_index()
+            old = index.pop(key, None)
+            if old:
+                self._remove_file(old["file"])
+            name = uuid.uuid4().hex + ".enc"
+            path = os.path.join(self.cache_dir, name)
+            try:
+                self._write(path, data)
+            except OSError as e:
+                print(f"[Jynx] Council cache write failed: {e}")
+                return
+            index[key] = {"file": name, "size": os.path.getsize(path), "last_used": time.time()}
+            self._evict()
+            self._save_index()
+
+    def _evict(self):
+        index = self._index
+        total = sum(e["size"] for e in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= index[key]["size"]
+            self._remove_file(index.pop(key)["file"])
+
+    def _remove_file(self, name):
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            for entry in self._load_index().values():
+                self._remove_file(entry["file"])
+            self._index = {}
+            self._save_index()
+
+    def stats(self):
+        with self._lock:
+            index = self._load_index()
+            return {"entries": len(index), "bytes": sum(e["size"] for e in index.values())}
@@ -0,0 +1,198 @@
+# ============================================================
+#   council_context.py — Token Budgets for Council Prompts
+# ============================================================
+#
+# Later council stages read what earlier experts said. Pasting every
+# answer in full makes each prompt longer than the last and can push the
+# verdict past n_ctx. CouncilNotes keeps the answers and renders them
+# into a fixed token budget, shared out between experts: an answer that
+# doesn't fit is cut down to its key sentences, or truncated when it has
+# none. fit_prompt() shrinks that budget until a whole prompt plus room
+# for the answer fits the model's context window.
+#
+# Tokens are counted with the persona's own tokenizer when its weights
+# are already loaded in this process (see token_counter), otherwise
+# estimated from the text length. Counting never loads a model: in
+# parallel council mode the experts' weights belong to worker processes.
+
+import re
+from contextlib import contextmanager
+
+# Below this many tokens an answer is reduced to its heading
+MIN_NOTE_TOKENS = 24
+
+# Rough tokens-per-character for models we can't tokenize locally;
+# deliberately pessimistic so estimates err towards shorter prompts
+CHARS_PER_TOKEN = 3
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_BULLET = re.compile(r"\s*(?:[-*•]|\d+[.)])\s")
+_KEY_WORDS = re.compile(
+    r"\b(should|must|need|never|always|recommend|avoid|first|best|because|instead|"
+    r"key|important|risk|worst|mistake)\b",
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+@contextmanager
+def token_counter(persona):
+    """
+    Token count function for `persona`, for one batch of counts (a prompt
+    fit): its tokenizer, resolved once, or the estimate.
+    """
+    tokenizer = getattr(persona, "tokenizer", None)
+    if tokenizer is not None:
+        with tokenizer() as count:
+            yield _safe(count) if count else estimate_tokens
+        return
+    count = getattr(persona, "count_tokens", None)
+    yield _safe(count) if count else estimate_tokens
+
+
+def _safe(count):
+    def counter(text):
+        try:
+            return count(text)
+        except Exception:
+            return estimate_tokens(text)
+    return counter
+
+
+# ------------------------------------------------------------
+# Shrinking one answer
+# ------------------------------------------------------------
+def split_sentences(text):
+    """Lines, then sentences within each line; bullets stay whole."""
+    sentences = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if _BULLET.match(line):
+            sentences.append(line)
+        else:
+            sentences.extend(s for s in _SENTENCE_END.split(line) if s)
+    return sentences
+
+
+def _score(sentence, position):
+    # Openings carry the thesis; advice, numbers and list items carry the substance
+    score = 1.0 / (1 + position)
+    score += 0.5 * len(_KEY_WORDS.findall(sentence))
+    if re.search(r"\d", sentence):
+        score += 0.5
+    if _BULLET.match(sentence):
+        score += 0.5
+    return score
+
+
+def truncate_tokens(text, budget, count, keep_tail=False):
+    """Longest head (or tail) of `text` within `budget` tokens, cut at a word."""
+    if budget <= 0:
+        return ""
+    if count(text) <= budget:
+        return text
+
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        part = text[-mid:] if keep_tail else text[:mid]
+        if count(part) + 1 <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+
+    if keep_tail:
+        part = text[-lo:] if lo else ""
+        cut = part.find(" ")
+        return "…" + (part[cut + 1:] if 0 <= cut < len(part) // 4 else part)
+    part = text[:lo]
+    cut = part.rfind(" ")
+    return (part[:cut] if cut > len(part) * 3 // 4 else part).rstrip() + "…"
+
+
+def compress(text, budget, count):
+    """`text` within `budget` tokens: whole if it fits, else its key sentences in order."""
+    text = text.strip()
+    if budget <= 0:
+        return ""
+    if count(text) <= budget:
+        return text
+
+    sentences = split_sentences(text)
+    if len(sentences) > 1:
+        ranked = sorted(range(len(sentences)), key=lambda i: _score(sentences[i], i), reverse=True)
+        keep, used = [], 0
+        for i in ranked:
+            cost = count(sentences[i]) + 1
+            if used + cost <= budget:
+                keep.append(i)
+                used += cost
+        if keep:
+            text = " ".join(sentences[i] for i in sorted(keep))
+    # Sentence counts don't add up exactly; make sure of the total
+    return truncate_tokens(text, budget, count)
+
+
+# ------------------------------------------------------------
+# All answers so far
+# ------------------------------------------------------------
+class CouncilNotes:
+    """Expert answers, rendered for the next prompt within a token budget."""
+
+    def __init__(self, budget=600):
+        self.budget = budget
+        self.entries = []
+        self._compressed = {}
+
+    def add(self, heading, text):
+        self.entries.append((heading, text or ""))
+
+    def __bool__(self):
+        return bool(self.entries)
+
+    def render(self, count, budget=None):
+        """Every answer under its heading, each within an equal share of `budget`."""
+        if not self.entries:
+            return ""
+        budget = self.budget if budget is None else budget
+        share = budget // len(self.entries)
+
+        parts = []
+        for i, (heading, text) in enumerate(self.entries):
+            if share < MIN_NOTE_TOKENS:
+                body = "(omitted for length)"
+            else:
+                # One council run counts with one model's tokenizer
+                body = self._compressed.get((i, share))
+                if body is None:
+                    body = self._compressed[(i, share)] = compress(text, share, count)
+            parts.append(f"{heading}\n{body}")
+        return "\n\n".join(parts)
+
+
+def fit_prompt(build, notes, count, n_ctx, reserve, budget=None):
+    """
+    build(notes_text) → prompt, with the notes shrunk until the prompt plus
+    `reserve` tokens (the answer, template overhead) fit in `n_ctx`. If even
+    bare headings don't fit, the prompt's tail is kept — it holds the
+    instruction the model answers.
+    """
+    limit = max(1, n_ctx - reserve)
+    budget = notes.budget if budget is None else budget
+
+    while True:
+        prompt = build(notes.render(count, budget))
+        used = count(prompt)
+        if used <= limit:
+            return prompt
+        if not notes or budget < MIN_NOTE_TOKENS * len(notes.entries):
+            break
+        budget = max(0, budget - (used - limit) - 8)
+
+    print(f"[Jynx] Council prompt of {used} tokens exceeds {limit}; keeping its tail")
+    return truncate_tokens(prompt, limit, count, keep_tail=True)
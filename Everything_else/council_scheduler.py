@@ -0,0 +1,361 @@
+# ============================================================
+#   council_scheduler.py — How a Council Round Gets Decoded
+# ============================================================
+#
+# A round is a list of ExpertJobs whose prompts are already fixed (the
+# opening round and the rebuttal round). A scheduler turns it into the
+# usual ("expert_start" / "expert_token" / "expert_done") events and
+# returns {expert name: answer}. Tokens of different experts may arrive
+# interleaved.
+#
+#   sequential — one expert after another in this process
+#   batched    — experts sharing a GGUF decode together in one context
+#   parallel   — worker processes, each with its own Llama over the same
+#                mmapped weights; sized by physical cores and RAM budget
+#
+# The chained mode (each expert reads the earlier answers) is not a
+# round and stays in ai_council.
+
+import atexit
+import multiprocessing
+import queue as queue_mod
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Everything_else.model_registry import (
+    get_persona, get_pool_key, get_model_pool, use_daemon, memory_plan
+)
+from Everything_else.batched_decode import open_batch, BatchedDecodeUnavailable
+from Everything_else.inference_telemetry import TELEMETRY, chunk_text
+from Everything_else.hw_tuner import physical_cores
+
+# Fewer threads than this per worker and prompt eval gets slower than serial
+MIN_THREADS_PER_WORKER = 2
+
+
+class ExpertJob:
+    def __init__(self, expert_id, name, prompt, max_tokens=400, temperature=0.7):
+        self.expert_id = expert_id
+        self.name = name
+        self.prompt = prompt
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+
+
+def stream_expert(expert_name, expert, expert_prompt, cancel, token_limit=None, max_tokens=None):
+    """Stream one expert's answer as expert_token events; returns the full text."""
+    expert_buffer = ""
+    token_count = 0
+    token_limit = token_limit or expert.config.get("generation_token_limit", 400)
+
+    for chunk in expert(
+        expert_prompt,
+        stream_override=True,
+        # Never ask for more than we'd read — the model stops at the limit itself
+        max_tokens=min(max_tokens or expert.config.get("max_tokens", 2048), token_limit),
+        temperature=expert.config.get("temperature", 0.7),
+        stop=expert.stop,
+        cancel=cancel,
+    ):
+        token = chunk.get("choices", [{}])[0].get("text") or \
+                chunk.get("choices", [{}])[0].get("delta", {}).get("content", "")
+        if token:
+            expert_buffer += token
+            token_count += 1
+            yield ("expert_token", expert_name, token)
+            if token_count >= token_limit:
+                break
+    return expert_buffer
+
+
+def _cancelled(cancel):
+    return cancel is not None and cancel.cancelled
+
+
+# ------------------------------------------------------------
+# 1. In-process schedulers
+# ------------------------------------------------------------
+class SequentialScheduler:
+    name = "sequential"
+
+    def run_round(self, jobs, cancel=None):
+        for job in jobs:
+            yield ("expert_start", job.name)
+        buffers = {}
+        yield from self._run_sequential(jobs, cancel, buffers)
+        return buffers
+
+    def _run_sequential(self, jobs, cancel, buffers):
+        for job in jobs:
+            buffers[job.name] = yield from stream_expert(
+                job.name, get_persona(job.expert_id), job.prompt, cancel,
+                token_limit=job.max_tokens, max_tokens=job.max_tokens,
+            )
+            if _cancelled(cancel):
+                return
+            yield ("expert_done", job.name, buffers[job.name])
+
+
+class BatchedScheduler(SequentialScheduler):
+    """Experts that share weights decode in one multi-sequence context."""
+    name = "batched"
+
+    def run_round(self, jobs, cancel=None):
+        for job in jobs:
+            yield ("expert_start", job.name)
+
+        # Remote personas have no pool key and are never batched
+        groups = {}
+        for job in jobs:
+            persona = get_persona(job.expert_id)
+            key = getattr(persona, "pool_key", None) or job.expert_id
+            groups.setdefault(key, []).append((job, persona))
+
+        buffers = {}
+        for group in groups.values():
+            if len(group) > 1 and hasattr(group[0][1], "sequence_request"):
+                batched = yield from self._run_batched(group, cancel, buffers)
+                if batched:
+                    continue
+            yield from self._run_sequential([job for job, _ in group], cancel, buffers)
+            if _cancelled(cancel):
+                break
+        return buffers
+
+    def _run_batched(self, group, cancel, buffers):
+        """Returns False (having yielded nothing) if batched decoding is unavailable."""
+        persona = group[0][1]
+        # The batch context reads the same weights; persona calls on them wait until it ends
+        with get_model_pool().decode_lock(persona.pool_key):
+            return (yield from self._decode_batch(group, persona.llm, cancel, buffers))
+
+    def _decode_batch(self, group, llm, cancel, buffers):
+        requests = [persona.sequence_request(job.prompt, max_tokens=job.max_tokens,
+                                             temperature=job.temperature)
+                    for job, persona in group]
+        started = time.perf_counter()
+        try:
+            decoder = open_batch(llm, requests)
+        except BatchedDecodeUnavailable as e:
+            print(f"[Jynx] Batched decoding unavailable ({e}); experts run one after another")
+            return False
+
+        names = [job.name for job, _ in group]
+        for name in names:
+            buffers[name] = ""
+        completion_tokens = 0
+        for index, text in decoder.stream(cancel):
+            name = names[index]
+            if text is None:
+                yield ("expert_done", name, buffers[name])
+            else:
+                buffers[name] += text
+                completion_tokens += 1
+                yield ("expert_token", name, text)
+
+        TELEMETRY.record({
+            "kind": "batch",
+            "model_ids": [job.expert_id for job, _ in group],
+            "prompt_tokens": decoder.prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "tokens_saved": decoder.tokens_saved,
+            "total_s": round(time.perf_counter() - started, 3),
+        })
+        return True
+
+
+# ------------------------------------------------------------
+# 2. Worker processes
+# ------------------------------------------------------------
+_WORKER_QUEUE = None
+_WORKER_CANCEL = None
+
+
+class _EventToken:
+    """CancelToken interface over a multiprocessing.Event."""
+
+    def __init__(self, event):
+        self._event = event
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+def _init_worker(out_queue, cancel_event, n_threads, ram_budget_bytes):
+    global _WORKER_QUEUE, _WORKER_CANCEL
+    from Everything_else import model_registry
+
+    _WORKER_QUEUE = out_queue
+    _WORKER_CANCEL = _EventToken(cancel_event)
+    model_registry.DAEMON_CLIENT_ENABLED = False
+    # Workers share the parent's cores; their settings come from LOAD_OVERRIDES
+    model_registry.AUTO_CALIBRATE = False
+    model_registry.LOAD_OVERRIDES.update(n_threads=n_threads, n_threads_batch=n_threads)
+    model_registry.get_model_pool().ram_budget_bytes = ram_budget_bytes
+
+
+def _run_job(index, job):
+    """Runs inside a worker process; streams (index, kind, payload) to the parent."""
+    from Everything_else.model_registry import get_local_persona
+
+    try:
+        persona = get_local_persona(job.expert_id)
+        for chunk in persona(job.prompt, stream_override=True, max_tokens=job.max_tokens,
+                             temperature=job.temperature, stop=persona.stop, cancel=_WORKER_CANCEL):
+            text = chunk_text(chunk)
+            if text:
+                _WORKER_QUEUE.put((index, "token", text))
+    except Exception as e:
+        _WORKER_QUEUE.put((index, "error", str(e)))
+    _WORKER_QUEUE.put((index, "done", None))
+
+
+def plan_workers(expert_ids, max_workers=None):
+    """
+    (workers, threads per worker, per-worker RAM budget) for a round.
+    Weights are mmapped and shared between processes, so they count once;
+    every worker pays for its own KV cache and compute buffers.
+    """
+    cores = physical_cores()
+    pool = get_model_pool()
+    budget = max(0, pool.ram_budget_bytes - pool.used_bytes())
+
+    shared, per_worker = 0, 0
+    for model_id in dict.fromkeys(expert_ids):
+        weights, context = memory_plan(model_id)
+        if not pool.contains(get_pool_key(model_id)):
+            shared += weights
+        per_worker += context
+
+    workers = min(len(set(expert_ids)), max(1, cores // MIN_THREADS_PER_WORKER))
+    if max_workers:
+        workers = min(workers, max_workers)
+    while workers > 1 and shared + workers * per_worker > budget:
+        workers -= 1
+
+    return workers, max(1, cores // workers), shared + per_worker
+
+
+class ProcessScheduler(BatchedScheduler):
+    """Opening and rebuttal rounds across CPU cores in separate processes."""
+    name = "parallel"
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+
+    def run_round(self, jobs, cancel=None):
+        if use_daemon():
+            # The daemon serialises decoding per model anyway
+            return (yield from super().run_round(jobs, cancel))
+
+        workers, threads, worker_budget = plan_workers([j.expert_id for j in jobs], self.max_workers)
+        if workers < 2:
+            return (yield from super().run_round(jobs, cancel))
+
+        for job in jobs:
+            yield ("expert_start", job.name)
+
+        executor, out_queue, cancel_event = _get_executor(workers, threads, worker_budget)
+        cancel_event.clear()
+        started = time.perf_counter()
+        futures = [executor.submit(_run_job, i, job) for i, job in enumerate(jobs)]
+
+        buffers = {job.name: "" for job in jobs}
+        remaining = len(jobs)
+        while remaining:
+            if _cancelled(cancel):
+                cancel_event.set()
+            try:
+                index, kind, payload = out_queue.get(timeout=0.1)
+            except queue_mod.Empty:
+                # A worker process that died never reports "done"; don't wait forever
+                failed = [f.exception() for f in futures if f.done() and f.exception() is not None]
+                if failed:
+                    print(f"[Jynx] Council worker failed: {failed[0]}")
+                    _shutdown_executor()
+                    break
+                continue
+
+            name = jobs[index].name
+            if kind == "token":
+                buffers[name] += payload
+                yield ("expert_token", name, payload)
+            elif kind == "error":
+                print(f"[Jynx] {name} failed in worker: {payload}")
+            elif kind == "done":
+                remaining -= 1
+                if not _cancelled(cancel):
+                    yield ("expert_done", name, buffers[name])
+
+        TELEMETRY.record({
+            "kind": "round",
+            "scheduler": self.name,
+            "workers": workers,
+            "threads_per_worker": threads,
+            "model_ids": [job.expert_id for job in jobs],
+            "total_s": round(time.perf_counter() - started, 3),
+        })
+        return buffers
+
+
+_EXECUTOR = None
+_EXECUTOR_STATE = None  # ((workers, threads), out_queue, cancel_event)
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers, threads, worker_budget):
+    """Worker processes stay alive between rounds so their models stay loaded."""
+    global _EXECUTOR, _EXECUTOR_STATE
+    with _executor_lock:
+        shape = (workers, threads)
+        if _EXECUTOR is None or _EXECUTOR_STATE[0] != shape:
+            _shutdown_executor_locked()
+            # spawn: forking a process that holds llama.cpp threads is unsafe
+            ctx = multiprocessing.get_context("spawn")
+            out_queue = ctx.Queue()
+            cancel_event = ctx.Event()
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=ctx,
+                initializer=_init_worker,
+                initargs=(out_queue, cancel_event, threads, worker_budget),
+            )
+            _EXECUTOR = executor
+            _EXECUTOR_STATE = (shape, out_queue, cancel_event)
+        return _EXECUTOR, _EXECUTOR_STATE[1], _EXECUTOR_STATE[2]
+
+
+def _shutdown_executor_locked():
+    global _EXECUTOR, _EXECUTOR_STATE
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    _EXECUTOR = None
+    _EXECUTOR_STATE = None
+
+
+def _shutdown_executor():
+    with _executor_lock:
+        _shutdown_executor_locked()
+
+
+atexit.register(_shutdown_executor)
+
+
+# ------------------------------------------------------------
+# 3. Lookup
+# ------------------------------------------------------------
+SCHEDULERS = {
+    "sequential": SequentialScheduler,
+    "batched": BatchedScheduler,
+    "parallel": ProcessScheduler,
+}
+
+
+def get_scheduler(mode, max_workers=None):
+    if mode not in SCHEDULERS:
+        raise ValueError(f"Unknown council scheduler '{mode}' (choose from chain, {', '.join(SCHEDULERS)})")
+    if mode == "parallel":
+        return ProcessScheduler(max_workers=max_workers)
+    return SCHEDULERS[mode]()
@@ -0,0 +1,203 @@
+# ============================================================
+#   expert_router.py — Local, Millisecond Expert Selection
+# ============================================================
+#
+# Picks council experts straight from the user prompt, so expert weights
+# can be warmed while the summarizer is still streaming (or the summary
+# skipped entirely). Each expert is a small document — its field
+# description plus keywords — scored against the prompt with TF-IDF
+# cosine similarity, whole-word keyword hits and a prior learned from
+# past routing choices.
+#
+# Routing history (word → expert counts) is written encrypted with the
+# session's Fernet key, one file per user under cache/routing/, like the
+# council cache. Without a key it is kept in memory only, so words from
+# past prompts never reach the disk in readable or guessable form.
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_DIR = os.path.join(SCRIPT_DIR, "cache", "routing")
+
+DEFAULT_EXPERT = "jynx_expert_logic"
+
+# Extra vocabulary per expert on top of its FIELD_DESCRIPTIONS entry
+EXPERT_KEYWORDS = {
+    "jynx_expert_logic": ["logic", "reasoning", "decide", "decision", "pros", "cons", "tradeoff", "argument", "plan"],
+    "jynx_expert_math": ["math", "calculate", "equation", "probability", "statistics", "percent", "algebra", "number"],
+    "jynx_expert_coding": ["code", "coding", "python", "bug", "program", "script", "software", "api", "linux"],
+    "jynx_expert_emotion": ["emotion", "feel", "feeling", "sad", "angry", "lonely", "love", "relationship"],
+    "jynx_expert_survival": ["survival", "survive", "water", "shelter", "fire", "food", "wilderness", "bugout", "prepper"],
+    "jynx_expert_finance": ["finance", "money", "budget", "debt", "invest", "savings", "salary", "tax", "rent"],
+    "jynx_expert_psychology": ["psychology", "motivation", "habit", "behavior", "procrastination", "mindset"],
+    "jynx_expert_medical": ["medical", "health", "doctor", "pain", "injury", "symptom", "medicine", "wound"],
+    "jynx_expert_cyber": ["cyber", "security", "hack", "password", "privacy", "network", "encryption", "vpn", "malware"],
+    "jynx_expert_history": ["history", "war", "military", "ancient", "empire", "battle", "strategy"],
+    "jynx_expert_sarcasm": ["people", "coworker", "friend", "boss", "trust", "manipulate", "social"],
+    "jynx_expert_politics": ["politics", "government", "election", "power", "corruption", "lobby", "policy"],
+    "jynx_expert_conspiracy": ["conspiracy", "cia", "surveillance", "cover", "intelligence", "cartel", "spy"],
+    "jynx_expert_mental_health": ["mental", "anxiety", "depression", "therapy", "stress", "burnout", "panic"],
+}
+
+_WORD = re.compile(r"[a-z][a-z0-9']+")
+_STOPWORDS = frozenset(
+    "a about all an and any are as at be but by can could do does for from get got has have how "
+    "i if in into is it its just me my no not of off on or out over should so some than that the "
+    "their them then there these this those to up very was we what when where which who why "
+    "will with would you your".split()
+)
+
+
+def tokenize(text):
+    return [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def _stem(word):
+    # Crude suffix folding so "calculating" meets "calculate"
+    for suffix in ("ing", "ies", "es", "ed", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def _terms(text):
+    return [_stem(w) for w in tokenize(text)]
+
+
+def match_experts(text, expert_map):
+    """
+    Expert IDs named in `text` (e.g. the summarizer's **Experts:** line), in
+    order of appearance, matching whole words only — "aftermath" is not math.
+    """
+    lower = text.lower()
+    hits = []
+    for keyword, expert_id in expert_map.items():
+        m = re.search(r"\b" + re.escape(keyword) + r"\b", lower)
+        if m:
+            hits.append((m.start(), expert_id))
+    return list(dict.fromkeys(expert_id for _, expert_id in sorted(hits)))
+
+
+class ExpertRouter:
+    """TF-IDF + keyword + history scoring of a prompt against each expert."""
+
+    def __init__(self, descriptions, keywords=None, history_path=None, fernet=None,
+                 keyword_weight=0.15, history_weight=0.1, min_score=0.05, relative_cutoff=0.4):
+        keywords = keywords or EXPERT_KEYWORDS
+        self.expert_ids = list(descriptions)
+        self.keywords = {e: {_stem(k) for k in keywords.get(e, [])} for e in self.expert_ids}
+        self.history_path = history_path
+        self.fernet = fernet
+        self.keyword_weight = keyword_weight
+        self.history_weight = history_weight
+        self.min_score = min_score
+        self.relative_cutoff = relative_cutoff
+        self._lock = threading.Lock()
+        self._history = None
+
+        docs = {e: _terms(descriptions[e] + " " + " ".join(keywords.get(e, []))) for e in self.expert_ids}
+        df = Counter(t for terms in docs.values() for t in set(terms))
+        n = len(docs)
+        self.idf = {t: math.log((1 + n) / (1 + c)) + 1 for t, c in df.items()}
+        self.vectors = {e: self._vector(terms) for e, terms in docs.items()}
+
+    @classmethod
+    def for_user(cls, descriptions, username, fernet, **kwargs):
+        return cls(descriptions, history_path=os.path.join(HISTORY_DIR, f"{username}.enc"),
+                   fernet=fernet, **kwargs)
+
+    def _vector(self, terms):
+        counts = Counter(t for t in terms if t in self.idf)
+        vec = {t: c * self.idf[t] for t, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        return {t: v / norm for t, v in vec.items()}
+
+    # --------------------------------------------------------
+    # Routing history
+    # --------------------------------------------------------
+    def _persistent(self):
+        return bool(self.history_path and self.fernet)
+
+    def _load_history(self):
+        if self._history is None:
+            data = {}
+            if self._persistent():
+                try:
+                    with open(self.history_path, "rb") as f:
+                        data = json.loads(self.fernet.decrypt(f.read()))
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    # Wrong key or damaged file: start over rather than fail routing
+                    print(f"[Jynx] Routing history unreadable, starting fresh: {e}")
+            self._history = defaultdict(Counter, {k: Counter(v) for k, v in data.items()})
+        return self._history
+
+    def record(self, prompt, expert_ids):
+        """Remember which experts were chosen for this prompt's words."""
+        if not expert_ids:
+            return
+        with self._lock:
+            history = self._load_history()
+            for term in set(_terms(prompt)):
+                history[term].update(expert_ids)
+            if not self._persistent():
+                return
+            try:
+                os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+                tmp = self.history_path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(self.fernet.encrypt(json.dumps(history).encode("utf-8")))
+                os.replace(tmp, self.history_path)
+            except OSError as e:
+                print(f"[Jynx] Routing history not saved: {e}")
+
+    def _history_scores(self, terms):
+        with self._lock:
+            history = self._load_history()
+            totals = Counter()
+            for term in set(terms):
+                counts = history.get(term)
+                if counts:
+                    seen = sum(counts.values())
+                    for expert_id, c in counts.items():
+                        totals[expert_id] += c / seen
+        n = len(set(terms)) or 1
+        return {e: v / n for e, v in totals.items()}
+
+    # --------------------------------------------------------
+    # Scoring
+    # --------------------------------------------------------
+    def scores(self, prompt):
+        terms = _terms(prompt)
+        query = self._vector(terms)
+        term_set = set(terms)
+        prior = self._history_scores(terms)
+
+        result = {}
+        for expert_id in self.expert_ids:
+            vec = self.vectors[expert_id]
+            cosine = sum(w * vec.get(t, 0.0) for t, w in query.items())
+            keyword_hits = len(term_set & self.keywords[expert_id])
+            result[expert_id] = (cosine
+                                 + self.keyword_weight * keyword_hits
+                                 + self.history_weight * prior.get(expert_id, 0.0))
+        return result
+
+    def route(self, prompt, max_experts=4, min_experts=2):
+        """
+        Best experts for `prompt`, highest score first. A council needs more
+        than one voice, so short lists are topped up with the logic expert.
+        """
+        ranked = sorted(self.scores(prompt).items(), key=lambda kv: kv[1], reverse=True)
+        # Drop experts far behind the best match so one clear topic isn't padded out
+        cutoff = max(self.min_score, ranked[0][1] * self.relative_cutoff) if ranked else self.min_score
+        chosen = [e for e, s in ranked if s >= cutoff][:max_experts]
+        if len(chosen) < min_experts and DEFAULT_EXPERT not in chosen:
+            chosen.append(DEFAULT_EXPERT)
+        return chosen
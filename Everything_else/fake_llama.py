@@ -0,0 +1,267 @@
+# ============================================================
+#   fake_llama.py — Deterministic Stand-in for llama_cpp.Llama
+# ============================================================
+#
+# Lets the registry, council and chat UI run without multi-GB GGUF files:
+# a FakeLlama "loads", evaluates prompts and decodes tokens at the rates
+# of a FakeProfile, sleeping for the modelled time and producing the same
+# text for the same prompt. It keeps a token history with prefix reuse,
+# so the prompt state cache and pool behave as they do with real weights.
+#
+#   set_llama_loader(FakeLoader(FakeProfile(decode_tps=30)))   # registry
+#   GHOSTDRIVE_FAKE_LLAMA="load_s=2,decode_tps=30" ./run.sh     # whole app
+#
+# busy_s totals the modelled time, so wall time minus busy_s is the
+# orchestration overhead around the model.
+
+import hashlib
+import re
+import threading
+import time
+
+# Words and runs of whitespace: a text splits the same way wherever it is cut
+_PIECES = re.compile(r"\S+|\s+")
+
+WORDS = (
+    "water", "shelter", "budget", "plan", "risk", "first", "check", "signal",
+    "route", "store", "cost", "rest", "keep", "track", "build", "test",
+)
+
+
+class FakeProfile:
+    """Rates of a simulated model. A rate of 0 means instant."""
+
+    FIELDS = ("load_s", "prompt_tps", "decode_tps", "chars_per_token", "reply_tokens", "time_scale")
+
+    def __init__(self, load_s=0.0, prompt_tps=400.0, decode_tps=20.0, chars_per_token=4,
+                 reply_tokens=64, time_scale=1.0):
+        self.load_s = load_s
+        self.prompt_tps = prompt_tps
+        self.decode_tps = decode_tps
+        self.chars_per_token = chars_per_token
+        self.reply_tokens = reply_tokens
+        self.time_scale = time_scale
+
+    @classmethod
+    def parse(cls, spec):
+        """'load_s=2,decode_tps=30' → FakeProfile; unknown keys are an error."""
+        values = {}
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            key, _, value = part.partition("=")
+            if key not in cls.FIELDS:
+                raise ValueError(f"Unknown fake llama setting '{key}' (use {', '.join(cls.FIELDS)})")
+            values[key] = float(value)
+        if "chars_per_token" in values:
+            values["chars_per_token"] = int(values["chars_per_token"])
+        if "reply_tokens" in values:
+            values["reply_tokens"] = int(values["reply_tokens"])
+        return cls(**values)
+
+
+class FakeLlama:
+    N_VOCAB = 32000
+    EOS = 2
+
+    def __init__(self, model_path=None, n_ctx=4096, profile=None, **kwargs):
+        self.model_path = model_path
+        self.profile = profile or FakeProfile()
+        self._n_ctx = n_ctx
+        self.input_ids = []
+        self.n_tokens = 0
+        self.busy_s = 0.0
+        self.calls = 0
+        self.closed = False
+        self._pieces = {}
+        self._lock = threading.Lock()
+        self._spend(self.profile.load_s)
+
+    # --------------------------------------------------------
+    # Modelled time
+    # --------------------------------------------------------
+    def _spend(self, seconds):
+        seconds *= self.profile.time_scale
+        if seconds > 0:
+            time.sleep(seconds)
+            self.busy_s += seconds
+
+    def _per_token(self, rate, n):
+        return n / rate if rate else 0.0
+
+    # --------------------------------------------------------
+    # Llama API subset
+    # --------------------------------------------------------
+    def n_ctx(self):
+        return self._n_ctx
+
+    def n_vocab(self):
+        return self.N_VOCAB
+
+    def token_eos(self):
+        return self.EOS
+
+    def tokenize(self, data, add_bos=True, special=False):
+        text = data.decode("utf-8", errors="replace")
+        step = self.profile.chars_per_token
+        tokens = []
+        for word in _PIECES.findall(text):
+            for i in range(0, len(word), step):
+                piece = word[i:i + step]
+                token = int(hashlib.md5(piece.encode("utf-8")).hexdigest()[:6], 16) % (self.N_VOCAB - 3) + 3
+                self._pieces[token] = piece
+                tokens.append(token)
+        return tokens
+
+    def detokenize(self, tokens):
+        return "".join(self._pieces.get(t, "") for t in tokens).encode("utf-8")
+
+    def reset(self):
+        self.input_ids = []
+        self.n_tokens = 0
+
+    def eval(self, tokens):
+        self._spend(self._per_token(self.profile.prompt_tps, len(tokens)))
+        self.input_ids = self.input_ids[:self.n_tokens] + list(tokens)
+        self.n_tokens = len(self.input_ids)
+
+    def save_state(self):
+        return {"input_ids": list(self.input_ids[:self.n_tokens])}
+
+    def load_state(self, state):
+        self.input_ids = list(state["input_ids"])
+        self.n_tokens = len(self.input_ids)
+
+    def close(self):
+        self.closed = True
+
+    def _evaluate_prompt(self, prompt):
+        """Like Llama: only tokens after the longest common prefix are evaluated."""
+        tokens = self.tokenize(prompt.encode("utf-8"))
+        if len(tokens) > self._n_ctx:
+            raise ValueError(f"Requested tokens ({len(tokens)}) exceed context window of {self._n_ctx}")
+        common = 0
+        for a, b in zip(self.input_ids[:self.n_tokens], tokens):
+            if a != b:
+                break
+            common += 1
+        self.n_tokens = common
+        self.eval(tokens[common:])
+        return len(tokens)
+
+    @staticmethod
+    def reply_piece(prompt, i):
+        """Piece `i` of the deterministic reply to `prompt`."""
+        seed = hashlib.sha256(prompt.encode("utf-8")).digest()
+        # Hash per position: a periodic reply would trip the repetition guard
+        word = hashlib.sha256(seed + i.to_bytes(4, "little")).digest()[0] % len(WORDS)
+        return " " + WORDS[word] + ("." if i % 12 == 11 else "")
+
+    def _reply(self, prompt, max_tokens, stop):
+        """Deterministic reply pieces for `prompt`, cut at a stop string."""
+        n = min(self.profile.reply_tokens, max_tokens or self.profile.reply_tokens,
+                self._n_ctx - self.n_tokens)
+        text = ""
+        for i in range(n):
+            piece = self.reply_piece(prompt, i)
+            if any(s and s in text + piece for s in (stop or [])):
+                return
+            text += piece
+            self._spend(self._per_token(self.profile.decode_tps, 1))
+            # Sampled tokens join the context, as in llama.cpp
+            with self._lock:
+                self.input_ids = self.input_ids[:self.n_tokens] + self.tokenize(piece.encode("utf-8"))
+                self.n_tokens = len(self.input_ids)
+            yield piece
+
+    def _complete(self, prompt, stream, max_tokens, stop, chunk):
+        with self._lock:
+            self.calls += 1
+            prompt_tokens = self._evaluate_prompt(prompt)
+        if stream:
+            return self._stream(prompt, max_tokens, stop, chunk)
+        text = "".join(self._reply(prompt, max_tokens, stop))
+        return {
+            "choices": [chunk(text, final=True)],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(text.split())},
+        }
+
+    def _stream(self, prompt, max_tokens, stop, chunk):
+        for piece in self._reply(prompt, max_tokens, stop):
+            yield {"choices": [chunk(piece)]}
+
+    def __call__(self, prompt, stream=False, max_tokens=16, stop=None, **kwargs):
+        return self._complete(prompt, stream, max_tokens, stop,
+                              lambda text, final=False: {"text": text, "index": 0})
+
+    def create_chat_completion(self, messages, stream=False, max_tokens=None, stop=None, **kwargs):
+        prompt = "".join(f"<|{m['role']}|>{m['content']}\n" for m in messages) + "<|assistant|>"
+
+        def chunk(text, final=False):
+            if final:
+                return {"message": {"role": "assistant", "content": text}, "index": 0}
+            return {"delta": {"content": text}, "index": 0}
+        return self._complete(prompt, stream, max_tokens, stop, chunk)
+
+
+    def batch_context(self, sequences):
+        """Multi-sequence decode context for BatchedDecoder."""
+        return FakeBatchContext(self, sequences)
+
+
+class FakeBatchContext:
+    """
+    BatchedDecoder context over a FakeLlama: each sequence decodes the
+    FakeLlama reply to its prompt, then EOS. A step costs one decode
+    token whatever the number of sequences, as batched decoding does.
+    """
+
+    def __init__(self, llm, sequences):
+        self.llm = llm
+        self.closed = False
+        self.steps = 0
+        self._pending = {}
+        for seq in sequences:
+            prompt = llm.detokenize(seq.tokens).decode("utf-8")
+            tokens = []
+            for i in range(llm.profile.reply_tokens):
+                tokens.extend(llm.tokenize(FakeLlama.reply_piece(prompt, i).encode("utf-8")))
+            self._pending[seq.seq_id] = tokens + [FakeLlama.EOS]
+
+    def _next(self, seq):
+        tokens = self._pending[seq.seq_id]
+        seq.next_token = tokens.pop(0) if tokens else FakeLlama.EOS
+
+    def prefill(self, seq):
+        self.llm._spend(self.llm._per_token(self.llm.profile.prompt_tps, len(seq.tokens)))
+        self._next(seq)
+
+    def step(self, active):
+        self.steps += 1
+        self.llm._spend(self.llm._per_token(self.llm.profile.decode_tps, 1))
+        for seq in active:
+            seq.pos += 1
+            self._next(seq)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeLoader:
+    """Pool loader that builds FakeLlamas with one profile and remembers them."""
+
+    def __init__(self, profile=None):
+        self.profile = profile or FakeProfile()
+        self.instances = []
+
+    def __call__(self, **kwargs):
+        kwargs.pop("draft", None)
+        llm = FakeLlama(profile=self.profile, **kwargs)
+        self.instances.append(llm)
+        return llm
+
+    @property
+    def busy_s(self):
+        return sum(llm.busy_s for llm in self.instances)
+
+    @property
+    def loads(self):
+        return len(self.instances)
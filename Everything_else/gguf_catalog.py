@@ -0,0 +1,234 @@
+# ============================================================
+#   gguf_catalog.py — GGUF Header Reader and Metadata Catalog
+# ============================================================
+#
+# Reads only the GGUF header (metadata + tensor table), never the
+# weights, and caches the result by (path, size, mtime). The registry
+# uses it to pick chat templates, plan memory and validate models.yaml
+# at startup without loading anything.
+
+import json
+import os
+import struct
+import threading
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_PATH = os.path.join(SCRIPT_DIR, "cache", "gguf_catalog.json")
+
+GGUF_MAGIC = b"GGUF"
+
+# Metadata value types
+_UINT8, _INT8, _UINT16, _INT16, _UINT32, _INT32, _FLOAT32, _BOOL, _STRING, _ARRAY, _UINT64, _INT64, _FLOAT64 = range(13)
+
+_SCALARS = {
+    _UINT8: "<B", _INT8: "<b", _UINT16: "<H", _INT16: "<h",
+    _UINT32: "<I", _INT32: "<i", _FLOAT32: "<f", _BOOL: "<?",
+    _UINT64: "<Q", _INT64: "<q", _FLOAT64: "<d",
+}
+
+# ggml tensor type → (elements per block, bytes per block)
+GGML_BLOCKS = {
+    0: (1, 4), 1: (1, 2), 2: (32, 18), 3: (32, 20), 6: (32, 22), 7: (32, 24),
+    8: (32, 34), 9: (32, 36), 10: (256, 84), 11: (256, 110), 12: (256, 144),
+    13: (256, 176), 14: (256, 210), 15: (256, 292), 16: (256, 66), 17: (256, 74),
+    18: (256, 98), 19: (256, 50), 20: (32, 18), 21: (256, 110), 22: (256, 82),
+    23: (256, 136), 24: (1, 1), 25: (1, 2), 26: (1, 4), 27: (1, 8), 28: (1, 8),
+    29: (256, 56), 30: (1, 2),
+}
+
+# general.file_type → quantization label
+FILE_TYPES = {
+    0: "F32", 1: "F16", 2: "Q4_0", 3: "Q4_1", 7: "Q8_0", 8: "Q5_0", 9: "Q5_1",
+    10: "Q2_K", 11: "Q3_K_S", 12: "Q3_K_M", 13: "Q3_K_L", 14: "Q4_K_S",
+    15: "Q4_K_M", 16: "Q5_K_S", 17: "Q5_K_M", 18: "Q6_K", 19: "IQ2_XXS",
+    20: "IQ2_XS", 21: "Q2_K_S", 22: "IQ3_XS", 23: "IQ3_XXS", 24: "IQ1_S",
+    25: "IQ4_NL", 26: "IQ3_S", 27: "IQ3_M", 28: "IQ2_S", 29: "IQ2_M",
+    30: "IQ4_XS", 31: "IQ1_M", 32: "BF16",
+}
+
+
+class GGUFError(ValueError):
+    pass
+
+
+# ------------------------------------------------------------
+# 1. Header parsing
+# ------------------------------------------------------------
+class _Reader:
+    def __init__(self, f, version):
+        self.f = f
+        self.version = version
+
+    def unpack(self, fmt):
+        size = struct.calcsize(fmt)
+        data = self.f.read(size)
+        if len(data) != size:
+            raise GGUFError("Unexpected end of GGUF header")
+        return struct.unpack(fmt, data)[0]
+
+    def count(self):
+        # GGUF v1 used 32-bit counts and string lengths
+        return self.unpack("<I" if self.version == 1 else "<Q")
+
+    def string(self):
+        length = self.count()
+        data = self.f.read(length)
+        if len(data) != length:
+            raise GGUFError("Unexpected end of GGUF header")
+        return data.decode("utf-8", errors="replace")
+
+    def value(self, vtype, keep=True):
+        if vtype in _SCALARS:
+            return self.unpack(_SCALARS[vtype])
+        if vtype == _STRING:
+            return self.string()
+        if vtype == _ARRAY:
+            item_type = self.unpack("<I")
+            length = self.count()
+            if item_type in _SCALARS and not keep:
+                # Skip large numeric arrays (token scores/types) in one seek
+                self.f.seek(length * struct.calcsize(_SCALARS[item_type]), os.SEEK_CUR)
+                return length
+            items = [self.value(item_type, keep) for _ in range(length)]
+            return items if keep else length
+        raise GGUFError(f"Unknown GGUF value type {vtype}")
+
+
+def read_gguf_header(path):
+    """Parse metadata and the tensor table of a GGUF file. Arrays are summarised by length."""
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        if f.read(4) != GGUF_MAGIC:
+            raise GGUFError(f"{os.path.basename(path)} is not a GGUF file")
+        version = struct.unpack("<I", f.read(4))[0]
+        r = _Reader(f, version)
+        tensor_count = r.count()
+        kv_count = r.count()
+
+        metadata = {}
+        for _ in range(kv_count):
+            key = r.string()
+            vtype = r.unpack("<I")
+            metadata[key] = r.value(vtype, keep=(vtype != _ARRAY))
+
+        tensor_bytes = 0
+        for _ in range(tensor_count):
+            r.string()
+            n_dims = r.unpack("<I")
+            n_elements = 1
+            for _ in range(n_dims):
+                n_elements *= r.count()
+            ggml_type = r.unpack("<I")
+            r.unpack("<Q")  # data offset
+            block, size = GGML_BLOCKS.get(ggml_type, (0, 0))
+            if block:
+                tensor_bytes += n_elements // block * size
+
+        alignment = metadata.get("general.alignment", 32)
+        header_end = f.tell()
+        data_start = header_end + (-header_end % alignment)
+
+    if not tensor_bytes:
+        tensor_bytes = max(0, file_size - data_start)
+
+    return {
+        "version": version,
+        "tensor_count": tensor_count,
+        "metadata": metadata,
+        "tensor_bytes": tensor_bytes,
+        "file_size": file_size,
+    }
+
+
+def summarize(header):
+    """Compact catalog record from a parsed header."""
+    meta = header["metadata"]
+    arch = meta.get("general.architecture", "unknown")
+    file_type = meta.get("general.file_type")
+    return {
+        "architecture": arch,
+        "name": meta.get("general.name", ""),
+        "context_length": meta.get(f"{arch}.context_length"),
+        "embedding_length": meta.get(f"{arch}.embedding_length"),
+        "block_count": meta.get(f"{arch}.block_count"),
+        "head_count": meta.get(f"{arch}.attention.head_count"),
+        "head_count_kv": meta.get(f"{arch}.attention.head_count_kv"),
+        "quantization": FILE_TYPES.get(file_type, str(file_type) if file_type is not None else "unknown"),
+        "tensor_bytes": header["tensor_bytes"],
+        "file_size": header["file_size"],
+        "chat_template": meta.get("tokenizer.chat_template"),
+    }
+
+
+def template_family(record):
+    """Map an embedded Jinja chat template to 'chatml', 'inst' or None."""
+    template = (record or {}).get("chat_template") or ""
+    if "<|im_start|>" in template:
+        return "chatml"
+    if "[INST]" in template:
+        return "inst"
+    return None
+
+
+def kv_cache_bytes(record, n_ctx, bytes_per_element=2):
+    """f16 KV cache size for `n_ctx` tokens, or 0 when the header lacks the shape."""
+    try:
+        n_kv_embd = record["embedding_length"] * record["head_count_kv"] // record["head_count"]
+        return 2 * record["block_count"] * int(n_ctx) * n_kv_embd * bytes_per_element
+    except (KeyError, TypeError, ZeroDivisionError):
+        return 0
+
+
+# ------------------------------------------------------------
+# 2. Cached catalog
+# ------------------------------------------------------------
+class GGUFCatalog:
+    """Header summaries cached on disk by (path, size, mtime)."""
+
+    def __init__(self, cache_path=CATALOG_PATH):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._records = None
+
+    def _load(self):
+        if self._records is None:
+            try:
+                with open(self.cache_path, "r") as f:
+                    self._records = json.load(f)
+            except (OSError, ValueError):
+                self._records = {}
+        return self._records
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp = self.cache_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._records, f, indent=2)
+        os.replace(tmp, self.cache_path)
+
+    def get(self, path):
+        """Catalog record for `path`, or None if the file is missing or unreadable."""
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            records = self._load()
+            cached = records.get(path)
+            if cached and cached["size"] == st.st_size and cached["mtime"] == int(st.st_mtime):
+                return cached["record"]
+
+            try:
+                record = summarize(read_gguf_header(path))
+            except (OSError, GGUFError, struct.error) as e:
+                print(f"[Jynx] Could not read GGUF header of {os.path.basename(path)}: {e}")
+                return None
+
+            records[path] = {"size": st.st_size, "mtime": int(st.st_mtime), "record": record}
+            try:
+                self._save()
+            except OSError:
+                pass
+            return record
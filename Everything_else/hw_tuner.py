@@ -0,0 +1,284 @@
+# ============================================================
+#   hw_tuner.py — Per-Machine Calibration of llama.cpp Settings
+# ============================================================
+#
+# The same USB drive runs on very different laptops. This module
+# measures prompt-eval and decode throughput for a model across
+# thread counts, batch sizes and KV-cache types, and stores the best
+# combination in a local profile keyed by (machine, model file).
+# model_registry applies the profile automatically on load (falling
+# back to default_settings()) and, once the pool has gone idle, runs a
+# quick calibration for loaded models that have no profile yet.
+#
+#   python -m Everything_else.hw_tuner jynx_default
+#   python -m Everything_else.hw_tuner jynx_default --quick
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILE_PATH = os.path.join(SCRIPT_DIR, "cache", "tuning_profiles.json")
+
+# Typical chat turn used to weigh prompt-eval against decode speed
+TYPICAL_PROMPT_TOKENS = 512
+TYPICAL_GENERATED_TOKENS = 256
+
+# GGML tensor types accepted by Llama(type_k=...)
+KV_TYPES = {"f16": 1, "q8_0": 8}
+
+CALIBRATION_TEXT = (
+    "The quick brown fox jumps over the lazy dog while the survivalist checks "
+    "the water filter, counts rations, and plans the route across the ridge. "
+)
+
+_profiles = None
+_profiles_lock = threading.Lock()
+
+
+# ------------------------------------------------------------
+# 1. Machine description
+# ------------------------------------------------------------
+def _cpu_model():
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+@functools.lru_cache(maxsize=None)
+def physical_cores():
+    """Physical core count — hyperthreads slow llama.cpp decode down."""
+    try:
+        import psutil
+        cores = psutil.cpu_count(logical=False)
+        if cores:
+            return cores
+    except Exception:
+        pass
+    try:
+        cores = set()
+        physical_id = core_id = None
+        with open("/proc/cpuinfo", "r") as f:
+            for line in f:
+                if line.startswith("physical id"):
+                    physical_id = line.split(":", 1)[1].strip()
+                elif line.startswith("core id"):
+                    core_id = line.split(":", 1)[1].strip()
+                elif not line.strip() and core_id is not None:
+                    cores.add((physical_id, core_id))
+                    physical_id = core_id = None
+        if cores:
+            return len(cores)
+    except OSError:
+        pass
+    return os.cpu_count() or 1
+
+
+@functools.lru_cache(maxsize=None)
+def machine_fingerprint():
+    try:
+        ram_gb = round(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024 ** 3)
+    except (ValueError, OSError, AttributeError):
+        ram_gb = 0
+    desc = f"{_cpu_model()}|{physical_cores()}|{os.cpu_count()}|{ram_gb}"
+    return hashlib.sha256(desc.encode("utf-8")).hexdigest()[:16]
+
+
+def default_settings():
+    """Settings used before a model has been calibrated on this machine."""
+    return {
+        "n_threads": physical_cores(),
+        "n_threads_batch": os.cpu_count() or physical_cores(),
+        "n_batch": 512,
+    }
+
+
+# ------------------------------------------------------------
+# 2. Profile storage
+# ------------------------------------------------------------
+def _profile_key(model_path):
+    try:
+        size = os.path.getsize(model_path)
+    except OSError:
+        size = 0
+    return f"{machine_fingerprint()}:{os.path.basename(model_path)}:{size}"
+
+
+def _read_profiles():
+    try:
+        with open(PROFILE_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _load_profiles():
+    global _profiles
+    if _profiles is None:
+        _profiles = _read_profiles()
+    return _profiles
+
+
+def get_tuned_settings(model_path):
+    """Best known Llama(...) settings for this model on this machine, or None."""
+    with _profiles_lock:
+        profile = _load_profiles().get(_profile_key(model_path))
+    return dict(profile["settings"]) if profile else None
+
+
+def save_profile(model_path, settings, results):
+    """
+    Store a profile. Other processes may have saved theirs since this one
+    read the file, so it is re-read and merged; each writer uses its own
+    temporary file and replaces the profile file atomically.
+    """
+    global _profiles
+    with _profiles_lock:
+        profiles = _read_profiles()
+        profiles[_profile_key(model_path)] = {
+            "settings": settings,
+            "results": results,
+            "measured_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        directory = os.path.dirname(PROFILE_PATH)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tuning_profiles.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(profiles, f, indent=2)
+            os.replace(tmp, PROFILE_PATH)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        _profiles = profiles
+
+
+# ------------------------------------------------------------
+# 3. Calibration
+# ------------------------------------------------------------
+def candidate_grid(quick=False):
+    cores = physical_cores()
+    logical = os.cpu_count() or cores
+    threads = sorted({max(1, cores // 2), cores, logical} if not quick else {cores, logical})
+    batches = [512] if quick else [128, 256, 512]
+    return threads, batches
+
+
+def score(result):
+    """Seconds for a typical turn — lower is better."""
+    return (TYPICAL_PROMPT_TOKENS / result["prompt_tps"]
+            + TYPICAL_GENERATED_TOKENS / result["decode_tps"])
+
+
+def _measure(llm, n_prompt, n_decode, clock=time.perf_counter):
+    tokens = llm.tokenize((CALIBRATION_TEXT * 64).encode("utf-8"))[:n_prompt]
+    n_decode = min(n_decode, len(tokens))
+
+    llm.reset()
+    start = clock()
+    llm.eval(tokens)
+    prompt_tps = len(tokens) / max(clock() - start, 1e-9)
+
+    # Decode cost does not depend on which token is fed back
+    start = clock()
+    for tok in tokens[:n_decode]:
+        llm.eval([tok])
+    decode_tps = n_decode / max(clock() - start, 1e-9)
+    return prompt_tps, decode_tps
+
+
+def calibrate(model_path, n_ctx=2048, n_gpu_layers=-1, quick=False, n_prompt=256, n_decode=32,
+              loader=None, clock=time.perf_counter, cancel=None):
+    """
+    Benchmark the settings grid for one model and store the winner.
+    `loader(**llama_kwargs)` builds each instance (default: llama_cpp.Llama)
+    and `clock` times it; tests pass fakes for both. When `cancel` (a
+    CancelToken) fires, the run stops and nothing is saved — a measurement
+    taken while it fired may be skewed. Returns the settings, or None.
+    """
+    if loader is None:
+        from llama_cpp import Llama
+        loader = Llama
+
+    threads, batches = candidate_grid(quick)
+    kv_types = ["f16"]
+    if (not quick and inspect.isclass(loader)
+            and "type_k" in inspect.signature(loader.__init__).parameters):
+        kv_types.append("q8_0")
+
+    results = []
+    for n_batch in batches:
+        for kv in kv_types:
+            for n_threads in threads:
+                kwargs = {
+                    "n_threads": n_threads,
+                    "n_threads_batch": os.cpu_count() or n_threads,
+                    "n_batch": n_batch,
+                }
+                if kv != "f16":
+                    kwargs["type_k"] = KV_TYPES[kv]
+
+                if cancel is not None and cancel.cancelled:
+                    break
+                llm = loader(model_path=model_path, n_ctx=n_ctx, n_gpu_layers=n_gpu_layers,
+                             verbose=False, **kwargs)
+                try:
+                    prompt_tps, decode_tps = _measure(llm, n_prompt, n_decode, clock)
+                finally:
+                    llm.close()
+
+                result = dict(kwargs, kv_type=kv, prompt_tps=round(prompt_tps, 1), decode_tps=round(decode_tps, 2))
+                results.append(result)
+                print(f"[Jynx] threads={n_threads:<3} batch={n_batch:<4} kv={kv:<5} "
+                      f"prompt={prompt_tps:7.1f} tok/s  decode={decode_tps:6.2f} tok/s")
+
+    if cancel is not None and cancel.cancelled:
+        print(f"[Jynx] Calibration of {os.path.basename(model_path)} interrupted; nothing saved")
+        return None
+
+    best = min(results, key=score)
+    settings = {k: best[k] for k in ("n_threads", "n_threads_batch", "n_batch") if k in best}
+    if "type_k" in best:
+        settings["type_k"] = best["type_k"]
+    save_profile(model_path, settings, results)
+    print(f"[Jynx] Best settings for {os.path.basename(model_path)}: {settings}")
+    return settings
+
+
+def main(argv=None):
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Calibrate llama.cpp settings for this machine")
+    parser.add_argument("model_id", help="models.yaml entry to calibrate")
+    parser.add_argument("--quick", action="store_true", help="fewer combinations")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+    from Everything_else.model_registry import get_model_config, DEFAULT_N_CTX
+
+    config = get_model_config(args.model_id)
+    calibrate(
+        os.path.join(SCRIPT_DIR, "models", config["path"]),
+        n_ctx=min(config.get("n_ctx", DEFAULT_N_CTX), 2048),
+        n_gpu_layers=config.get("n_gpu_layers", -1),
+        quick=args.quick,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# ============================================================
+#   inference_queue.py — One Long-Lived Worker per Loaded Model
+# ============================================================
+#
+# Chat used to start a new thread for every prompt, so two quick prompts
+# decoded on the same Llama at once. Here each set of weights (pool key)
+# gets one persistent worker thread with a priority queue: jobs run one
+# at a time, interactive ones before background ones, first come first
+# served within a priority. Jobs are told their queue position whenever
+# it changes (0 = running now) and can be cancelled while queued or
+# running.
+#
+# The queue only orders work submitted through it; ModelPool.decode_lock
+# still guards the weights against other callers (council, async API).
+
+import heapq
+import itertools
+import threading
+import time
+
+from Everything_else.cancellation import CancelToken
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+QUEUED, RUNNING, DONE, CANCELLED = "queued", "running", "done", "cancelled"
+
+
+class InferenceJob:
+    """
+    `run(cancel)` does the whole generation, blocking, on the worker
+    thread. `on_position(n)` hears about the queue position.
+    """
+
+    def __init__(self, run, priority=PRIORITY_INTERACTIVE, on_position=None, cancel=None, label=""):
+        self.run = run
+        self.priority = priority
+        self.on_position = on_position
+        self.cancel_token = cancel or CancelToken()
+        self.label = label
+        self.state = QUEUED
+        self.position = None
+        self.queued_at = time.perf_counter()
+        self.started_at = None
+        self._worker = None
+        self._done = threading.Event()
+
+    def cancel(self):
+        """Stop the job. A queued job leaves the queue and counts as finished at once."""
+        self.cancel_token.cancel()
+        if self.state == QUEUED and self._worker is not None:
+            self._worker._drop(self)
+
+    @property
+    def cancelled(self):
+        return self.cancel_token.cancelled
+
+    def wait(self, timeout=None):
+        """Block until the job has run or was dropped; True if it finished in time."""
+        return self._done.wait(timeout)
+
+    def _tell(self, position):
+        if position == self.position:
+            return
+        self.position = position
+        if self.on_position:
+            try:
+                self.on_position(position)
+            except Exception as e:
+                print(f"[Jynx] Queue position callback failed: {e}")
+
+    def _finish(self, state):
+        self.state = state
+        self._done.set()
+
+
+class InferenceWorker:
+    """One thread and one job queue for one set of weights."""
+
+    def __init__(self, key):
+        self.key = key
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._loop, name=f"jynx-inference-{key}", daemon=True)
+        self._thread.start()
+
+    def submit(self, job):
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("Inference worker has been shut down")
+            job._worker = self
+            heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+            self._cond.notify()
+        self._report()
+        return job
+
+    def pending(self):
+        """Queued jobs in run order (not counting the running one)."""
+        with self._cond:
+            return [job for _, _, job in sorted(self._heap) if not job.cancelled]
+
+    @property
+    def busy(self):
+        return self._running is not None or bool(self.pending())
+
+    def _drop(self, job):
+        with self._cond:
+            entries = [entry for entry in self._heap if entry[2] is not job]
+            if len(entries) == len(self._heap):
+                return  # already picked up; the running job sees its token
+            self._heap = entries
+            heapq.heapify(self._heap)
+            job._finish(CANCELLED)
+        # Jobs behind the dropped one move up now, not when the next job starts
+        self._report()
+
+    def _report(self):
+        with self._cond:
+            running = self._running is not None
+            queued = [job for _, _, job in sorted(self._heap) if not job.cancelled]
+        for ahead, job in enumerate(queued, start=1 if running else 0):
+            job._tell(ahead)
+
+    def _next(self):
+        with self._cond:
+            while True:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)[2]._finish(CANCELLED)
+                if self._heap:
+                    job = heapq.heappop(self._heap)[2]
+                    self._running = job
+                    return job
+                if self._stopped:
+                    return None
+                self._cond.wait()
+
+    def _loop(self):
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            job.state = RUNNING
+            job.started_at = time.perf_counter()
+            job._tell(0)
+            self._report()
+            try:
+                job.run(job.cancel_token)
+            except Exception as e:
+                # The job reports its own errors; this only keeps the worker alive
+                print(f"[Jynx] Inference job {job.label or ''} failed: {e}")
+            finally:
+                with self._cond:
+                    self._running = None
+                job._finish(CANCELLED if job.cancelled else DONE)
+                self._report()
+
+    def cancel_all(self):
+        with self._cond:
+            jobs = [job for _, _, job in self._heap]
+            if self._running is not None:
+                jobs.append(self._running)
+        for job in jobs:
+            job.cancel()
+
+    def shutdown(self, wait=True):
+        self.cancel_all()
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if wait:
+            self._thread.join()
+
+
+class InferenceQueue:
+    """Workers by pool key, created on first use."""
+
+    def __init__(self):
+        self._workers = {}
+        self._lock = threading.Lock()
+
+    def worker(self, key):
+        with self._lock:
+            worker = self._workers.get(key)
+            if worker is None:
+                worker = InferenceWorker(key)
+                self._workers[key] = worker
+            return worker
+
+    def submit(self, key, job):
+        return self.worker(key).submit(job)
+
+    def busy(self):
+        with self._lock:
+            workers = list(self._workers.values())
+        return any(w.busy for w in workers)
+
+    def cancel_all(self):
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel_all()
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            workers, self._workers = list(self._workers.values()), {}
+        for worker in workers:
+            worker.shutdown(wait)
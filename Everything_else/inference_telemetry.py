@@ -0,0 +1,249 @@
+# ============================================================
+#   inference_telemetry.py — Per-Call Inference Metrics
+# ============================================================
+#
+# Every persona call records: model load time, prompt tokens, prompt
+# eval time, time to first token, decode tokens/s and peak RSS into a
+# bounded in-memory ring buffer. Prompt eval time comes from llama.cpp's
+# own perf counters (prompt_eval_s) when the binding exposes them;
+# otherwise it is estimated from TTFT (prompt_eval_est_s). Records can also be appended to a
+# Fernet-encrypted local log. perf_report() summarises them for the
+# `perf_report` protocol.
+
+import json
+import os
+import resource
+import threading
+import time
+from collections import deque, defaultdict
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_DIR = os.path.join(SCRIPT_DIR, "logs")
+RING_SIZE = 256
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def chunk_text(chunk):
+    """Token text from a completion or chat-completion stream chunk."""
+    if not isinstance(chunk, dict):
+        return str(chunk)
+    choices = chunk.get("choices") or [{}]
+    choice = choices[0]
+    return choice.get("text") or (choice.get("delta") or {}).get("content") or ""
+
+
+def _perf_counters(llm):
+    """llama.cpp's running (prompt eval ms, prompt tokens) for `llm`'s context, or None."""
+    ctx = getattr(getattr(llm, "_ctx", None), "ctx", None)
+    if ctx is None:
+        return None
+    try:
+        import llama_cpp
+        read = getattr(llama_cpp, "llama_perf_context", None) or getattr(llama_cpp, "llama_get_timings", None)
+        if read is None:
+            return None
+        data = read(ctx)
+        return data.t_p_eval_ms, data.n_p_eval
+    except Exception:
+        return None
+
+
+def measure_prompt_eval(llm):
+    """
+    Snapshot llama.cpp's prompt-eval timer before a call. Returns
+    on_finish(metrics), which stores the measured prompt_eval_s, or None
+    when the counters aren't available (track_stream then estimates).
+    """
+    before = _perf_counters(llm)
+    if before is None:
+        return None
+
+    def on_finish(metrics):
+        after = _perf_counters(llm)
+        if after is None:
+            return
+        # The counters restart if the context's perf data was reset meanwhile
+        spent_ms = after[0] - before[0] if after[0] >= before[0] else after[0]
+        metrics["prompt_eval_s"] = round(spent_ms / 1000, 3)
+    return on_finish
+
+
+class TelemetryRecorder:
+    def __init__(self, ring_size=RING_SIZE):
+        self._records = deque(maxlen=ring_size)
+        self._lock = threading.Lock()
+        self._fernet = None
+        self._log_path = None
+
+    # --------------------------------------------------------
+    # Storage
+    # --------------------------------------------------------
+    def enable_encrypted_log(self, fernet, log_path):
+        """Append every future record to `log_path`, one Fernet token per line."""
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        self._fernet = fernet
+        self._log_path = log_path
+
+    def record(self, metrics):
+        metrics.setdefault("timestamp", time.time())
+        with self._lock:
+            self._records.append(metrics)
+            if self._fernet is not None:
+                try:
+                    token = self._fernet.encrypt(json.dumps(metrics).encode("utf-8"))
+                    with open(self._log_path, "ab") as f:
+                        f.write(token + b"\n")
+                except Exception as e:
+                    print(f"[Jynx] Telemetry log write failed: {e}")
+
+    def recent(self, kind=None):
+        with self._lock:
+            records = list(self._records)
+        return [r for r in records if kind is None or r.get("kind") == kind]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    # --------------------------------------------------------
+    # Measuring a call
+    # --------------------------------------------------------
+    def track_stream(self, stream, metrics, started, on_finish=None):
+        """
+        Wrap a token stream; fills in TTFT, decode rate and peak RSS and
+        records the metrics when the stream ends (or is closed early).
+        on_finish(metrics) adds anything else known only at the end.
+        """
+        first = last = None
+        tokens = 0
+        try:
+            for chunk in stream:
+                if chunk_text(chunk):
+                    now = time.perf_counter()
+                    if first is None:
+                        first = now
+                    last = now
+                    tokens += 1
+                yield chunk
+        finally:
+            # Close first: the stream's own teardown may still add metrics
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+            self._finish(metrics, started, first, last, tokens, on_finish)
+
+    def track_result(self, result, metrics, started, on_finish=None):
+        """Record a non-streaming completion using its usage block."""
+        usage = result.get("usage", {}) if isinstance(result, dict) else {}
+        tokens = usage.get("completion_tokens", 0)
+        if usage.get("prompt_tokens"):
+            metrics["prompt_tokens"] = usage["prompt_tokens"]
+        end = time.perf_counter()
+        metrics["total_s"] = round(end - started, 3)
+        metrics["completion_tokens"] = tokens
+        metrics["peak_rss_mb"] = round(peak_rss_mb(), 1)
+        if on_finish:
+            on_finish(metrics)
+        self.record(metrics)
+        return result
+
+    def _finish(self, metrics, started, first, last, tokens, on_finish=None):
+        end = time.perf_counter()
+        metrics["completion_tokens"] = tokens
+        metrics["total_s"] = round(end - started, 3)
+        if first is not None:
+            ttft = first - started
+            decode_tps = (tokens - 1) / (last - first) if tokens > 1 and last > first else 0.0
+            metrics["ttft_s"] = round(ttft, 3)
+            metrics["decode_tps"] = round(decode_tps, 2)
+            if "prompt_eval_s" not in metrics:
+                # Not measured: TTFT minus one decode step
+                one_token = 1 / decode_tps if decode_tps else 0.0
+                metrics["prompt_eval_est_s"] = round(max(0.0, ttft - one_token), 3)
+        metrics["peak_rss_mb"] = round(peak_rss_mb(), 1)
+        if on_finish:
+            on_finish(metrics)
+        self.record(metrics)
+
+
+TELEMETRY = TelemetryRecorder()
+
+
+def enable_encrypted_log(fernet, username):
+    TELEMETRY.enable_encrypted_log(fernet, os.path.join(LOG_DIR, f"telemetry_{username}.log.enc"))
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def _fmt(value, unit, digits=2):
+    return "-" if value is None else f"{value:.{digits}f}{unit}"
+
+
+def _prompt_eval(records):
+    """Mean prompt eval time; estimates are marked as such."""
+    measured = _mean([r.get("prompt_eval_s") for r in records])
+    if measured is not None:
+        return _fmt(measured, "s")
+    estimated = _mean([r.get("prompt_eval_est_s") for r in records])
+    return "-" if estimated is None else f"~{estimated:.2f}s (est.)"
+
+
+def _speculative_line(drafted, plain):
+    """Draft acceptance and tokens per big-model pass (1.0 = no speedup)."""
+    proposed = sum(r.get("draft_proposed", 0) for r in drafted)
+    accepted = sum(r.get("draft_accepted", 0) for r in drafted)
+    passes = sum(r["draft_passes"] for r in drafted)
+    line = (f"    speculative ({drafted[-1]['draft']}): "
+            f"{accepted / proposed if proposed else 0:.0%} of drafted tokens accepted, "
+            f"{(accepted + passes) / passes:.2f} tokens per pass")
+    if plain:
+        line += (f" | decode {_fmt(_mean([r.get('decode_tps') for r in drafted]), ' tok/s')} "
+                 f"vs {_fmt(_mean([r.get('decode_tps') for r in plain]), ' tok/s')} without")
+    return line
+
+
+def perf_report():
+    """Human-readable summary of recent inference calls."""
+    calls = TELEMETRY.recent("call")
+    if not calls:
+        return "[PERF] No inference calls recorded yet."
+
+    by_model = defaultdict(list)
+    for r in calls:
+        by_model[r["model_id"]].append(r)
+
+    lines = [f"[PERF] Last {len(calls)} inference calls:\n"]
+    for model_id, records in by_model.items():
+        lines.append(
+            f"- {model_id}: {len(records)} calls | "
+            f"load {_fmt(_mean([r.get('load_s') for r in records]), 's')} | "
+            f"prompt {_fmt(_mean([r.get('prompt_tokens') for r in records]), ' tok', 0)} "
+            f"in {_prompt_eval(records)} | "
+            f"TTFT {_fmt(_mean([r.get('ttft_s') for r in records]), 's')} | "
+            f"decode {_fmt(_mean([r.get('decode_tps') for r in records]), ' tok/s')}"
+        )
+        drafted = [r for r in records if r.get("draft_passes")]
+        if drafted:
+            lines.append(_speculative_line(drafted, [r for r in records if not r.get("draft")]))
+
+    stopped = [r for r in calls if r.get("repetition_stop")]
+    saved = sum(r.get("tokens_saved", 0) for r in calls + TELEMETRY.recent("batch"))
+    if saved:
+        lines.append(f"\nRepetition guard: {len(stopped)} looping replies stopped, ~{saved} tokens saved")
+
+    councils = TELEMETRY.recent("council")
+    if councils:
+        last = councils[-1]
+        lines.append(f"\nLast council: {last['total_s']:.1f}s total")
+        for stage, seconds in last.get("stages", []):
+            lines.append(f"  • {stage}: {seconds:.1f}s")
+
+    lines.append(f"\nPeak RSS: {peak_rss_mb():.0f} MB")
+    return "\n".join(lines)
@@ -145,6 +145,15 @@ def status_report():
         return f"[ERROR] Status report unavailable: {e}"
 
 
+def perf_report():
+    """Inference latency summary: load time, prompt eval, TTFT, decode tok/s."""
+    try:
+        from Everything_else.model_registry import get_perf_report
+        return get_perf_report()
+    except Exception as e:
+        return f"[ERROR] Performance report unavailable: {e}"
+
+
 def get_random_prompt():
     import os, random
     prompt_file = os.path.join(os.path.dirname(__file__), "soul_prompts.txt")
@@ -368,6 +377,9 @@ def execute_command(command_name: str, username: str = "User"):
         elif command_name == "status_report":
             return status_report()
 
+        elif command_name == "perf_report":
+            return perf_report()
+
         elif command_name == "soul_vent":
             return soul_vent()
 
@@ -0,0 +1,217 @@
+# ============================================================
+#   model_config.py — Lazy, Validated, Hot-Reloadable models.yaml
+# ============================================================
+#
+# models.yaml is parsed on first use (not at import), validated once
+# into compact ModelConfig objects and re-read whenever the file's
+# mtime changes, so editing a persona or temperature takes effect on
+# the next call without restarting the app or reloading weights.
+
+import os
+import re
+import threading
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_YAML_PATH = os.path.join(SCRIPT_DIR, "models", "models.yaml")
+
+# Known per-model keys and their expected types
+FIELD_TYPES = {
+    "name": str,
+    "path": str,
+    "system_prompt": str,
+    "temperature": (int, float),
+    "max_tokens": int,
+    "n_ctx": int,
+    "stream": bool,
+    "pin": bool,
+    "preload": bool,
+    "n_gpu_layers": int,
+    "use_mlock": bool,
+    "generation_token_limit": int,
+    "n_threads": int,
+    "n_threads_batch": int,
+    "n_batch": int,
+    "type_k": int,
+    "type_v": int,
+    "top_p": (int, float),
+    "top_k": int,
+    "min_p": (int, float),
+    "repeat_penalty": (int, float),
+    "draft": (str, dict),
+    "repetition": (bool, dict),
+}
+
+# A "key: value" line inside a block scalar usually means broken indentation
+_STRAY_KEY = re.compile(r"^\s*(" + "|".join(FIELD_TYPES) + r")\s*:", re.MULTILINE)
+
+
+class ConfigError(ValueError):
+    pass
+
+
+class ModelConfig:
+    """
+    One validated models.yaml entry. Typed attributes for the known fields;
+    get()/[]/in keep working for code that treats configs as dicts.
+    """
+
+    __slots__ = ("model_id", "raw", "name", "path", "system_prompt", "temperature",
+                 "max_tokens", "stream", "pin", "preload", "warnings")
+
+    def __init__(self, model_id, raw):
+        self.model_id = model_id
+        self.raw = raw
+        self.name = raw.get("name", model_id)
+        self.path = raw["path"]
+        self.system_prompt = raw.get("system_prompt", "You are a helpful assistant.")
+        self.temperature = raw.get("temperature", 0.7)
+        self.max_tokens = raw.get("max_tokens", 256)
+        self.stream = raw.get("stream", False)
+        self.pin = raw.get("pin", False)
+        self.preload = raw.get("preload", False)
+        self.warnings = []
+
+    def get(self, key, default=None):
+        return self.raw.get(key, default)
+
+    def __getitem__(self, key):
+        if key == "name":
+            return self.name
+        return self.raw[key]
+
+    def __contains__(self, key):
+        return key in self.raw
+
+    def __repr__(self):
+        return f"ModelConfig({self.model_id!r}, path={self.path!r})"
+
+
+def validate_entry(model_id, raw):
+    """Return (errors, warnings) for a raw models.yaml entry."""
+    errors, warnings = [], []
+    if not isinstance(raw, dict):
+        return [f"{model_id}: entry must be a mapping"], warnings
+
+    if not raw.get("path"):
+        errors.append(f"{model_id}: missing 'path'")
+
+    for key, value in raw.items():
+        expected = FIELD_TYPES.get(key)
+        if expected is None:
+            warnings.append(f"{model_id}: unknown key '{key}'")
+            continue
+        # bool is an int subclass — don't accept True as a token count
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            errors.append(f"{model_id}: '{key}' should be {getattr(expected, '__name__', 'a number')}, got {value!r}")
+
+    temperature = raw.get("temperature")
+    if isinstance(temperature, (int, float)) and not 0 <= temperature <= 2:
+        errors.append(f"{model_id}: temperature {temperature} outside 0–2")
+
+    for key in ("max_tokens", "n_ctx", "generation_token_limit"):
+        value = raw.get(key)
+        if isinstance(value, int) and value <= 0:
+            errors.append(f"{model_id}: '{key}' must be positive")
+
+    prompt = raw.get("system_prompt")
+    if isinstance(prompt, str):
+        stray = sorted(set(_STRAY_KEY.findall(prompt)))
+        if stray:
+            warnings.append(f"{model_id}: system_prompt contains {', '.join(stray)} — check YAML indentation")
+
+    return errors, warnings
+
+
+class ConfigStore:
+    """Parses models.yaml on demand and re-parses when its mtime changes."""
+
+    def __init__(self, path=MODELS_YAML_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._models = {}
+        self._sections = {}
+        self._problems = []
+        self._listeners = []
+
+    def on_reload(self, callback):
+        """Register callback() to run after every (re)load."""
+        self._listeners.append(callback)
+
+    def _ensure_fresh(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            if self._mtime is None:
+                raise ConfigError(f"Cannot read {self.path}: {e}") from e
+            return  # keep the last good config if the file briefly disappears
+
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            self._load(mtime)
+
+        for callback in self._listeners:
+            callback()
+
+    def _load(self, mtime):
+        import yaml
+
+        try:
+            with open(self.path, "r") as f:
+                data = yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            if self._mtime is None:
+                raise ConfigError(f"models.yaml is not valid YAML: {e}") from e
+            print(f"[Jynx] models.yaml edit ignored (invalid YAML): {e}")
+            self._mtime = mtime
+            return
+
+        models, problems = {}, []
+        for model_id, raw in (data.get("models") or {}).items():
+            errors, warnings = validate_entry(model_id, raw)
+            problems.extend(errors + warnings)
+            if errors:
+                continue
+            config = ModelConfig(model_id, raw)
+            config.warnings = warnings
+            models[model_id] = config
+
+        for problem in problems:
+            print(f"[Jynx] Config: {problem}")
+
+        reloading = self._mtime is not None
+        self._models = models
+        self._sections = {k: (v or {}) for k, v in data.items() if k != "models"}
+        self._problems = problems
+        self._mtime = mtime
+        if reloading:
+            print(f"[Jynx] models.yaml reloaded ({len(models)} models)")
+
+    # --------------------------------------------------------
+    # Accessors
+    # --------------------------------------------------------
+    def models(self):
+        self._ensure_fresh()
+        return self._models
+
+    def get(self, model_id):
+        self._ensure_fresh()
+        config = self._models.get(model_id)
+        if config is None:
+            invalid = [p for p in self._problems if p.startswith(f"{model_id}:")]
+            if invalid:
+                raise ConfigError(f"Model ID '{model_id}' is invalid: {'; '.join(invalid)}")
+            raise ValueError(f"Model ID '{model_id}' not found in models.yaml")
+        return config
+
+    def section(self, name):
+        self._ensure_fresh()
+        return self._sections.get(name) or {}
+
+    def problems(self):
+        self._ensure_fresh()
+        return list(self._problems)
@@ -0,0 +1,316 @@
+# ============================================================
+#   model_daemon.py — Local Model-Residency Daemon (Unix Socket)
+# ============================================================
+#
+# Hosts the pooled Llama instances in a separate process so the
+# multi-GB weights survive UI restarts and a crash during inference
+# cannot take the window down. Clients talk newline-delimited JSON
+# over a Unix domain socket — there is no network listener.
+#
+#   python -m Everything_else.model_daemon            # run in foreground
+#   GHOSTDRIVE_DAEMON=1 ./launch_ghostdrive.sh         # UI becomes a client
+#
+# Requests:  {"op": "ping" | "load" | "prefetch" | "generate" | "stats" | "perf_report" | "shutdown", ...}
+# Responses: one JSON object per line; "generate" streams {"chunk": ...}
+#            lines followed by {"done": true} or {"error": "..."}.
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# How long daemon_available(max_age=...) trusts its last ping
+DAEMON_CHECK_TTL_S = 5.0
+
+_availability = {}  # socket path -> (checked at, reachable)
+_availability_lock = threading.Lock()
+
+
+def default_socket_path():
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(base, f"ghostdrive-{os.getuid()}", "jynx.sock")
+
+
+# ============================================================
+# Client side
+# ============================================================
+class DaemonError(RuntimeError):
+    pass
+
+
+def check_socket_dir(socket_path):
+    """
+    The socket's directory must be a real directory owned by this user
+    with mode 0700 — otherwise another local user could have planted the
+    socket (or swap it later) and read every prompt.
+    """
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode):
+        raise DaemonError(f"Daemon socket directory {directory} is not a directory")
+    if st.st_uid != os.getuid():
+        raise DaemonError(f"Daemon socket directory {directory} is owned by uid {st.st_uid}")
+    if stat.S_IMODE(st.st_mode) != 0o700:
+        raise DaemonError(f"Daemon socket directory {directory} has mode "
+                          f"{stat.S_IMODE(st.st_mode):o}, expected 700")
+
+
+def _request(socket_path, payload, timeout=None):
+    """Open a connection, send one request and return (sock, reader)."""
+    check_socket_dir(socket_path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+    except OSError:
+        sock.close()
+        # The daemon went away; the next daemon_available() pings again
+        with _availability_lock:
+            _availability.pop(socket_path, None)
+        raise
+    return sock, sock.makefile("r", encoding="utf-8")
+
+
+def _read_reply(reader):
+    line = reader.readline()
+    if not line:
+        raise DaemonError("Model daemon closed the connection.")
+    reply = json.loads(line)
+    if "error" in reply:
+        raise DaemonError(reply["error"])
+    return reply
+
+
+def daemon_request(payload, socket_path=None, timeout=None):
+    """Send a single-reply request (ping/load/prefetch/stats/shutdown)."""
+    sock, reader = _request(socket_path or default_socket_path(), payload, timeout)
+    try:
+        return _read_reply(reader)
+    finally:
+        reader.close()
+        sock.close()
+
+
+def _ping(path):
+    if not os.path.exists(path):
+        return False
+    try:
+        return daemon_request({"op": "ping"}, path, timeout=1.0).get("ok", False)
+    except DaemonError as e:
+        print(f"[Jynx] Not using the model daemon: {e}")
+        return False
+    except (OSError, ValueError):
+        return False
+
+
+def daemon_available(socket_path=None, max_age=0.0):
+    """True when a daemon answers on the socket; a ping younger than `max_age` seconds is reused."""
+    path = socket_path or default_socket_path()
+    now = time.monotonic()
+    with _availability_lock:
+        cached = _availability.get(path)
+    if cached is not None and now - cached[0] < max_age:
+        return cached[1]
+    available = _ping(path)
+    with _availability_lock:
+        _availability[path] = (now, available)
+    return available
+
+
+class RemotePersona:
+    """
+    Client-side stand-in for model_registry.Persona. Same attributes and
+    call() signature, but generation happens inside the daemon.
+    """
+
+    def __init__(self, model_id, config, stop, socket_path=None):
+        self.model_id = model_id
+        self.config = config
+        self.name = config.get("name", model_id)
+        self.stop = stop
+        self.socket_path = socket_path or default_socket_path()
+
+    def __call__(self, prompt, stream_override=None, max_tokens=None, temperature=None, stop=None, cancel=None,
+                 history=None, context_note=None):
+        payload = {
+            "op": "generate",
+            "model_id": self.model_id,
+            "prompt": prompt,
+            "stream_override": stream_override,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stop": stop,
+            "history": history,
+            "context_note": context_note,
+        }
+        stream_enabled = self.config.get("stream", False) if stream_override is None else stream_override
+        if not stream_enabled:
+            return daemon_request(payload, self.socket_path)["result"]
+        return self._stream(payload, cancel)
+
+    def _stream(self, payload, cancel=None):
+        # Closing the socket on cancel makes the daemon's next write fail,
+        # which closes its llama generator
+        sock, reader = _request(self.socket_path, payload)
+        try:
+            while True:
+                if cancel is not None and cancel.cancelled:
+                    return
+                reply = _read_reply(reader)
+                if reply.get("done"):
+                    return
+                yield reply["chunk"]
+        finally:
+            reader.close()
+            sock.close()
+
+
+# ============================================================
+# Server side
+# ============================================================
+class _Handler(socketserver.StreamRequestHandler):
+    def _send(self, obj):
+        self.wfile.write((json.dumps(obj) + "\n").encode("utf-8"))
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            op = request.get("op")
+            handler = getattr(self.server, f"op_{op}", None)
+            if handler is None:
+                self._send({"error": f"Unknown op: {op}"})
+                return
+            handler(request, self._send)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away — generation was stopped by the generator close
+        except Exception as e:
+            try:
+                self._send({"error": f"{type(e).__name__}: {e}"})
+            except OSError:
+                pass
+
+
+class ModelDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        from Everything_else import model_registry
+        from Everything_else.cancellation import CancelToken
+        self.registry = model_registry
+        self._stopping = CancelToken()
+        self.registry.DAEMON_CLIENT_ENABLED = False
+        self.socket_path = socket_path
+        self._decode_locks = {}
+        self._locks_guard = threading.Lock()
+
+        os.makedirs(os.path.dirname(socket_path), mode=0o700, exist_ok=True)
+        check_socket_dir(socket_path)
+        if os.path.exists(socket_path):
+            if daemon_available(socket_path):
+                raise DaemonError(f"A model daemon is already listening on {socket_path}")
+            os.remove(socket_path)
+
+        super().__init__(socket_path, _Handler)
+        os.chmod(socket_path, 0o600)
+
+    def _decode_lock(self, pool_key):
+        """Only one decode may run per llama context at a time."""
+        with self._locks_guard:
+            return self._decode_locks.setdefault(pool_key, threading.Lock())
+
+    # --------------------------------------------------------
+    # Operations
+    # --------------------------------------------------------
+    def op_ping(self, request, send):
+        send({"ok": True, "pid": os.getpid()})
+
+    def op_load(self, request, send):
+        self.registry.acquire_llm(request["model_id"])
+        send({"ok": True})
+
+    def op_prefetch(self, request, send):
+        self.registry.prefetch_model(request["model_id"])
+        send({"ok": True})
+
+    def op_stats(self, request, send):
+        send({"ok": True, "pool": self.registry.get_model_pool().stats()})
+
+    def op_perf_report(self, request, send):
+        send({"ok": True, "report": self.registry.get_perf_report()})
+
+    def op_shutdown(self, request, send):
+        send({"ok": True})
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def op_generate(self, request, send):
+        persona = self.registry.get_local_persona(request["model_id"])
+        with self._decode_lock(persona.pool_key):
+            result = persona(
+                request["prompt"],
+                stream_override=request.get("stream_override"),
+                max_tokens=request.get("max_tokens"),
+                temperature=request.get("temperature"),
+                stop=request.get("stop"),
+                history=request.get("history"),
+                context_note=request.get("context_note"),
+            )
+            if isinstance(result, dict):
+                send({"result": result})
+                return
+            try:
+                for chunk in result:
+                    send({"chunk": chunk})
+            finally:
+                close = getattr(result, "close", None)
+                if close:
+                    close()
+            send({"done": True})
+
+    def _warm_up(self):
+        self.registry.preload_models()
+        self.registry.calibrate_idle(self._stopping)
+
+    def serve(self):
+        print(f"[Jynx] Model daemon listening on {self.socket_path}")
+        threading.Thread(target=self._warm_up, name="jynx-preload", daemon=True).start()
+        try:
+            self.serve_forever()
+        finally:
+            self._stopping.cancel()
+            self.server_close()
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
+            self.registry.unload_previous_model(include_pinned=True)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GhostDrive model-residency daemon")
+    parser.add_argument("--socket", default=default_socket_path(), help="Unix socket path")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, PROJECT_ROOT)
+    sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+    try:
+        ModelDaemon(args.socket).serve()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+# ============================================================
+#   model_pool.py — Memory-Budgeted LRU Pool of Llama Instances
+# ============================================================
+#
+# Several models.yaml entries point at the same GGUF file with the
+# same load parameters. The pool keeps one Llama per distinct
+# (path, n_ctx, n_gpu_layers, use_mlock) key, evicts the least
+# recently used instances when the RAM budget is exceeded and never
+# evicts pinned entries or ones in use. An instance is in use while
+# it is borrowed (acquire(borrow=True) … release()) or its decode lock
+# is held — both are counted under the pool lock; loads in flight
+# reserve their size against the budget.
+
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Share of physical RAM the pool may use when no budget is configured
+DEFAULT_BUDGET_FRACTION = 0.6
+
+# KV cache + scratch buffers on top of the raw GGUF size (per 1k ctx)
+CTX_OVERHEAD_BYTES_PER_1K = 128 * 1024 * 1024
+
+# Chunk size used when reading a GGUF through to warm the page cache
+WARM_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+def make_pool_key(model_path, n_ctx, n_gpu_layers, use_mlock, draft=None):
+    """Pool identity of a loaded instance. Same key → same weights (and draft model)."""
+    return (os.path.abspath(model_path), int(n_ctx), int(n_gpu_layers), bool(use_mlock), draft)
+
+
+def estimate_model_bytes(model_path, n_ctx):
+    """Rough resident size: file size plus context buffers."""
+    try:
+        file_bytes = os.path.getsize(model_path)
+    except OSError:
+        file_bytes = 0
+    return file_bytes + (int(n_ctx) // 1024 + 1) * CTX_OVERHEAD_BYTES_PER_1K
+
+
+def detect_ram_budget(fraction=DEFAULT_BUDGET_FRACTION):
+    """Default budget: a fraction of total physical memory."""
+    try:
+        import psutil
+        total = psutil.virtual_memory().total
+    except Exception:
+        try:
+            total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        except (ValueError, OSError, AttributeError):
+            total = 8 * 1024 ** 3
+    return int(total * fraction)
+
+
+def available_ram_bytes():
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except Exception:
+        return 0
+
+
+def warm_page_cache(model_path):
+    """
+    Pull a GGUF file into the OS page cache without loading it as a model.
+    A later mmap-backed Llama load then reads from RAM instead of disk.
+    """
+    size = os.path.getsize(model_path)
+    fd = os.open(model_path, os.O_RDONLY)
+    try:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_WILLNEED)
+        # fadvise is only a hint; reading through guarantees residency
+        if available_ram_bytes() > size:
+            while os.read(fd, WARM_CHUNK_BYTES):
+                pass
+    finally:
+        os.close(fd)
+
+
+class DecodeLock:
+    """
+    Reentrant per-key lock whose holders count as users of the instance,
+    so it can't be evicted mid-decode — not even by the holding thread.
+    """
+
+    def __init__(self, pool, key):
+        self._pool = pool
+        self._key = key
+        self._lock = threading.RLock()
+
+    def acquire(self, blocking=True, timeout=-1):
+        if not self._lock.acquire(blocking, timeout):
+            return False
+        self._pool._begin_use(self._key)
+        return True
+
+    def release(self):
+        self._pool._end_use(self._key)
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class PoolEntry:
+    def __init__(self, key, llm, size_bytes, load_seconds):
+        self.key = key
+        self.llm = llm
+        self.size_bytes = size_bytes
+        self.load_seconds = load_seconds
+        self.pinned = False
+        self.last_used = time.time()
+        self.users = 0  # outstanding borrows
+
+
+class ModelPool:
+    """
+    LRU cache of loaded Llama instances bounded by a RAM budget.
+
+    `loader` is called as loader(**load_kwargs) and must return an object
+    with a close() method (llama_cpp.Llama in production).
+    """
+
+    def __init__(self, loader, ram_budget_bytes=None):
+        self.loader = loader
+        self.ram_budget_bytes = ram_budget_bytes or detect_ram_budget()
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._reserved = {}  # key → bytes of a load in flight
+        self._warming = set()
+        self._decode_locks = {}
+        self._active = {}  # key → decode lock holds
+        self._activity = 0  # bumped on every acquire, borrow and decode
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------------
+    # Lookup / load
+    # --------------------------------------------------------
+    def acquire(self, key, load_kwargs, size_bytes, pin=False, label=None, borrow=False):
+        """
+        Return the instance for `key`, loading it if necessary. With
+        `borrow`, the instance can't be evicted until release(key).
+        """
+        label = label or os.path.basename(key[0])
+
+        while True:
+            with self._lock:
+                self._activity += 1
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    entry.last_used = time.time()
+                    entry.pinned = entry.pinned or pin
+                    if borrow:
+                        entry.users += 1
+                    return entry.llm
+
+                pending = self._loading.get(key)
+                if pending is None:
+                    # We are the loader for this key
+                    self._loading[key] = threading.Event()
+                    self._evict_for(size_bytes)
+                    self._reserved[key] = size_bytes
+                    break
+
+            # Someone else is loading the same key — wait and re-check
+            pending.wait()
+
+        print(f"[Jynx] Pool miss, loading {label}")
+        start = time.perf_counter()
+        try:
+            llm = self.loader(**load_kwargs)
+        except Exception:
+            with self._lock:
+                self._reserved.pop(key, None)
+                self._loading.pop(key).set()
+            raise
+
+        entry = PoolEntry(key, llm, size_bytes, time.perf_counter() - start)
+        entry.pinned = pin
+        entry.users = 1 if borrow else 0
+        with self._lock:
+            self._entries[key] = entry
+            self._reserved.pop(key, None)
+            self._loading.pop(key).set()
+
+        print(f"[Jynx] Loaded {label} in {entry.load_seconds:.1f}s "
+              f"({self.used_bytes() / 1024 ** 3:.1f}/{self.ram_budget_bytes / 1024 ** 3:.1f} GB pooled)")
+        return llm
+
+    # --------------------------------------------------------
+    # Background prefetch
+    # --------------------------------------------------------
+    def prefetch(self, key, load_kwargs, size_bytes, label=None):
+        """
+        Warm `key` on a background thread so the next acquire() is instant.
+        Does a full load if it fits in the budget without evicting anything,
+        otherwise only warms the page cache. Returns the thread (or None).
+        """
+        with self._lock:
+            if key in self._entries or key in self._loading or key in self._warming:
+                return None
+            fits = self.used_bytes() + size_bytes <= self.ram_budget_bytes
+            self._warming.add(key)
+
+        def work():
+            try:
+                if fits:
+                    self.acquire(key, load_kwargs, size_bytes, label=label)
+                else:
+                    print(f"[Jynx] Prefetching {label or os.path.basename(key[0])} into page cache")
+                    warm_page_cache(key[0])
+            except Exception as e:
+                print(f"[Jynx] Prefetch failed for {label or key[0]}: {e}")
+            finally:
+                with self._lock:
+                    self._warming.discard(key)
+
+        thread = threading.Thread(target=work, name="jynx-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def borrow_loaded(self, key):
+        """Borrow the instance for `key` if it is already loaded; never loads. None otherwise."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._activity += 1
+            entry.users += 1
+            return entry.llm
+
+    def release(self, key):
+        """End one borrow of `key`; eviction deferred while it was in use happens now."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.users == 0:
+                return
+            entry.users -= 1
+            self._settle(key)
+
+    def decode_lock(self, key):
+        """
+        Lock that serialises decoding on the instance for `key` — a llama
+        context can't run two generations at once. Reentrant, so a thread
+        may nest calls on the same weights.
+        """
+        with self._lock:
+            lock = self._decode_locks.get(key)
+            if lock is None:
+                lock = self._decode_locks[key] = DecodeLock(self, key)
+            return lock
+
+    def _begin_use(self, key):
+        with self._lock:
+            self._activity += 1
+            self._active[key] = self._active.get(key, 0) + 1
+
+    def _end_use(self, key):
+        with self._lock:
+            count = self._active.get(key, 0) - 1
+            if count > 0:
+                self._active[key] = count
+            else:
+                self._active.pop(key, None)
+                self._settle(key)
+
+    def contains(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get_entry(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def pin(self, key, pinned=True):
+        with self._lock:
+            if key in self._entries:
+                self._entries[key].pinned = pinned
+
+    def activity(self):
+        """Counter that changes whenever anything acquires, borrows or decodes."""
+        with self._lock:
+            return self._activity
+
+    def idle(self):
+        """Nothing borrowed, decoding, loading or prefetching right now."""
+        with self._lock:
+            return not (self._loading or self._active or self._warming
+                        or any(e.users for e in self._entries.values()))
+
+    def try_reserve(self, tag, size_bytes):
+        """
+        Count `size_bytes` of memory used outside the pool (e.g. a calibration
+        instance) against the budget until unreserve(tag). Never evicts:
+        False when it doesn't fit next to what is loaded.
+        """
+        with self._lock:
+            if self.used_bytes() + size_bytes > self.ram_budget_bytes:
+                return False
+            self._reserved[tag] = size_bytes
+            return True
+
+    def unreserve(self, tag):
+        with self._lock:
+            self._reserved.pop(tag, None)
+
+    def used_bytes(self):
+        """Bytes of loaded instances plus those reserved by loads in flight."""
+        return sum(e.size_bytes for e in self._entries.values()) + sum(self._reserved.values())
+
+    # --------------------------------------------------------
+    # Eviction
+    # --------------------------------------------------------
+    def _in_use(self, entry):
+        """Borrowed or being decoded on. Caller holds the lock."""
+        return entry.users > 0 or self._active.get(entry.key, 0) > 0
+
+    def _settle(self, key):
+        """Eviction deferred while `key` was in use happens now. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is not None and not self._in_use(entry) and self.used_bytes() > self.ram_budget_bytes:
+            self._evict_for(0)
+
+    def _evict_for(self, size_bytes):
+        """Drop LRU idle unpinned entries until `size_bytes` fits. Caller holds the lock."""
+        for key in list(self._entries):
+            if self.used_bytes() + size_bytes <= self.ram_budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry.pinned or self._in_use(entry):
+                continue
+            self._close(self._entries.pop(key))
+
+        if size_bytes and self.used_bytes() + size_bytes > self.ram_budget_bytes:
+            print("[Jynx] Warning: RAM budget exceeded by pinned or busy models; loading anyway.")
+
+    def evict(self, key):
+        """Close the instance for `key` now; False if it is in use (or not loaded)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._in_use(entry):
+                return False
+            del self._entries[key]
+        self._close(entry)
+        gc.collect()
+        return True
+
+    def clear(self, include_pinned=False):
+        """Close every pooled instance (pinned ones only if asked)."""
+        with self._lock:
+            # Instances in use are left alone; they are freed on a later clear or eviction
+            victims = [k for k, e in self._entries.items()
+                       if (include_pinned or not e.pinned) and not self._in_use(e)]
+            entries = [self._entries.pop(k) for k in victims]
+        for entry in entries:
+            self._close(entry)
+        return len(entries)
+
+    def _close(self, entry):
+        try:
+            entry.llm.close()
+            print(f"[Jynx] Evicted {os.path.basename(entry.key[0])} from pool.")
+        except Exception as e:
+            print(f"[Jynx] Warning: error while closing model: {e}")
+
+    def stats(self):
+        with self._lock:
+            return [
+                {
+                    "path": os.path.basename(e.key[0]),
+                    "n_ctx": e.key[1],
+                    "size_gb": round(e.size_bytes / 1024 ** 3, 2),
+                    "pinned": e.pinned,
+                    "load_seconds": round(e.load_seconds, 2),
+                }
+                for e in self._entries.values()
+            ]
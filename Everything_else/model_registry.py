@@ -1,46 +1,204 @@
 # ============================================================
-#   model_registry.py — Sequential Model Loader (No Caching)
+#   model_registry.py — Pooled Model Loader
 # ============================================================
 
 import os
 import gc
-import yaml
+import json
 import time
-from llama_cpp import Llama
+import hashlib
+import threading
+from contextlib import contextmanager
+
+from Everything_else.model_config import ConfigStore, MODELS_YAML_PATH
+from Everything_else.model_pool import ModelPool, make_pool_key, estimate_model_bytes
+from Everything_else.prompt_cache import PromptStateCache, DEFAULT_CACHE_DIR, _tokenize, _evaluated_tokens
+from Everything_else.model_daemon import RemotePersona, daemon_available, daemon_request, DAEMON_CHECK_TTL_S
+from Everything_else.hw_tuner import get_tuned_settings, default_settings, calibrate
+from Everything_else.gguf_catalog import GGUFCatalog, template_family, kv_cache_bytes
+from Everything_else.inference_telemetry import TELEMETRY, perf_report, measure_prompt_eval
+from Everything_else.cancellation import cancellable
+from Everything_else.batched_decode import SequenceRequest
+from Everything_else.repetition_guard import RepetitionGuard, guard_settings, guarded
+from Everything_else.speculative import (
+    draft_spec, draft_key, draft_bytes, build_draft_model, check_vocab, DraftTracker
+)
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-MODELS_YAML_PATH = os.path.join(SCRIPT_DIR, "models", "models.yaml")
 
-with open(MODELS_YAML_PATH, "r") as f:
-    MODEL_CONFIGS = yaml.safe_load(f)["models"]
+# models.yaml — parsed on first use, re-read when the file changes
+CONFIG_STORE = ConfigStore(MODELS_YAML_PATH)
 
-# Active model pointer so we can unload safely
+# Header-only GGUF metadata (architecture, context length, template...)
+GGUF_CATALOG = GGUFCatalog()
+
+# Most recently acquired model (kept for callers that inspect it)
 ACTIVE_LLM = None
 
+# Cleared inside the daemon process itself so it never calls back into itself
+DAEMON_CLIENT_ENABLED = True
+
+# Cleared in council worker processes; only the UI process (or the daemon) calibrates
+AUTO_CALIBRATE = True
+
+_MODEL_POOL = None
+_PROMPT_CACHE = None
+_init_lock = threading.Lock()
+
+
+def _llama_loader(**kwargs):
+    """Import llama_cpp only when a model is actually loaded."""
+    from llama_cpp import Llama
+
+    spec = kwargs.pop("draft", None)
+    tracker = build_draft_model(spec, kwargs) if spec else None
+    if tracker is None:
+        return Llama(**kwargs)
+    try:
+        llm = Llama(draft_model=tracker, **kwargs)
+    except TypeError:
+        # llama_cpp older than draft_model support
+        print("[Jynx] This llama_cpp has no speculative decoding; loading without a draft")
+        return Llama(**kwargs)
+    check_vocab(llm, tracker)
+    return llm
+
+
+def _default_loader():
+    """llama_cpp, or FakeLlama when GHOSTDRIVE_FAKE_LLAMA is set (e.g. "decode_tps=30")."""
+    spec = os.environ.get("GHOSTDRIVE_FAKE_LLAMA")
+    if spec is None:
+        return _llama_loader
+    from Everything_else.fake_llama import FakeLoader, FakeProfile
+    print(f"[Jynx] Using fake models ({spec or 'default profile'})")
+    return FakeLoader(FakeProfile.parse(spec))
+
+
+def set_llama_loader(loader=None):
+    """
+    Build pooled instances with `loader(**llama_kwargs)` from now on (None:
+    back to the default). Instances from the previous loader are closed.
+    Used by benchmarks and tests to run without GGUF files.
+    """
+    pool = get_model_pool()
+    pool.clear(include_pinned=True)
+    pool.loader = loader or _default_loader()
+
+
+def _budget_bytes():
+    budget_gb = CONFIG_STORE.section("pool").get("ram_budget_gb")
+    return int(float(budget_gb) * 1024 ** 3) if budget_gb else None
+
+
+def get_model_pool():
+    """Shared pool of loaded Llama instances (LRU, RAM-budgeted)."""
+    global _MODEL_POOL
+    if _MODEL_POOL is None:
+        with _init_lock:
+            if _MODEL_POOL is None:
+                _MODEL_POOL = ModelPool(loader=_default_loader(), ram_budget_bytes=_budget_bytes())
+    return _MODEL_POOL
+
+
+def get_prompt_cache():
+    """Saved llama.cpp states for static system-prompt prefixes (None if disabled)."""
+    global _PROMPT_CACHE
+    settings = CONFIG_STORE.section("prompt_cache")
+    if not settings.get("enabled", True):
+        return None
+    if _PROMPT_CACHE is None:
+        with _init_lock:
+            if _PROMPT_CACHE is None:
+                _PROMPT_CACHE = PromptStateCache(
+                    cache_dir=settings.get("dir") or DEFAULT_CACHE_DIR,
+                    max_bytes=int(float(settings.get("max_size_mb", 2048)) * 1024 ** 2),
+                )
+    return _PROMPT_CACHE
+
+
+def _on_config_reload():
+    # Personas hold prompts/sampler settings; weights stay pooled
+    _PERSONAS.clear()
+    if _MODEL_POOL is not None:
+        _MODEL_POOL.ram_budget_bytes = _budget_bytes() or _MODEL_POOL.ram_budget_bytes
+
+
+CONFIG_STORE.on_reload(_on_config_reload)
+
+
+def use_daemon():
+    """
+    True when the model daemon is enabled and reachable; this process is
+    then a client. Called on every persona lookup, so a recent ping is reused.
+    """
+    if not DAEMON_CLIENT_ENABLED:
+        return False
+    settings = CONFIG_STORE.section("daemon")
+    if not (settings.get("enabled") or os.environ.get("GHOSTDRIVE_DAEMON") == "1"):
+        return False
+    return daemon_available(settings.get("socket"), max_age=DAEMON_CHECK_TTL_S)
+
 
 # ------------------------------------------------------------
 # 1. Fetch model config from YAML
 # ------------------------------------------------------------
 def get_model_config(model_id):
-    if model_id not in MODEL_CONFIGS:
-        raise ValueError(f"Model ID '{model_id}' not found in models.yaml")
-    return MODEL_CONFIGS[model_id]
+    """Validated ModelConfig for `model_id` (dict-style get()/[] still work)."""
+    return CONFIG_STORE.get(model_id)
+
+
+def get_model_configs():
+    return CONFIG_STORE.models()
+
+
+def get_config_section(name):
+    """Top-level models.yaml section other than `models` (pool, daemon, ...)."""
+    return CONFIG_STORE.section(name)
+
+
+def get_config_fingerprint(model_ids, sections=()):
+    """
+    Short hash of everything that changes what these models would answer:
+    their models.yaml entries, the GGUF files' size/mtime and any named
+    top-level sections.
+    """
+    parts = {}
+    for model_id in sorted(set(model_ids)):
+        try:
+            config = get_model_config(model_id)
+        except ValueError:
+            parts[model_id] = None
+            continue
+        try:
+            st = os.stat(get_model_path(model_id))
+            file_id = [st.st_size, int(st.st_mtime)]
+        except OSError:
+            file_id = None
+        parts[model_id] = {"config": config.raw, "file": file_id}
+    for name in sections:
+        parts["section:" + name] = CONFIG_STORE.section(name)
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def get_perf_report():
+    """Telemetry summary from whichever process runs inference."""
+    if use_daemon():
+        return daemon_request({"op": "perf_report"}, CONFIG_STORE.section("daemon").get("socket"))["report"]
+    return perf_report()
 
 
 # ------------------------------------------------------------
-# 2. Unload previous model (VRAM + RAM + context)
+# 2. Unload pooled models (VRAM + RAM + context)
 # ------------------------------------------------------------
-def unload_previous_model():
-    """Close the currently loaded llama model and free VRAM."""
+def unload_previous_model(include_pinned=False):
+    """Close every pooled llama model that is not pinned and free VRAM."""
     global ACTIVE_LLM
 
-    if ACTIVE_LLM is not None:
-        try:
-            ACTIVE_LLM.close()
-            print("[Jynx] Previous model successfully unloaded.")
-        except Exception as e:
-            print(f"[Jynx] Warning: error while closing model: {e}")
-        ACTIVE_LLM = None
+    closed = get_model_pool().clear(include_pinned=include_pinned)
+    if closed:
+        print(f"[Jynx] {closed} pooled model(s) unloaded.")
+    ACTIVE_LLM = None
 
     collected = gc.collect()
     print(f"[Jynx] Garbage collected: {collected} objects")
@@ -52,30 +210,78 @@ def unload_previous_model():
 # ------------------------------------------------------------
 # 3. Prompt formatting helpers
 # ------------------------------------------------------------
-def format_prompt(prompt: str, model_id: str, system_prompt: str = "You are a helpful assistant.") -> str:
+def get_model_path(model_id):
+    return os.path.join(SCRIPT_DIR, "models", get_model_config(model_id)["path"])
+
+
+def get_model_metadata(model_id):
+    """GGUF header summary for `model_id`'s file (None if missing/unreadable)."""
+    return GGUF_CATALOG.get(get_model_path(model_id))
+
+
+def get_template(model_id):
+    """Chat template family for a model ID: 'chatml', 'inst' or 'plain'."""
+    config = get_model_configs().get(model_id)
+    if config is not None:
+        family = template_family(get_model_metadata(model_id))
+        if family:
+            return family
+
+    # No embedded template — guess from the ID and file name
+    model = f"{model_id} {config.get('path', '') if config else ''}".lower()
+    if "qwen" in model:
+        return "chatml"
+    if "mistral" in model or "llama" in model or "wizard" in model:
+        return "inst"
+    return "plain"
+
+
+def format_prompt(prompt: str, model_id: str, system_prompt: str = "You are a helpful assistant.", template: str = None,
+                  history: list = None) -> str:
     """
     Clean prompt format — avoids infinite Q&A loops and trigger words.
+    `history` holds earlier (user, reply) turns of the conversation; they
+    come after the system prompt, so the formatted text only ever grows at
+    the end from one turn to the next.
     """
 
-    model = model_id.lower()
+    template = template or get_template(model_id)
+    history = history or []
 
     # QWEN = ChatML
-    if "qwen" in model:
+    if template == "chatml":
         return (
             f"<|im_start|>system\n{system_prompt.strip()}\n<|im_end|>\n"
-            f"<|im_start|>user\n{prompt.strip()}\n<|im_end|>\n"
+            + "".join(
+                f"<|im_start|>user\n{user.strip()}\n<|im_end|>\n"
+                f"<|im_start|>assistant\n{reply.strip()}\n<|im_end|>\n"
+                for user, reply in history
+            )
+            + f"<|im_start|>user\n{prompt.strip()}\n<|im_end|>\n"
             f"<|im_start|>assistant\n"
         )
 
     # LLAMA / MISTRAL = OpenInstruct format
-    if "mistral" in model or "llama" in model or "wizard" in model:
+    if template == "inst":
         return (
             f"<s>[INST] {system_prompt.strip()} [/INST]\n"
-            f"[INST] {prompt.strip()} [/INST]"
+            + "".join(f"[INST] {user.strip()} [/INST] {reply.strip()}\n" for user, reply in history)
+            + f"[INST] {prompt.strip()} [/INST]"
         )
 
     # Fallback: NO "Answer:"
-    return f"{system_prompt.strip()}\n\n{prompt.strip()}"
+    turns = "".join(f"{user.strip()}\n{reply.strip()}\n\n" for user, reply in history)
+    return f"{system_prompt.strip()}\n\n{turns}{prompt.strip()}"
+
+
+
+
+_PREFIX_MARK = "\x00JYNX_PROMPT\x00"
+
+
+def format_prompt_prefix(model_id: str, system_prompt: str, template: str = None) -> str:
+    """The static part of format_prompt() — everything before the user's prompt."""
+    return format_prompt(_PREFIX_MARK, model_id, system_prompt, template).split(_PREFIX_MARK)[0]
 
 
 
@@ -119,16 +325,16 @@ def get_stop_sequence(model_id):
         "\nAI:",
     ]
 
-    model = model_id.lower()
+    template = get_template(model_id)
 
     # Qwen is ChatML → also break on special tokens
-    if "qwen" in model:
+    if template == "chatml":
         base_stops.extend([
             "<|im_start|>",
         ])
 
     # Llama/Mistral usually need EOS explicitly
-    if "llama" in model or "mistral" in model:
+    if template == "inst":
         base_stops.extend([
             "[INST]",
             "</INST>",
@@ -147,84 +353,499 @@ def get_stop_sequence(model_id):
 
 
 # ------------------------------------------------------------
-# 4. Load model SEQUENTIALLY with zero caching
+# 4. Load model through the shared pool
 # ------------------------------------------------------------
-def load_model_from_config(model_id):
-    """Load a model fresh, after unloading any previous model."""
-    global ACTIVE_LLM
+# Context window when an entry doesn't set n_ctx (max_tokens is the
+# generation length, not the context size)
+DEFAULT_N_CTX = 4096
 
-    config = get_model_config(model_id)
-    abs_path = os.path.join(SCRIPT_DIR, "models", config["path"])
+# Explicit models.yaml values always win over the machine profile
+TUNABLE_KEYS = ("n_threads", "n_threads_batch", "n_batch", "type_k", "type_v")
+
+# Applied on top of everything else — council worker processes split the cores
+LOAD_OVERRIDES = {}
+
+
+def _load_kwargs(config):
+    """Llama(...) constructor arguments for a models.yaml entry."""
+    model_path = os.path.join(SCRIPT_DIR, "models", config["path"])
+
+    tuned = get_tuned_settings(model_path) or default_settings()
+    for key in TUNABLE_KEYS:
+        if key in config:
+            tuned[key] = config[key]
 
+    kwargs = {
+        "model_path": model_path,
+        "n_ctx": config.get("n_ctx", DEFAULT_N_CTX),
+        "n_gpu_layers": config.get("n_gpu_layers", -1),
+        "use_mlock": config.get("use_mlock", False),
+    }
+    spec = draft_spec(config)
+    if spec:
+        kwargs["draft"] = spec
+    kwargs.update(tuned)
+    kwargs.update(LOAD_OVERRIDES)
+    return kwargs
 
-    print(f"[Jynx] Loading {model_id} from: {abs_path}")
 
-    # 🔥 Completely unload any existing model first
-    unload_previous_model()
+def _pool_key(kwargs):
+    return make_pool_key(kwargs["model_path"], kwargs["n_ctx"], kwargs["n_gpu_layers"],
+                         kwargs["use_mlock"], draft_key(kwargs.get("draft")))
+
+
+# Compute buffers on top of weights + KV cache
+SCRATCH_BYTES = 256 * 1024 * 1024
+
+
+def _estimate_bytes(kwargs):
+    """Resident size from the GGUF header when available, else from file size."""
+    record = GGUF_CATALOG.get(kwargs["model_path"])
+    kv = kv_cache_bytes(record, kwargs["n_ctx"]) if record else 0
+    extra = draft_bytes(kwargs.get("draft"))
+    if not kv:
+        return estimate_model_bytes(kwargs["model_path"], kwargs["n_ctx"]) + extra
+    return record["tensor_bytes"] + kv + SCRATCH_BYTES + extra
+
+
+def memory_plan(model_id):
+    """
+    (weight bytes, per-context bytes) for a models.yaml entry. Weights are
+    mmapped, so processes loading the same file share them; each loaded
+    instance pays for its own KV cache and compute buffers.
+    """
+    return _memory_split(_load_kwargs(get_model_config(model_id)))
+
+
+def _memory_split(kwargs):
+    total = _estimate_bytes(kwargs)
+    record = GGUF_CATALOG.get(kwargs["model_path"])
+    if record:
+        weights = record["tensor_bytes"]
+    else:
+        try:
+            weights = os.path.getsize(kwargs["model_path"])
+        except OSError:
+            weights = 0
+    weights += draft_bytes(kwargs.get("draft"))
+    return weights, max(0, total - weights)
+
+
+def validate_models():
+    """
+    Check every models.yaml entry against its GGUF header without loading
+    weights. Returns a list of human-readable problems (empty when all good).
+    """
+    problems = CONFIG_STORE.problems()
+    for model_id, config in get_model_configs().items():
+        path = get_model_path(model_id)
+        if not os.path.exists(path):
+            problems.append(f"{model_id}: model file missing ({config['path']})")
+            continue
+        record = GGUF_CATALOG.get(path)
+        if record is None:
+            problems.append(f"{model_id}: unreadable GGUF header ({config['path']})")
+            continue
+        trained = record.get("context_length")
+        n_ctx = config.get("n_ctx", DEFAULT_N_CTX)
+        if trained and n_ctx > trained:
+            problems.append(f"{model_id}: n_ctx {n_ctx} exceeds trained context {trained}")
+    return problems
+
+
+def get_pool_key(model_id):
+    return _pool_key(_load_kwargs(get_model_config(model_id)))
+
+
+def acquire_llm(model_id, borrow=False):
+    """
+    Return a loaded Llama for `model_id`, reusing a pooled instance when
+    possible. A borrowed instance stays loaded until release_llm().
+    """
+    global ACTIVE_LLM
+
+    config = get_model_config(model_id)
+    kwargs = _load_kwargs(config)
+    key = _pool_key(kwargs)
 
-    # Load fresh model
     try:
-        llm = Llama(
-            model_path=abs_path,
-            n_ctx=config.get("max_tokens", 2048),
-            n_threads=config.get("n_threads", os.cpu_count()),
-            n_batch=128,
-            n_gpu_layers=config.get("n_gpu_layers", -1),
-            use_mlock=config.get("use_mlock", False),
+        llm = get_model_pool().acquire(
+            key,
+            kwargs,
+            _estimate_bytes(kwargs),
+            pin=config.get("pin", False),
+            label=model_id,
+            borrow=borrow,
         )
     except Exception as e:
         print(f"[Jynx] Failed to load model '{model_id}': {e}")
-        raise RuntimeError(f"Failed to load model from file: {abs_path}") from e
+        raise RuntimeError(f"Failed to load model from file: {kwargs['model_path']}") from e
 
-    # Store active model reference
     ACTIVE_LLM = llm
+    return llm
+
+
+@contextmanager
+def borrowed_llm(model_id, metrics=None):
+    """The Llama for `model_id`, safe from eviction inside the block."""
+    started = time.perf_counter()
+    llm = acquire_llm(model_id, borrow=True)
+    if metrics is not None:
+        metrics["load_s"] = round(time.perf_counter() - started, 3)
+    try:
+        yield llm
+    finally:
+        get_model_pool().release(get_pool_key(model_id))
+
+
+def prefetch_model(model_id):
+    """Start warming `model_id`'s weights in the background (no-op if resident)."""
+    if use_daemon():
+        return daemon_request({"op": "prefetch", "model_id": model_id}, CONFIG_STORE.section("daemon").get("socket"))
+
+    config = get_model_config(model_id)
+    kwargs = _load_kwargs(config)
+    key = _pool_key(kwargs)
+    return get_model_pool().prefetch(
+        key,
+        kwargs,
+        _estimate_bytes(kwargs),
+        label=model_id,
+    )
+
+
+def preload_models():
+    """Load every models.yaml entry flagged `preload: true` into the pool."""
+    if use_daemon():
+        return  # the daemon preloads on startup
+    for model_id, config in get_model_configs().items():
+        if config.get("preload", False):
+            acquire_llm(model_id)
+
+
+# Calibration never shares the machine with a generation: it starts once
+# the pool has been idle this long and stops when anything uses the pool
+CALIBRATION_IDLE_S = 5.0
+CALIBRATION_N_CTX = 2048
+
+
+class _PoolActivity:
+    """CancelToken interface that fires once anything uses the pool (or `cancel` fires)."""
+
+    def __init__(self, pool, cancel=None):
+        self._pool = pool
+        self._cancel = cancel
+        self._mark = pool.activity()
+
+    @property
+    def cancelled(self):
+        if self._cancel is not None and self._cancel.cancelled:
+            return True
+        return self._pool.activity() != self._mark or not self._pool.idle()
+
+
+def _wait_until_idle(pool, cancel=None):
+    """Block until the pool has been idle for CALIBRATION_IDLE_S; False if cancelled."""
+    quiet = _PoolActivity(pool)
+    quiet_since = time.monotonic()
+    while cancel is None or not cancel.cancelled:
+        if quiet.cancelled:
+            quiet, quiet_since = _PoolActivity(pool), time.monotonic()
+        elif time.monotonic() - quiet_since >= CALIBRATION_IDLE_S:
+            return True
+        time.sleep(0.25)
+    return False
+
+
+def _uncalibrated_models():
+    """Load kwargs of pooled models whose file has no profile on this machine."""
+    pool = get_model_pool()
+    found = {}
+    for config in get_model_configs().values():
+        kwargs = _load_kwargs(config)
+        path = kwargs["model_path"]
+        if (path not in found and os.path.exists(path) and pool.contains(_pool_key(kwargs))
+                and get_tuned_settings(path) is None):
+            found[path] = kwargs
+    return list(found.values())
+
+
+def calibrate_idle(cancel=None):
+    """
+    Quick hw_tuner calibration of loaded models that have no profile on
+    this machine. Each run waits until the pool is idle, reserves its extra
+    context against the pool budget, and is abandoned (nothing saved) as
+    soon as anything else uses the pool, then retried at the next quiet
+    spell. Returns the calibrated model paths.
+    """
+    if not AUTO_CALIBRATE or use_daemon() or not CONFIG_STORE.section("tuning").get("auto_calibrate", True):
+        return []
+
+    pool = get_model_pool()
+    done = []
+    for kwargs in _uncalibrated_models():
+        path = kwargs["model_path"]
+        run_kwargs = dict(kwargs, n_ctx=min(kwargs["n_ctx"], CALIBRATION_N_CTX))
+        run_kwargs.pop("draft", None)
+        _weights, context_bytes = _memory_split(run_kwargs)
+        tag = ("calibrate", path)
+        while _wait_until_idle(pool, cancel):
+            if not pool.try_reserve(tag, context_bytes):
+                print(f"[Jynx] Not calibrating {os.path.basename(path)}: no room in the RAM budget")
+                break
+            try:
+                settings = calibrate(path, n_ctx=run_kwargs["n_ctx"], n_gpu_layers=run_kwargs["n_gpu_layers"],
+                                     quick=True, loader=pool.loader, cancel=_PoolActivity(pool, cancel))
+            except Exception as e:
+                print(f"[Jynx] Calibration of {os.path.basename(path)} failed: {e}")
+                break
+            finally:
+                pool.unreserve(tag)
+            if settings is not None:
+                done.append(path)
+                break
+    return done
+
+
+# ------------------------------------------------------------
+# 5. Personas — many model IDs, one set of weights
+# ------------------------------------------------------------
+SAMPLER_KEYS = ("top_p", "top_k", "min_p", "repeat_penalty")
+
+
+def _model_fingerprint(pool_key):
+    """Pool key plus file size/mtime, so a replaced GGUF invalidates saved states."""
+    try:
+        st = os.stat(pool_key[0])
+        return pool_key + (st.st_size, int(st.st_mtime))
+    except OSError:
+        return pool_key
+
+
+class Persona:
+    """
+    A models.yaml entry resolved to (shared weights handle, prompt template,
+    sampler settings). Personas that share a pool key share one Llama, so
+    switching between them costs nothing; only a different GGUF file (or
+    load parameters) triggers a load.
+    """
+
+    def __init__(self, model_id, config):
+        self.model_id = model_id
+        self.config = config
+        self.name = config.get("name", model_id)
+        self.pool_key = get_pool_key(model_id)
+        self.template = get_template(model_id)
+        self.system_prompt = config.get("system_prompt", "You are a helpful assistant.")
+        self.temperature = config.get("temperature", 0.7)
+        self.max_tokens = config.get("max_tokens", 256)
+        self.stream = config.get("stream", False)
+        self.stop = get_stop_sequence(model_id)
+        self.sampler = {k: config[k] for k in SAMPLER_KEYS if k in config}
+        self.repetition = guard_settings(config)
+        self.prefix = format_prompt_prefix(model_id, self.system_prompt, self.template)
+        self.prompt_cache_key = PromptStateCache.make_key(
+            _model_fingerprint(self.pool_key), self.template, self.system_prompt
+        )
+
+    @property
+    def llm(self):
+        """Weights handle — resolved through the pool on every use."""
+        return acquire_llm(self.model_id)
+
+    @contextmanager
+    def tokenizer(self):
+        """
+        Token count function for a batch of counts, or None when this
+        model's weights aren't loaded in this process; it never loads them.
+        """
+        pool = get_model_pool()
+        llm = pool.borrow_loaded(self.pool_key)
+        if llm is None:
+            yield None
+            return
+        try:
+            yield lambda text: len(_tokenize(llm, text))
+        finally:
+            pool.release(self.pool_key)
+
+    def new_guard(self):
+        """Fresh loop detector with this model's thresholds (None if disabled)."""
+        return RepetitionGuard(**self.repetition) if self.repetition else None
+
+    def shares_weights_with(self, other):
+        return self.pool_key == other.pool_key
+
+    def sequence_request(self, prompt, max_tokens=None, temperature=None, stop=None):
+        """This persona's formatted prompt and sampler as one batched-decode sequence."""
+        return SequenceRequest(
+            format_prompt(prompt, self.model_id, self.system_prompt, self.template),
+            max_tokens=max_tokens or self.max_tokens,
+            temperature=self.temperature if temperature is None else temperature,
+            top_p=self.sampler.get("top_p", 0.95),
+            top_k=self.sampler.get("top_k", 40),
+            stop=stop or self.stop,
+            guard=self.new_guard(),
+        )
 
     # --------------------------------------------------------
-    # 5. Unified call() wrapper for inference
+    # Unified call() wrapper for inference
     # --------------------------------------------------------
-    def call(prompt, stream_override=None, max_tokens=None, temperature=None, stop=None):
-        stream_enabled = config.get("stream", False) if stream_override is None else stream_override
-        is_qwen = "qwen" in model_id.lower()
+    def __call__(self, prompt, stream_override=None, max_tokens=None, temperature=None, stop=None, cancel=None,
+                 history=None, context_note=None):
+        """
+        Run the persona on `prompt`. With streaming, `cancel` (a CancelToken)
+        is checked between tokens and stops decoding when it fires.
+        `history` (earlier (user, reply) turns) and `context_note` (added to
+        the system prompt) carry a conversation; see chat_session.
+        """
+        started = time.perf_counter()
+        metrics = {"kind": "call", "model_id": self.model_id}
+        stream_enabled = self.stream if stream_override is None else stream_override
+
+        sampling = dict(self.sampler)
+        sampling["temperature"] = temperature or self.temperature
+        sampling["max_tokens"] = max_tokens or self.max_tokens
+        sampling["stop"] = stop or self.stop
+        conversation = (history or [], context_note)
+        if history:
+            metrics["history_turns"] = len(history)
+
+        if stream_enabled:
+            stream = cancellable(self._locked_stream(prompt, sampling, metrics, conversation), cancel)
+            guard = self.new_guard()
+            if guard is not None:
+                stream = guarded(stream, guard, metrics, sampling["max_tokens"], label=self.model_id)
+            return TELEMETRY.track_stream(stream, metrics, started)
+
+        with get_model_pool().decode_lock(self.pool_key), borrowed_llm(self.model_id, metrics) as llm:
+            on_finish = self._measure(llm, metrics)
+            result = self._generate(llm, prompt, stream_enabled, sampling, metrics, conversation)
+            return TELEMETRY.track_result(result, metrics, started, on_finish)
+
+    @staticmethod
+    def _measure(llm, metrics):
+        """on_finish(metrics) collecting llama.cpp's prompt-eval time and draft stats (None if neither)."""
+        hooks = [h for h in (measure_prompt_eval(llm), Persona._measure_draft(llm, metrics)) if h]
+        if not hooks:
+            return None
+
+        def on_finish(metrics):
+            for hook in hooks:
+                hook(metrics)
+        return on_finish
+
+    @staticmethod
+    def _measure_draft(llm, metrics):
+        # Speculative decoding happens inside llm; the tracker reports how well it guessed
+        draft = getattr(llm, "draft_model", None)
+        return draft.measure(metrics) if isinstance(draft, DraftTracker) else None
+
+    def _locked_stream(self, prompt, sampling, metrics, conversation):
+        """
+        Generate only once these weights are free. Callers may run persona
+        calls from several threads; the lock is taken, and the weights
+        borrowed from the pool, at the first token request. Both are let go
+        when the stream ends or is closed.
+        """
+        with get_model_pool().decode_lock(self.pool_key), borrowed_llm(self.model_id, metrics) as llm:
+            on_finish = self._measure(llm, metrics)
+            stream = self._generate(llm, prompt, True, sampling, metrics, conversation)
+            try:
+                yield from stream
+            finally:
+                close = getattr(stream, "close", None)
+                if close:
+                    close()
+                if on_finish:
+                    on_finish(metrics)
+
+    def _generate(self, llm, prompt, stream_enabled, sampling, metrics, conversation=((), None)):
+        history, context_note = conversation
+        system_prompt = f"{self.system_prompt}\n\n{context_note}" if context_note else self.system_prompt
 
         # ---------------- QWEN MODELS -----------------
-        if is_qwen:
-            system_prompt = config.get("system_prompt", "You are a helpful assistant.")
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt},
-            ]
-
-            chat_args = {
-                "messages": messages,
-                "temperature": temperature or config.get("temperature", 0.7),
-                "max_tokens": max_tokens or config.get("max_tokens", 256),
-                "stop": stop or get_stop_sequence(model_id),
-            }
+        if self.template == "chatml":
+            messages = [{"role": "system", "content": system_prompt}]
+            for user, reply in history:
+                messages.append({"role": "user", "content": user})
+                messages.append({"role": "assistant", "content": reply})
+            messages.append({"role": "user", "content": prompt})
 
             try:
-                return llm.create_chat_completion(stream=stream_enabled, **chat_args)
+                return llm.create_chat_completion(messages=messages, stream=stream_enabled, **sampling)
             except Exception as e:
                 print(f"[Jynx] Error during Qwen inference: {e}")
                 return iter([])
 
         # ---------------- MISTRAL / LLAMA MODELS -----------------
+        # Restore the evaluated system prompt instead of re-running it (a
+        # context note changes that prompt, so the stored state can't help)
+        prompt_cache = get_prompt_cache()
+        if prompt_cache is not None and not context_note:
+            try:
+                metrics["prefix_cache"] = prompt_cache.prime(llm, self.prompt_cache_key, self.prefix)
+            except Exception as e:
+                print(f"[Jynx] Prompt cache skipped for {self.model_id}: {e}")
+
         formatted_prompt = format_prompt(
             prompt,
-            model_id=model_id,
-            system_prompt=config.get("system_prompt", "You are a helpful assistant.")
+            model_id=self.model_id,
+            system_prompt=system_prompt,
+            template=self.template,
+            history=history,
         )
 
-        args = {
-            "prompt": formatted_prompt,
-            "temperature": temperature or config.get("temperature", 0.7),
-            "max_tokens": max_tokens or config.get("max_tokens", 256),
-            "stop": stop or get_stop_sequence(model_id),
-        }
-
         try:
-            return llm(**args, stream=stream_enabled)
+            tokens = llm.tokenize(formatted_prompt.encode("utf-8"))
+            metrics["prompt_tokens"] = len(tokens)
+            if history:
+                # Earlier turns still in the KV cache are not evaluated again
+                metrics["reused_tokens"] = _common_prefix(_evaluated_tokens(llm), tokens)
+            return llm(prompt=formatted_prompt, stream=stream_enabled, **sampling)
         except Exception as e:
-            print(f"[Jynx] Error during inference for model {model_id}: {e}")
+            print(f"[Jynx] Error during inference for model {self.model_id}: {e}")
             return iter([])
 
-    return call, config
+
+def _common_prefix(a, b):
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+_PERSONAS = {}
+
+
+def get_local_persona(model_id):
+    """Resolve a model ID to its in-process Persona without loading any weights."""
+    persona = _PERSONAS.get(model_id)
+    if persona is None:
+        persona = Persona(model_id, get_model_config(model_id))
+        _PERSONAS[model_id] = persona
+    return persona
+
+
+def get_persona(model_id):
+    """Resolve a model ID to a callable persona — remote when the daemon is running."""
+    if use_daemon():
+        return RemotePersona(
+            model_id,
+            get_model_config(model_id),
+            get_stop_sequence(model_id),
+            socket_path=CONFIG_STORE.section("daemon").get("socket"),
+        )
+    return get_local_persona(model_id)
+
+
+def load_model_from_config(model_id):
+    """Return (persona, config); the persona is the call() wrapper. Repeat loads hit the pool."""
+    persona = get_persona(model_id)
+    if isinstance(persona, RemotePersona):
+        daemon_request({"op": "load", "model_id": model_id}, persona.socket_path)
+    else:
+        acquire_llm(model_id)
+    return persona, persona.config
@@ -0,0 +1,231 @@
+# ============================================================
+#   prompt_cache.py — On-Disk llama.cpp State Cache for Prompt Prefixes
+# ============================================================
+#
+# Every persona call starts with the same formatted system prompt.
+# Evaluating it once, saving the llama.cpp state and restoring it on
+# the next call leaves only the user's prompt to be evaluated, which
+# is most of the time-to-first-token on CPU-only machines.
+
+import hashlib
+import json
+import os
+import struct
+import threading
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(SCRIPT_DIR, "cache", "prompt_states")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# State files are a JSON header followed by raw buffers. Nothing in them is
+# executed on load, so a file dropped into the cache directory can at worst
+# restore a wrong context, which prime() then notices and re-evaluates.
+STATE_MAGIC = b"GDSTATE1"
+_ARRAY_KINDS = "iuf"  # int, unsigned and float arrays only; never object arrays
+
+
+def _tokenize(llm, text):
+    """Tokenize the same way Llama.create_completion does (special tokens parsed)."""
+    data = text.encode("utf-8")
+    try:
+        return list(llm.tokenize(data, special=True))
+    except TypeError:
+        return list(llm.tokenize(data))
+
+
+def _evaluated_tokens(llm):
+    """Tokens currently held in the context's KV cache."""
+    n_tokens = getattr(llm, "n_tokens", 0)
+    input_ids = getattr(llm, "input_ids", None)
+    if input_ids is None or not n_tokens:
+        return []
+    return list(input_ids[:n_tokens])
+
+
+# ============================================================
+#   State (De)serialization
+# ============================================================
+def pack_state(state):
+    """
+    Serialize a LlamaState (or a plain dict of the same kind of fields) to
+    bytes: ints and int lists go into the header, bytes and arrays after it.
+    """
+    kind = "dict" if isinstance(state, dict) else type(state).__name__
+    if kind not in ("dict", "LlamaState"):
+        raise TypeError(f"Cannot store prompt state of type {kind}")
+    fields = state if kind == "dict" else vars(state)
+
+    header, blobs = {"kind": kind, "fields": {}}, []
+    for name, value in fields.items():
+        if isinstance(value, bool) or value is None:
+            raise TypeError(f"Unsupported prompt state field {name}: {value!r}")
+        if isinstance(value, int):
+            header["fields"][name] = {"int": value}
+        elif isinstance(value, list) and all(isinstance(v, int) for v in value):
+            header["fields"][name] = {"ints": value}
+        elif isinstance(value, bytes):
+            header["fields"][name] = {"bytes": len(value)}
+            blobs.append(value)
+        elif hasattr(value, "tobytes") and getattr(value, "dtype", None) is not None:
+            if value.dtype.kind not in _ARRAY_KINDS:
+                raise TypeError(f"Unsupported array type for {name}: {value.dtype}")
+            data = value.tobytes()
+            header["fields"][name] = {"array": value.dtype.str, "shape": list(value.shape),
+                                      "bytes": len(data)}
+            blobs.append(data)
+        else:
+            raise TypeError(f"Unsupported prompt state field {name}: {type(value).__name__}")
+
+    encoded = json.dumps(header).encode("utf-8")
+    return b"".join([STATE_MAGIC, struct.pack("<I", len(encoded)), encoded] + blobs)
+
+
+def unpack_state(data):
+    """Inverse of pack_state(); raises ValueError on anything malformed."""
+    if not data.startswith(STATE_MAGIC):
+        raise ValueError("not a prompt state file")
+    offset = len(STATE_MAGIC)
+    (size,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    header = json.loads(data[offset:offset + size].decode("utf-8"))
+    offset += size
+
+    fields = {}
+    for name, spec in header["fields"].items():
+        if "int" in spec:
+            fields[name] = int(spec["int"])
+        elif "ints" in spec:
+            fields[name] = [int(v) for v in spec["ints"]]
+        else:
+            end = offset + int(spec["bytes"])
+            if end > len(data):
+                raise ValueError(f"truncated prompt state field {name}")
+            blob = data[offset:end]
+            offset = end
+            if "array" in spec:
+                import numpy as np
+                dtype = np.dtype(spec["array"])
+                if dtype.kind not in _ARRAY_KINDS:
+                    raise ValueError(f"unsupported array type for {name}: {dtype}")
+                fields[name] = np.frombuffer(blob, dtype=dtype).reshape(spec["shape"]).copy()
+            else:
+                fields[name] = blob
+    if offset != len(data):
+        raise ValueError("trailing data after prompt state")
+
+    if header["kind"] == "dict":
+        return fields
+    if header["kind"] == "LlamaState":
+        from llama_cpp import LlamaState
+        return LlamaState(**fields)
+    raise ValueError(f"unknown prompt state kind {header['kind']!r}")
+
+
+class PromptStateCache:
+    """
+    Directory of serialized LlamaState snapshots, one per static prompt prefix.
+    Oldest-used files are deleted once the directory exceeds `max_bytes`.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(model_fingerprint, template, system_prompt):
+        h = hashlib.sha256()
+        for part in (repr(model_fingerprint), template, system_prompt):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.state")
+
+    # --------------------------------------------------------
+    # Disk I/O
+    # --------------------------------------------------------
+    def load(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                state = unpack_state(f.read())
+            os.utime(path)  # mark as recently used
+            return state
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[Jynx] Discarding unreadable prompt state {key[:12]}: {e}")
+            self._remove(path)
+            return None
+
+    def save(self, key, state):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        data = pack_state(state)
+        with self._lock:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".state"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".state"):
+                    self._remove(os.path.join(self.cache_dir, name))
+
+    # --------------------------------------------------------
+    # Priming a live context
+    # --------------------------------------------------------
+    def prime(self, llm, key, prefix_text):
+        """
+        Make sure `llm`'s KV cache starts with `prefix_text`. Returns 'hit'
+        (already resident), 'restored' (loaded from disk) or 'saved' (evaluated
+        and written). Llama's own prefix matching then skips those tokens.
+        """
+        tokens = _tokenize(llm, prefix_text)
+        if not tokens:
+            return "hit"
+
+        if _evaluated_tokens(llm)[:len(tokens)] == tokens:
+            return "hit"
+
+        state = self.load(key)
+        if state is not None:
+            llm.load_state(state)
+            if _evaluated_tokens(llm)[:len(tokens)] == tokens:
+                return "restored"
+
+        llm.reset()
+        llm.eval(tokens)
+        self.save(key, llm.save_state())
+        return "saved"
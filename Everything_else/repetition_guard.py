@@ -0,0 +1,116 @@
+# ============================================================
+#   repetition_guard.py — Stop Generation That Has Started Looping
+# ============================================================
+#
+# Small quantized models sometimes repeat a phrase or a whole paragraph
+# until max_tokens. A RepetitionGuard is fed the streamed text and counts
+# word n-grams over a sliding window; once the same n-gram has appeared
+# max_repeats times the output is looping and decoding is stopped. Long
+# runs of non-word characters (endless newlines, "=====") count as
+# degenerate too; long words such as URLs or base64 do not.
+#
+# Thresholds are per model (models.yaml `repetition:`; false disables):
+#   ngram        words per n-gram                       (8)
+#   max_repeats  sightings of one n-gram that mean loop (3)
+#   window       n-grams remembered                     (400)
+#   min_words    never stop before this many words      (24)
+
+import re
+from collections import Counter, deque
+
+from Everything_else.inference_telemetry import chunk_text
+
+DEFAULTS = {"ngram": 8, "max_repeats": 3, "window": 400, "min_words": 24}
+
+# Non-word characters in a row (whitespace, punctuation) before it counts as degenerate
+MAX_GAP_CHARS = 200
+
+_SPACE = re.compile(r"\s+")
+_PUNCT = re.compile(r"[^\w']+")
+_TRAILING_GAP = re.compile(r"\W*\Z")
+
+
+def guard_settings(config):
+    """This model's thresholds, or None when the guard is disabled."""
+    value = config.get("repetition", True)
+    if value is False:
+        return None
+    settings = dict(DEFAULTS)
+    if isinstance(value, dict):
+        settings.update({k: int(v) for k, v in value.items() if k in DEFAULTS})
+    return settings
+
+
+class RepetitionGuard:
+    def __init__(self, ngram=8, max_repeats=3, window=400, min_words=24):
+        self.ngram = ngram
+        self.max_repeats = max_repeats
+        self.window = window
+        self.min_words = min_words
+        self.words = 0
+        self.tripped = False
+        self._recent = deque(maxlen=ngram)
+        self._grams = deque()
+        self._counts = Counter()
+        self._partial = ""
+        self._gap = 0
+
+    def feed(self, text):
+        """Add streamed text; True once the output is looping."""
+        if self.tripped:
+            return True
+        self._partial += text
+        tail = len(_TRAILING_GAP.search(text).group())
+        self._gap = self._gap + tail if tail == len(text) else tail
+        parts = _SPACE.split(self._partial)
+        self._partial = parts.pop()  # may be the first half of a word
+        for part in parts:
+            word = _PUNCT.sub("", part.lower())
+            if word:
+                self._add(word)
+        if self._gap > MAX_GAP_CHARS:
+            self.tripped = True
+        return self.tripped
+
+    def _add(self, word):
+        self.words += 1
+        self._recent.append(word)
+        if len(self._recent) < self.ngram:
+            return
+
+        gram = tuple(self._recent)
+        self._grams.append(gram)
+        self._counts[gram] += 1
+        if len(self._grams) > self.window:
+            old = self._grams.popleft()
+            self._counts[old] -= 1
+            if not self._counts[old]:
+                del self._counts[old]
+
+        if self._counts[gram] >= self.max_repeats and self.words >= self.min_words:
+            self.tripped = True
+
+
+def guarded(stream, guard, metrics, max_tokens, label=None):
+    """
+    Yield from `stream` until `guard` sees a loop, then close it. Records
+    repetition_stop and tokens_saved (the unused max_tokens budget) in
+    `metrics`.
+    """
+    tokens = 0
+    try:
+        for chunk in stream:
+            yield chunk
+            text = chunk_text(chunk)
+            if not text:
+                continue
+            tokens += 1
+            if guard.feed(text):
+                metrics["repetition_stop"] = True
+                metrics["tokens_saved"] = max(0, (max_tokens or 0) - tokens)
+                print(f"[Jynx] {label or 'Model'} started repeating itself; stopped after {tokens} tokens")
+                break
+    finally:
+        close = getattr(stream, "close", None)
+        if close:
+            close()
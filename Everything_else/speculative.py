@@ -0,0 +1,185 @@
+# ============================================================
+#   speculative.py — Draft Models for Speculative Decoding
+# ============================================================
+#
+# llama-cpp-python can verify several guessed tokens in one forward pass
+# of the big model (Llama(draft_model=...)). A models.yaml entry picks
+# where the guesses come from:
+#
+#   draft: prompt_lookup          # n-grams copied from the prompt so far
+#   draft:
+#     model: tinyllama-1.1b.Q4_K_M.gguf   # small GGUF, same vocabulary
+#     tokens: 6
+#
+# Either way the draft is wrapped in a DraftTracker, which works out how
+# many guesses the big model accepted; Persona calls put those counts in
+# telemetry so perf_report can show the speedup.
+
+import os
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(SCRIPT_DIR, "models")
+
+DEFAULT_LOOKUP_TOKENS = 10
+DEFAULT_DRAFT_TOKENS = 6
+
+
+def draft_spec(config):
+    """Normalised draft settings of a models.yaml entry, or None."""
+    draft = config.get("draft")
+    if not draft:
+        return None
+    if isinstance(draft, str):
+        draft = {"type": draft}
+    if draft.get("model"):
+        return {
+            "type": "model",
+            "path": os.path.join(MODELS_DIR, draft["model"]),
+            "tokens": int(draft.get("tokens", DEFAULT_DRAFT_TOKENS)),
+        }
+    if draft.get("type", "prompt_lookup") == "prompt_lookup":
+        return {"type": "prompt_lookup", "tokens": int(draft.get("tokens", DEFAULT_LOOKUP_TOKENS))}
+    raise ValueError(f"Unknown draft type '{draft.get('type')}' (use prompt_lookup or model: <file.gguf>)")
+
+
+def draft_key(spec):
+    """Hashable part of the pool key — a different draft is a different instance."""
+    if not spec:
+        return None
+    if spec["type"] == "model":
+        return f"model:{os.path.abspath(spec['path'])}:{spec['tokens']}"
+    return f"{spec['type']}:{spec['tokens']}"
+
+
+def draft_label(spec):
+    if spec["type"] == "model":
+        return os.path.basename(spec["path"])
+    return spec["type"]
+
+
+def draft_bytes(spec):
+    """Extra resident memory for the draft (a draft GGUF's weights)."""
+    if not spec or spec["type"] != "model":
+        return 0
+    try:
+        return os.path.getsize(spec["path"])
+    except OSError:
+        return 0
+
+
+# ------------------------------------------------------------
+# Draft sources
+# ------------------------------------------------------------
+class GGUFDraftModel:
+    """
+    Greedy continuations from a small GGUF. Its Llama keeps its own KV cache
+    and only evaluates the tokens added since the previous call.
+    """
+
+    def __init__(self, model_path, num_pred_tokens=DEFAULT_DRAFT_TOKENS, n_ctx=4096, n_threads=None):
+        from llama_cpp import Llama
+
+        self.llm = Llama(model_path=model_path, n_ctx=n_ctx, n_threads=n_threads, verbose=False)
+        self.num_pred_tokens = num_pred_tokens
+
+    def __call__(self, input_ids, **kwargs):
+        import numpy as np
+
+        tokens = [int(t) for t in input_ids]
+        draft = []
+        if len(tokens) + self.num_pred_tokens < self.llm.n_ctx():
+            generator = self.llm.generate(tokens, temp=0.0, reset=True)
+            try:
+                for token in generator:
+                    if token == self.llm.token_eos():
+                        break
+                    draft.append(token)
+                    if len(draft) >= self.num_pred_tokens:
+                        break
+            finally:
+                generator.close()
+        return np.array(draft, dtype=np.intc)
+
+
+class DraftTracker:
+    """
+    Wraps a draft model. Each call's guesses are compared with the tokens
+    the target actually appended by the next call, which is how many of
+    them it accepted.
+    """
+
+    def __init__(self, draft, label):
+        self.draft = draft
+        self.label = label
+        self.proposed = 0
+        self.accepted = 0
+        self.passes = 0
+        self._last = None
+
+    def __call__(self, input_ids, **kwargs):
+        self._score(input_ids)
+        proposal = [int(t) for t in self.draft(input_ids, **kwargs)]
+        self._last = (len(input_ids), proposal)
+        self.proposed += len(proposal)
+        self.passes += 1
+        return self._as_array(proposal)
+
+    @staticmethod
+    def _as_array(tokens):
+        try:
+            import numpy as np
+        except ImportError:
+            return tokens
+        return np.array(tokens, dtype=np.intc)
+
+    def _score(self, input_ids):
+        if self._last is None:
+            return
+        n_before, proposal = self._last
+        self._last = None
+        for guess, actual in zip(proposal, input_ids[n_before:]):
+            if guess != int(actual):
+                break
+            self.accepted += 1
+
+    def measure(self, metrics):
+        """
+        Start measuring one call; returns the callback that adds the call's
+        draft_* counts to `metrics` when it ends.
+        """
+        self._last = None  # a new prompt, not a continuation
+        before = (self.proposed, self.accepted, self.passes)
+        metrics["draft"] = self.label
+
+        def finish(metrics):
+            # The final pass has no next call to score it against
+            self._last = None
+            metrics["draft_proposed"] = self.proposed - before[0]
+            metrics["draft_accepted"] = self.accepted - before[1]
+            metrics["draft_passes"] = self.passes - before[2]
+        return finish
+
+
+def build_draft_model(spec, load_kwargs):
+    """DraftTracker for `spec`, or None if this llama_cpp can't do it."""
+    try:
+        if spec["type"] == "model":
+            draft = GGUFDraftModel(spec["path"], spec["tokens"], n_ctx=load_kwargs.get("n_ctx", 4096),
+                                   n_threads=load_kwargs.get("n_threads"))
+        else:
+            from llama_cpp.llama_speculative import LlamaPromptLookupDecoding
+            draft = LlamaPromptLookupDecoding(num_pred_tokens=spec["tokens"])
+    except Exception as e:
+        print(f"[Jynx] Speculative decoding unavailable ({draft_label(spec)}): {e}")
+        return None
+    return DraftTracker(draft, draft_label(spec))
+
+
+def check_vocab(llm, tracker):
+    """A draft GGUF must share the target's tokenizer; drop it otherwise."""
+    draft_llm = getattr(tracker.draft, "llm", None)
+    if draft_llm is not None and draft_llm.n_vocab() != llm.n_vocab():
+        print(f"[Jynx] Draft {tracker.label} has a different vocabulary; speculative decoding off")
+        llm.draft_model = None
+        return False
+    return True
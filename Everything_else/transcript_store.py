@@ -0,0 +1,176 @@
+# ============================================================
+#   transcript_store.py — Paged, Encrypted Chat Transcript
+# ============================================================
+#
+# The chat view used to keep the whole session as rich text in one
+# QTextEdit. Here the transcript is a list of compact entries — an HTML
+# head ("<b>Logic Expert:</b>") and a plain-text body that streaming
+# appends to — held in fixed-size segments. Only the open tail segment
+# and the few most recently read sealed segments stay in memory; sealed
+# segments are written to disk encrypted with the session's Fernet key
+# and read back when the view scrolls to them.
+#
+# Per-entry character and line counts stay in memory (a few bytes each)
+# so the view can size rows it has not loaded. Entries in sealed segments
+# can still change (a reply streaming above queued prompts); such a
+# segment is rewritten when it pages out. Segment files belong to one
+# session and are deleted by close().
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TRANSCRIPT_DIR = os.path.join(SCRIPT_DIR, "cache", "transcript")
+DEFAULT_SEGMENT_SIZE = 200
+DEFAULT_RESIDENT_SEGMENTS = 4
+
+# Sessions left behind by a crash are removed once this old
+STALE_SESSION_S = 24 * 3600
+
+
+class TranscriptStore:
+    def __init__(self, fernet, session_dir, segment_size=DEFAULT_SEGMENT_SIZE,
+                 resident_segments=DEFAULT_RESIDENT_SEGMENTS):
+        self.fernet = fernet
+        self.session_dir = session_dir
+        self.segment_size = segment_size
+        self.resident_segments = resident_segments
+        self._lock = threading.Lock()
+        self._tail = []                 # open segment: [head, body] lists
+        self._resident = OrderedDict()  # sealed segment number → entries, LRU order
+        self._files = []                # sealed segment number → file name
+        self._dirty = set()             # resident sealed segments changed since written
+        self._chars = array("L")
+        self._lines = array("L")
+
+    @classmethod
+    def for_user(cls, username, fernet, **kwargs):
+        """A fresh session directory; stale ones from earlier sessions are removed."""
+        user_dir = os.path.join(DEFAULT_TRANSCRIPT_DIR, username)
+        try:
+            for name in os.listdir(user_dir):
+                path = os.path.join(user_dir, name)
+                if time.time() - os.path.getmtime(path) > STALE_SESSION_S:
+                    shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
+        return cls(fernet, os.path.join(user_dir, uuid.uuid4().hex), **kwargs)
+
+    # --------------------------------------------------------
+    # Writing
+    # --------------------------------------------------------
+    def add(self, head, body=""):
+        """Start a new entry; returns its row."""
+        with self._lock:
+            if len(self._tail) >= self.segment_size:
+                self._seal()
+            self._tail.append([head, body])
+            self._chars.append(len(head) + len(body))
+            self._lines.append(1 + body.count("\n"))
+            return len(self._chars) - 1
+
+    def extend(self, text, row=None):
+        """Append streamed text to an entry's body (the last by default); returns its row."""
+        if not self._chars:
+            return self.add("", text)
+        with self._lock:
+            row = len(self._chars) - 1 if row is None else row
+            self._entry(row)[1] += text
+            self._chars[row] += len(text)
+            self._lines[row] += text.count("\n")
+            return row
+
+    def set_head(self, row, head):
+        """Replace the HTML head of entry `row`."""
+        with self._lock:
+            entry = self._entry(row)
+            self._chars[row] += len(head) - len(entry[0])
+            entry[0] = head
+
+    def _entry(self, row):
+        number, offset = divmod(row, self.segment_size)
+        if number == len(self._files):
+            return self._tail[offset]
+        entries = self._load(number)
+        self._dirty.add(number)
+        return entries[offset]
+
+    def _seal(self):
+        number = len(self._files)
+        entries, self._tail = self._tail, []
+        self._files.append(uuid.uuid4().hex + ".enc")
+        self._write(number, entries)
+        self._keep(number, entries)
+
+    def _write(self, number, entries):
+        data = json.dumps(entries).encode("utf-8")
+        os.makedirs(self.session_dir, exist_ok=True)
+        with open(os.path.join(self.session_dir, self._files[number]), "wb") as f:
+            f.write(self.fernet.encrypt(data))
+        self._dirty.discard(number)
+
+    def _load(self, number):
+        entries = self._resident.get(number)
+        if entries is None:
+            with open(os.path.join(self.session_dir, self._files[number]), "rb") as f:
+                entries = json.loads(self.fernet.decrypt(f.read()))
+        self._keep(number, entries)
+        return entries
+
+    def _keep(self, number, entries):
+        self._resident[number] = entries
+        self._resident.move_to_end(number)
+        while len(self._resident) > self.resident_segments:
+            old, old_entries = self._resident.popitem(last=False)
+            if old in self._dirty:
+                self._write(old, old_entries)
+
+    # --------------------------------------------------------
+    # Reading
+    # --------------------------------------------------------
+    def __len__(self):
+        return len(self._chars)
+
+    def get(self, row):
+        """(head, body) of entry `row`, reading its segment from disk if needed."""
+        with self._lock:
+            number, offset = divmod(row, self.segment_size)
+            if number == len(self._files):
+                head, body = self._tail[offset]
+                return head, body
+            head, body = self._load(number)[offset]
+            return head, body
+
+    def is_resident(self, row):
+        """True when get(row) won't touch the disk."""
+        number = row // self.segment_size
+        return number == len(self._files) or number in self._resident
+
+    def size(self, row):
+        """(characters, lines) of entry `row`, without loading it."""
+        return self._chars[row], self._lines[row]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._chars),
+                "segments_on_disk": len(self._files),
+                "resident_segments": len(self._resident),
+            }
+
+    def close(self):
+        """Forget the transcript and delete this session's segment files."""
+        with self._lock:
+            self._tail = []
+            self._resident.clear()
+            self._files = []
+            self._dirty.clear()
+            self._chars = array("L")
+            self._lines = array("L")
+            shutil.rmtree(self.session_dir, ignore_errors=True)
@@ -32,6 +32,22 @@ check_main_script() {
     fi
 }
 
+start_model_daemon() {
+    # Optional: keep model weights resident in a separate process
+    if [ "${GHOSTDRIVE_DAEMON}" != "1" ]; then
+        return
+    fi
+
+    cd "${SCRIPT_DIR}"
+    if "${VENV_PYTHON}" -c "from Everything_else.model_daemon import daemon_available; import sys; sys.exit(0 if daemon_available() else 1)"; then
+        echo "[INFO] Model daemon already running."
+        return
+    fi
+
+    echo "[INFO] Starting model daemon..."
+    nohup "${VENV_PYTHON}" -m Everything_else.model_daemon > /dev/null 2>&1 &
+}
+
 launch_application() {
     echo "=============================================="
     echo "         Launching GhostDrive"
@@ -61,6 +77,7 @@ launch_application() {
 main() {
     check_venv
     check_main_script
+    start_model_daemon
     launch_application
 }
 
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Benchmarks: Orchestration Overhead
+Version: 1.0.0
+Created: 2026-10-18
+
+Runs the registry, council and streaming code against FakeLlama, so no
+GGUF files are needed. Each benchmark is compared with baselines.json and
+fails when it is worse than value × (1 + tolerance) (and above the
+optional floor), or for better-is-higher metrics below value / (1 + tolerance).
+
+    GHOSTDRIVE_BENCH_UPDATE=1 python tests/benchmark/test_benchmarks.py
+rewrites the stored values from this machine's results.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+UPDATE = os.environ.get("GHOSTDRIVE_BENCH_UPDATE") == "1"
+
+try:
+    from PySide6.QtCore import QCoreApplication, QObject, QThread, Signal
+    HAS_QT = True
+except ImportError:
+    HAS_QT = False
+
+
+def _load_baselines():
+    with open(BASELINES_PATH, "r") as f:
+        return json.load(f)
+
+
+class BenchmarkCase(unittest.TestCase):
+    """Registry and prompt cache isolated from the real models and cache dir."""
+
+    @classmethod
+    def setUpClass(cls):
+        from Everything_else import model_registry
+        from Everything_else.prompt_cache import PromptStateCache
+
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls._saved_cache = model_registry._PROMPT_CACHE
+        model_registry._PROMPT_CACHE = PromptStateCache(cache_dir=os.path.join(cls.tmp.name, "states"))
+
+    @classmethod
+    def tearDownClass(cls):
+        from Everything_else import model_registry
+        model_registry.set_llama_loader(None)
+        model_registry._PROMPT_CACHE = cls._saved_cache
+        cls.tmp.cleanup()
+
+    def use_profile(self, **rates):
+        from Everything_else import model_registry
+        from Everything_else.fake_llama import FakeLoader, FakeProfile
+        loader = FakeLoader(FakeProfile(**rates))
+        model_registry.set_llama_loader(loader)
+        return loader
+
+    def router(self):
+        from Everything_else import ai_council
+        from Everything_else.expert_router import ExpertRouter
+        return ExpertRouter(ai_council.FIELD_DESCRIPTIONS,
+                            history_path=os.path.join(self.tmp.name, "routing.json"))
+
+    def run_council(self, prompt, **kwargs):
+        from Everything_else import ai_council
+        with mock.patch.object(ai_council, "get_router", return_value=self.router()):
+            return list(ai_council.run_council_streaming(prompt, **kwargs))
+
+    def check(self, name, measured):
+        baselines = _load_baselines()
+        entry = baselines[name]
+        print(f"\n[BENCH] {name}: {measured:.3f} {entry.get('unit', '')} (baseline {entry['value']})")
+        if UPDATE:
+            entry["value"] = round(measured, 3)
+            with open(BASELINES_PATH, "w") as f:
+                json.dump(baselines, f, indent=2, sort_keys=True)
+                f.write("\n")
+            return
+
+        limit = 1 + entry.get("tolerance", 1.0)
+        if entry.get("better", "lower") == "lower":
+            # floor: sub-millisecond timings are noise on a busy CI box
+            self.assertLessEqual(measured, max(entry["value"] * limit, entry.get("floor", 0)),
+                                 f"{name} regressed: {measured:.3f} vs baseline {entry['value']}")
+        else:
+            self.assertGreaterEqual(measured, entry["value"] / limit,
+                                    f"{name} regressed: {measured:.3f} vs baseline {entry['value']}")
+
+
+class TestOrchestrationBenchmarks(BenchmarkCase):
+    """Time spent around the model, not in it."""
+
+    def test_council_overhead_per_stage(self):
+        loader = self.use_profile(prompt_tps=20000, decode_tps=2000, reply_tokens=40)
+        prompt = "How should I budget for a week of off-grid camping?"
+        self.run_council(prompt, mode="chain", skip_summary=True)  # warm personas and pool
+
+        busy_before = loader.busy_s
+        started = time.perf_counter()
+        events = self.run_council(prompt + " Twice.", mode="chain", skip_summary=True)
+        wall = time.perf_counter() - started
+        busy = loader.busy_s - busy_before
+
+        stages = sum(1 for e in events if e[0] in ("expert_done", "verdict_done"))
+        self.assertEqual(events[-1], ("done", ""))
+        self.check("council_overhead_ms_per_stage", (wall - busy) * 1000 / stages)
+
+    def test_model_switch_cost(self):
+        from Everything_else.model_registry import get_persona
+
+        loader = self.use_profile(load_s=0.05)
+        personas = [get_persona(m) for m in ("jynx_summarizer", "jynx_expert_logic", "jynx_expert_finance")]
+        personas[0].llm  # cold load
+
+        started = time.perf_counter()
+        for _ in range(50):
+            for persona in personas:
+                persona.llm
+        warm_ms = (time.perf_counter() - started) * 1000 / 150
+        self.assertEqual(loader.loads, 1)
+        self.check("persona_switch_ms", warm_ms)
+
+        from Everything_else.model_registry import get_model_pool
+        get_model_pool().clear(include_pinned=True)
+        started = time.perf_counter()
+        personas[1].llm
+        self.check("cold_load_overhead_ms", (time.perf_counter() - started - 0.05) * 1000)
+
+    def test_council_event_throughput(self):
+        self.use_profile(prompt_tps=0, decode_tps=0, reply_tokens=200)
+        self.run_council("Warm up the council", mode="chain", skip_summary=True)
+
+        started = time.perf_counter()
+        events = self.run_council("Plan my savings and my food storage", mode="chain", skip_summary=False)
+        elapsed = time.perf_counter() - started
+        self.check("council_events_per_s", len(events) / elapsed)
+
+
+class TestStreamingBenchmarks(BenchmarkCase):
+    """Token → UI latency of the stream coalescer."""
+
+    def test_coalescer_latency(self):
+        from ui.stream_coalescer import TokenCoalescer
+
+        delays = []
+        frames = []
+
+        def emit(items):
+            now = time.perf_counter()
+            frames.append(items)
+            delays.extend(now - pushed for pushed in items)
+
+        coalescer = TokenCoalescer(emit)
+        # ~1000 tok/s producer
+        for _ in range(500):
+            coalescer.push(time.perf_counter())
+            time.sleep(0.001)
+        coalescer.finish()
+
+        delays.sort()
+        p95_ms = delays[int(len(delays) * 0.95)] * 1000
+        self.assertLess(len(frames), 500 / 5)
+        self.check("coalescer_p95_latency_ms", p95_ms)
+
+    @unittest.skipUnless(HAS_QT, "PySide6 not installed")
+    def test_qt_frame_signal_latency(self):
+        from ui.stream_coalescer import TokenCoalescer
+
+        app = QCoreApplication.instance() or QCoreApplication([])
+        delays = []
+
+        class Producer(QObject):
+            frame_received = Signal(list)
+            finished = Signal()
+
+            def run(self):
+                coalescer = TokenCoalescer(self.frame_received.emit)
+                for _ in range(300):
+                    coalescer.push(time.perf_counter())
+                    time.sleep(0.001)
+                coalescer.finish()
+                self.finished.emit()
+
+        thread = QThread()
+        producer = Producer()
+        producer.moveToThread(thread)
+        producer.frame_received.connect(lambda items: delays.extend(time.perf_counter() - t for t in items))
+        producer.finished.connect(thread.quit)
+        thread.finished.connect(app.quit)
+        thread.started.connect(producer.run)
+        thread.start()
+        app.exec()
+        thread.wait()
+
+        delays.sort()
+        self.check("qt_frame_p95_latency_ms", delays[int(len(delays) * 0.95)] * 1000)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
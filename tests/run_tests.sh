@@ -34,6 +34,102 @@ echo ""
 echo "[INFO] Running unit tests: wifi..."
 "${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_wifi.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_wifi.py"
 
+echo ""
+echo "[INFO] Running unit tests: model pool..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_model_pool.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_model_pool.py"
+
+echo ""
+echo "[INFO] Running unit tests: prompt cache..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_prompt_cache.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_prompt_cache.py"
+
+echo ""
+echo "[INFO] Running unit tests: gguf catalog..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_gguf_catalog.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_gguf_catalog.py"
+
+echo ""
+echo "[INFO] Running unit tests: model config..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_model_config.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_model_config.py"
+
+echo ""
+echo "[INFO] Running unit tests: inference telemetry..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_inference_telemetry.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_inference_telemetry.py"
+
+echo ""
+echo "[INFO] Running unit tests: cancellation..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_cancellation.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_cancellation.py"
+
+echo ""
+echo "[INFO] Running unit tests: batched decoding..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_batched_decode.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_batched_decode.py"
+
+echo ""
+echo "[INFO] Running unit tests: council scheduler..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_council_scheduler.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_council_scheduler.py"
+
+echo ""
+echo "[INFO] Running unit tests: expert router..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_expert_router.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_expert_router.py"
+
+echo ""
+echo "[INFO] Running unit tests: council cache..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_council_cache.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_council_cache.py"
+
+echo ""
+echo "[INFO] Running unit tests: council context..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_council_context.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_council_context.py"
+
+echo ""
+echo "[INFO] Running unit tests: stream coalescer..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_stream_coalescer.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_stream_coalescer.py"
+
+echo ""
+echo "[INFO] Running unit tests: speculative decoding..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_speculative.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_speculative.py"
+
+echo ""
+echo "[INFO] Running unit tests: fake llama..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_fake_llama.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_fake_llama.py"
+
+echo ""
+echo "[INFO] Running unit tests: repetition guard..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_repetition_guard.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_repetition_guard.py"
+
+echo ""
+echo "[INFO] Running unit tests: async API..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_async_api.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_async_api.py"
+
+echo ""
+echo "[INFO] Running unit tests: chat renderer..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_chat_renderer.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_chat_renderer.py"
+
+echo ""
+echo "[INFO] Running unit tests: transcript store..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_transcript_store.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_transcript_store.py"
+
+echo ""
+echo "[INFO] Running unit tests: chat session..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_chat_session.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_chat_session.py"
+
+echo ""
+echo "[INFO] Running unit tests: inference queue..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_inference_queue.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_inference_queue.py"
+
+echo ""
+echo "[INFO] Running unit tests: hardware tuner..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_hw_tuner.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_hw_tuner.py"
+
+echo ""
+echo "[INFO] Running unit tests: model daemon..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_model_daemon.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_model_daemon.py"
+
+echo ""
+echo "[INFO] Running unit tests: personas..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/unit/test_persona.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/unit/test_persona.py"
+
+echo ""
+echo "[INFO] Running benchmarks (fake models, compared with tests/benchmark/baselines.json)..."
+"${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/benchmark/test_benchmarks.py" -v -s --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/benchmark/test_benchmarks.py"
+
 echo ""
 echo "[INFO] Running integration tests: model..."
 "${VENV_PYTHON}" -m pytest "${SCRIPT_DIR}/integration/test_model.py" -v --tb=short 2>/dev/null || "${VENV_PYTHON}" "${SCRIPT_DIR}/integration/test_model.py"
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Async API
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import asyncio
+import contextlib
+import tempfile
+import threading
+import time
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+class TestAsyncBridge(unittest.IsolatedAsyncioTestCase):
+    """Test the thread → asyncio bridge without any model."""
+
+    async def test_items_and_errors_pass_through(self):
+        from Everything_else.async_api import stream
+
+        def numbers(cancel):
+            yield from range(5)
+            raise ValueError("bad weights")
+
+        received = []
+        with self.assertRaises(ValueError):
+            async for n in stream(numbers):
+                received.append(n)
+        self.assertEqual(received, [0, 1, 2, 3, 4])
+
+    async def test_slow_consumer_holds_back_producer(self):
+        from Everything_else.async_api import stream
+        produced = []
+
+        def endless(cancel):
+            n = 0
+            while True:
+                produced.append(n)
+                yield n
+                n += 1
+
+        items = stream(endless, maxsize=2)
+        await items.__anext__()
+        await asyncio.sleep(0.2)
+        # One handed out, two queued, one blocked in put
+        self.assertLessEqual(len(produced), 4)
+        await items.aclose()
+
+    async def test_break_cancels_producer(self):
+        from Everything_else.async_api import stream
+        from Everything_else.cancellation import CancelToken
+        cancel = CancelToken()
+        closed = threading.Event()
+
+        def endless(cancel):
+            try:
+                while True:
+                    yield "token"
+            finally:
+                closed.set()
+
+        async with contextlib.aclosing(stream(endless, cancel)) as items:
+            async for _ in items:
+                break
+        self.assertTrue(cancel.cancelled)
+        self.assertTrue(closed.is_set())
+
+    async def test_idle_timeout_cancels(self):
+        from Everything_else.async_api import stream, GenerationTimeout
+        from Everything_else.cancellation import CancelToken
+        cancel = CancelToken()
+
+        def stalled(cancel):
+            yield "first"
+            cancel.wait(5)
+            yield "late"
+
+        received = []
+        started = time.perf_counter()
+        with self.assertRaises(GenerationTimeout):
+            async for item in stream(stalled, cancel, idle_timeout=0.1):
+                received.append(item)
+        self.assertEqual(received, ["first"])
+        self.assertEqual(cancel.reason, "timeout")
+        self.assertLess(time.perf_counter() - started, 2)
+
+
+class TestAsyncGeneration(unittest.IsolatedAsyncioTestCase):
+    """Test achat/complete/load against the fake Llama."""
+
+    @classmethod
+    def setUpClass(cls):
+        from Everything_else import model_registry
+        from Everything_else.prompt_cache import PromptStateCache
+
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls._saved_cache = model_registry._PROMPT_CACHE
+        model_registry._PROMPT_CACHE = PromptStateCache(cache_dir=os.path.join(cls.tmp.name, "states"))
+
+    @classmethod
+    def tearDownClass(cls):
+        from Everything_else import model_registry
+        model_registry.set_llama_loader(None)
+        model_registry._PROMPT_CACHE = cls._saved_cache
+        cls.tmp.cleanup()
+
+    def use_profile(self, **rates):
+        from Everything_else import model_registry
+        from Everything_else.fake_llama import FakeLoader, FakeProfile
+        loader = FakeLoader(FakeProfile(prompt_tps=0, **rates))
+        model_registry.set_llama_loader(loader)
+        return loader
+
+    async def test_complete_matches_sync_call(self):
+        from Everything_else.async_api import complete, load
+        from Everything_else.inference_telemetry import chunk_text
+        self.use_profile(decode_tps=0, reply_tokens=10)
+
+        persona = await load("jynx_default")
+        expected = "".join(chunk_text(c) for c in persona("Where is water?", stream_override=True))
+        self.assertEqual(await complete("jynx_default", "Where is water?"), expected)
+
+    async def test_concurrent_requests_share_weights_in_turn(self):
+        from Everything_else.async_api import complete
+        from Everything_else.model_registry import acquire_llm
+        loader = self.use_profile(decode_tps=500, reply_tokens=10)
+
+        # Personas share one mistral file, so one Llama serves all three
+        llm = await asyncio.to_thread(acquire_llm, "jynx_default")
+        reply = llm._reply
+        active = []
+        overlapped = []
+
+        def watched(*args, **kwargs):
+            active.append(1)
+            overlapped.append(len(active) > 1)
+            try:
+                yield from reply(*args, **kwargs)
+            finally:
+                active.pop()
+        llm._reply = watched
+
+        replies = await asyncio.gather(
+            complete("jynx_default", "Question one?"),
+            complete("jynx_expert_logic", "Question two?"),
+            complete("jynx_expert_finance", "Question three?"),
+        )
+        self.assertTrue(all(len(r.split()) == 10 for r in replies))
+        self.assertEqual(loader.loads, 1)
+        self.assertEqual(len(overlapped), 3)
+        self.assertFalse(any(overlapped))
+
+    async def test_timeout_stops_decoding(self):
+        from Everything_else.async_api import achat, GenerationTimeout
+        from Everything_else.cancellation import CancelToken
+        loader = self.use_profile(decode_tps=20, reply_tokens=200)
+        cancel = CancelToken()
+
+        received = []
+        with self.assertRaises(GenerationTimeout):
+            async for text in achat("jynx_default", "Tell me everything", cancel=cancel, timeout=0.3):
+                received.append(text)
+        self.assertTrue(cancel.cancelled)
+        self.assertLess(len(received), 20)
+        self.assertLess(loader.busy_s, 2)
+
+    async def test_council_events(self):
+        from unittest import mock
+        from Everything_else import ai_council
+        from Everything_else.async_api import acouncil
+        from Everything_else.expert_router import ExpertRouter
+        self.use_profile(decode_tps=0, reply_tokens=12)
+
+        router = ExpertRouter(ai_council.FIELD_DESCRIPTIONS,
+                              history_path=os.path.join(self.tmp.name, "routing.json"))
+        with mock.patch.object(ai_council, "get_router", return_value=router):
+            events = [event async for event in acouncil("How do I budget for food storage?",
+                                                        mode="chain", idle_timeout=10)]
+        self.assertEqual(events[-1], ("done", ""))
+        self.assertIn("verdict_done", [event[0] for event in events])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
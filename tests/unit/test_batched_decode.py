@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Batched Decoding
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+class TestBatchedDecode(unittest.TestCase):
+    """Test per-sequence sampling and stop-string handling."""
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_greedy_and_top_k(self):
+        import numpy as np
+        from batched_decode import sample_token
+        logits = np.array([0.1, 3.0, 0.2, 2.9])
+        rng = np.random.default_rng(0)
+        self.assertEqual(sample_token(logits, 0, 40, 0.95, rng), 1)
+        for _ in range(20):
+            self.assertIn(sample_token(logits, 1.0, 2, 1.0, rng), (1, 3))
+
+    def test_stop_string_held_back(self):
+        from batched_decode import _Sequence, SequenceRequest
+        seq = _Sequence(0, SequenceRequest("p", stop=["User:"]), [1, 2])
+        emitted = seq.feed(b"Hello Us")
+        self.assertNotIn("Us", emitted)
+        emitted += seq.feed(b"er: more")
+        self.assertEqual(emitted, "Hello ")
+        self.assertTrue(seq.done)
+
+
+class TestBatchedStream(unittest.TestCase):
+    """Test BatchedDecoder.stream() over FakeLlama's batch context."""
+
+    def setUp(self):
+        from Everything_else.fake_llama import FakeLlama, FakeProfile
+        self.llm = FakeLlama(profile=FakeProfile(prompt_tps=0, decode_tps=0, reply_tokens=12))
+
+    def reply(self, prompt):
+        from Everything_else.fake_llama import FakeLlama
+        return "".join(FakeLlama.reply_piece(prompt, i) for i in range(12))
+
+    def decode(self, requests, cancel=None, stop_after=None):
+        from batched_decode import open_batch
+        decoder = open_batch(self.llm, requests)
+        texts, order = {}, []
+        for index, text in decoder.stream(cancel):
+            order.append((index, text))
+            if text is not None:
+                texts[index] = texts.get(index, "") + text
+            if stop_after is not None and len(order) == stop_after:
+                cancel.cancel()
+        return decoder, texts, order
+
+    def test_sequences_decode_together(self):
+        from batched_decode import SequenceRequest
+        decoder, texts, order = self.decode([SequenceRequest("first prompt", max_tokens=100),
+                                             SequenceRequest("second prompt", max_tokens=100)])
+        self.assertEqual(texts, {0: self.reply("first prompt"), 1: self.reply("second prompt")})
+        # Tokens of both sequences interleave; each ends with one None
+        self.assertEqual(order[:2], [(0, order[0][1]), (1, order[1][1])])
+        self.assertEqual([i for i, t in order if t is None], [0, 1])
+        self.assertTrue(decoder.context.closed)
+
+    def test_each_sequence_finishes_on_its_own(self):
+        from batched_decode import SequenceRequest
+        _, texts, order = self.decode([SequenceRequest("short one", max_tokens=3),
+                                       SequenceRequest("long one", max_tokens=100)])
+        finished = [n for n, (i, t) in enumerate(order) if t is None]
+        self.assertEqual(order[finished[0]][0], 0)
+        self.assertLess(finished[0], len(order) - 10)
+        self.assertTrue(self.reply("short one").startswith(texts[0]))
+        self.assertEqual(texts[1], self.reply("long one"))
+
+    def test_stop_string_is_held_back_and_cut(self):
+        from batched_decode import SequenceRequest
+        full = self.reply("stop here")
+        stop = full.split()[3].rstrip(".")
+        _, texts, _ = self.decode([SequenceRequest("stop here", max_tokens=100, stop=[stop]),
+                                   SequenceRequest("other", max_tokens=100)])
+        self.assertEqual(texts[0], full[:full.index(stop)])
+
+    def test_cancel_stops_every_sequence(self):
+        from batched_decode import SequenceRequest
+        from Everything_else.cancellation import CancelToken
+        cancel = CancelToken()
+        decoder, _, order = self.decode([SequenceRequest("first prompt", max_tokens=100),
+                                         SequenceRequest("second prompt", max_tokens=100)],
+                                        cancel=cancel, stop_after=3)
+        self.assertLessEqual(len(order), 4)
+        self.assertNotIn(None, [t for _, t in order])
+        self.assertTrue(decoder.context.closed)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Cancellation
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+
+class FakeStream:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.produced = 0
+        self.closed = False
+
+    def __iter__(self):
+        for token in self.tokens:
+            self.produced += 1
+            yield {"choices": [{"text": token}]}
+
+    def close(self):
+        self.closed = True
+
+
+class FakePersona:
+    config = {}
+    stop = []
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    def __call__(self, prompt, stream_override=None, max_tokens=None, temperature=None, stop=None, cancel=None):
+        from cancellation import cancellable
+        return cancellable(iter(FakeStream(self.tokens)), cancel)
+
+
+class TestCancellation(unittest.TestCase):
+    """Test cooperative cancellation of token streams and council runs."""
+
+    def test_stream_stops_and_closes(self):
+        from cancellation import CancelToken, cancellable
+        token = CancelToken()
+        stream = FakeStream(["a", "b", "c", "d"])
+        seen = []
+        for chunk in cancellable(stream, token):
+            seen.append(chunk)
+            if len(seen) == 2:
+                token.cancel()
+        self.assertEqual(len(seen), 2)
+        self.assertTrue(stream.closed)
+
+    def test_no_token_runs_to_end(self):
+        from cancellation import cancellable
+        stream = FakeStream(["a", "b"])
+        self.assertEqual(len(list(cancellable(stream, None))), 2)
+        self.assertTrue(stream.closed)
+
+    def test_council_ends_with_cancelled(self):
+        from Everything_else import ai_council
+        from cancellation import CancelToken
+        from Everything_else.expert_router import ExpertRouter
+        token = CancelToken()
+        with tempfile.TemporaryDirectory() as tmp:
+            router = ExpertRouter(ai_council.FIELD_DESCRIPTIONS, history_path=os.path.join(tmp, "h.json"))
+            with mock.patch.object(ai_council, "get_persona", return_value=FakePersona(["Logic ", "x ", "y "])), \
+                    mock.patch.object(ai_council, "get_router", return_value=router), \
+                    mock.patch.object(ai_council, "prefetch_model"):
+                events = []
+                for event in ai_council.run_council_streaming("question", cancel=token, mode="chain"):
+                    events.append(event)
+                    if event[0] == "expert_token":
+                        token.cancel()
+        self.assertEqual(events[-1], ("cancelled", ""))
+        self.assertNotIn("verdict_start", [e[0] for e in events])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
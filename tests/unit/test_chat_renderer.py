@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Chat Renderer
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+def filtered(*parts):
+    from ui.chat_renderer import RoleTagFilter
+    tag_filter = RoleTagFilter()
+    return "".join(tag_filter.feed(p) for p in parts) + tag_filter.finish()
+
+
+class FakeSignal:
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+
+class FakeTimer:
+    """Stands in for a single-shot QTimer; fire() runs its timeout."""
+
+    def __init__(self):
+        self.timeout = FakeSignal()
+        self.active = False
+        self.starts = 0
+
+    def setSingleShot(self, single):
+        pass
+
+    def setInterval(self, ms):
+        self.interval = ms
+
+    def isActive(self):
+        return self.active
+
+    def start(self):
+        self.active = True
+        self.starts += 1
+
+    def stop(self):
+        self.active = False
+
+    def fire(self):
+        self.active = False
+        for slot in self.timeout.slots:
+            slot()
+
+
+class FakeView:
+    """Stands in for TranscriptView: a list of [head, body] rows."""
+
+    def __init__(self):
+        self.rows = []
+
+    def at_bottom(self):
+        return False
+
+    def add(self, head, body=""):
+        self.rows.append([head, body])
+        return len(self.rows) - 1
+
+    def extend(self, text, row=None):
+        self.rows[-1 if row is None else row][1] += text
+
+    def set_head(self, row, head):
+        self.rows[row][0] = head
+
+
+class TestRoleTagFilter(unittest.TestCase):
+    """Test incremental role-tag stripping."""
+
+    def test_leading_tag_and_whitespace(self):
+        self.assertEqual(filtered("  Assistant:  Hello there."), "Hello there.")
+
+    def test_tag_split_across_tokens(self):
+        self.assertEqual(filtered("Hi.\nUs", "er", ": more"), "Hi.\nmore")
+        self.assertEqual(filtered("As", "sis", "tant:", " ok"), "ok")
+
+    def test_words_that_start_like_tags_are_kept(self):
+        self.assertEqual(filtered("Us", "eful ", "tip\nSyst", "ems fail"), "Useful tip\nSystems fail")
+
+    def test_tags_mid_line_are_text(self):
+        self.assertEqual(filtered("Thank you: friend"), "Thank you: friend")
+
+    def test_indentation_kept(self):
+        self.assertEqual(filtered("List:\n  - one\n  you: two"), "List:\n  - one\ntwo")
+
+    def test_held_text_released_at_finish(self):
+        from ui.chat_renderer import RoleTagFilter
+        tag_filter = RoleTagFilter()
+        self.assertEqual(tag_filter.feed("Sys"), "")
+        self.assertEqual(tag_filter.finish(), "Sys")
+
+
+class TestChatRenderer(unittest.TestCase):
+    """Test that writes are queued and applied once per frame."""
+
+    def setUp(self):
+        from ui.chat_renderer import ChatRenderer
+        self.timer = FakeTimer()
+        self.applied = []
+        self.renderer = ChatRenderer(view=None, timer=self.timer)
+        self.renderer._apply = self.applied.append
+
+    def test_text_is_merged_until_the_timer_fires(self):
+        for token in ("Hel", "lo", " world"):
+            self.renderer.text(token)
+        self.assertEqual(self.applied, [])
+        self.assertEqual(self.timer.starts, 1)
+        self.timer.fire()
+        self.assertEqual(self.applied, [[("text", "Hello world")]])
+
+    def test_order_of_mixed_writes_is_kept(self):
+        self.renderer.append("<b>Summary:</b>")
+        self.renderer.text("a")
+        self.renderer.append("<b>Logic Expert:</b>")
+        self.renderer.text("b")
+        self.renderer.flush()
+        self.assertEqual(self.applied, [[("append", "<b>Summary:</b>"), ("text", "a"),
+                                         ("append", "<b>Logic Expert:</b>"), ("text", "b")]])
+        self.assertFalse(self.timer.isActive())
+
+    def test_keyed_entry_streams_above_newer_rows(self):
+        from ui.chat_renderer import ChatRenderer
+        view = FakeView()
+        renderer = ChatRenderer(view=view, timer=FakeTimer())
+        renderer.append("<b>Jynx:</b>", key="reply")
+        renderer.text("Hel", key="reply")
+        renderer.append("<b>You:</b> next (queued)", key="prompt")
+        renderer.text("lo", key="reply")
+        renderer.head("prompt", "<b>You:</b> next")
+        renderer.flush()
+        self.assertEqual(view.rows, [["<b>Jynx:</b>", "Hello"], ["<b>You:</b> next", ""]])
+
+        renderer.release("reply")
+        renderer.text("late", key="reply")
+        renderer.flush()
+        self.assertEqual(view.rows[0][1], "Hello")
+
+    def test_empty_flush_does_nothing(self):
+        self.renderer.text("")
+        self.renderer.flush()
+        self.timer.fire()
+        self.assertEqual(self.applied, [])
+        self.assertEqual(self.renderer.frames, 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Chat Session
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+def reply_of(stream):
+    from Everything_else.inference_telemetry import chunk_text
+    return "".join(chunk_text(c) for c in stream)
+
+
+class TestChatSession(unittest.TestCase):
+    """Test multi-turn prompts, KV reuse and the context window policies."""
+
+    @classmethod
+    def setUpClass(cls):
+        from Everything_else import model_registry
+        from Everything_else.prompt_cache import PromptStateCache
+
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls._saved_cache = model_registry._PROMPT_CACHE
+        model_registry._PROMPT_CACHE = PromptStateCache(cache_dir=os.path.join(cls.tmp.name, "states"))
+
+    @classmethod
+    def tearDownClass(cls):
+        from Everything_else import model_registry
+        model_registry.set_llama_loader(None)
+        model_registry._PROMPT_CACHE = cls._saved_cache
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        from Everything_else import model_registry
+        from Everything_else.fake_llama import FakeLoader, FakeProfile
+        from Everything_else.inference_telemetry import TELEMETRY
+        self.loader = FakeLoader(FakeProfile(prompt_tps=0, decode_tps=0, reply_tokens=20))
+        model_registry.set_llama_loader(self.loader)
+        self.persona = model_registry.get_persona("jynx_default")
+        TELEMETRY.clear()
+
+    def session(self, **kwargs):
+        from Everything_else.chat_session import ChatSession
+        return ChatSession(self.persona, **kwargs)
+
+    def last_call(self):
+        from Everything_else.inference_telemetry import TELEMETRY
+        return TELEMETRY.recent("call")[-1]
+
+    def test_history_is_formatted_in_order(self):
+        from Everything_else.model_registry import format_prompt
+        text = format_prompt("third?", "jynx_default", "System.", "inst",
+                             history=[("first?", "one"), ("second?", "two")])
+        self.assertLess(text.index("first?"), text.index("one"))
+        self.assertLess(text.index("two"), text.index("third?"))
+        self.assertTrue(text.startswith(format_prompt("x", "jynx_default", "System.", "inst").split("[INST] x")[0]))
+
+    def test_second_turn_reuses_the_context(self):
+        session = self.session()
+        first = reply_of(session.send("Where can I find water near a ridge?"))
+        self.assertEqual(session.turns, [("Where can I find water near a ridge?", first.strip())])
+
+        reply_of(session.send("And how do I filter it?"))
+        record = self.last_call()
+        self.assertEqual(record["history_turns"], 1)
+        self.assertEqual(record["prefix_cache"], "hit")
+        # Only the new question and the boundary around the last reply are evaluated
+        self.assertGreater(record["reused_tokens"], record["prompt_tokens"] * 0.7)
+
+    def test_window_policy_shifts_old_turns(self):
+        session = self.session(n_ctx=400, reply_reserve=64, keep_ratio=0.5)
+        for i in range(12):
+            reply_of(session.send(f"Question number {i} about the food stores?", max_tokens=20))
+        self.assertGreater(session.shifted, 0)
+        self.assertEqual(session.turns[-1][0], "Question number 11 about the food stores?")
+        from Everything_else.inference_telemetry import TELEMETRY
+        self.assertTrue(all(r["prompt_tokens"] <= 400 - 20 for r in TELEMETRY.recent("call")))
+
+    def test_summarize_policy_keeps_a_note(self):
+        session = self.session(n_ctx=400, reply_reserve=64, keep_ratio=0.5, policy="summarize", summary_tokens=10)
+        for i in range(12):
+            reply_of(session.send(f"Question number {i} about the food stores?", max_tokens=20))
+        self.assertTrue(session.summary)
+        self.assertIn("Earlier in this conversation:", session.context_note())
+
+    def test_history_off_sends_single_turns(self):
+        session = self.session(history=False)
+        reply_of(session.send("Hello there"))
+        self.assertEqual(session.turns, [])
+        self.assertNotIn("history_turns", self.last_call())
+
+    def test_config_section(self):
+        from Everything_else import chat_session
+        with mock.patch.object(chat_session, "get_config_section", return_value={"policy": "summarize"}):
+            session = chat_session.ChatSession.from_config(self.persona)
+        self.assertEqual((session.policy, session.reply_reserve), ("summarize", 512))
+        with self.assertRaises(ValueError):
+            self.session(policy="forget_everything")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Council Cache
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import base64
+import tempfile
+import unittest
+from unittest import mock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+try:
+    from cryptography.fernet import Fernet
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+
+EVENTS = [("summary", "Task"), ("summary_done", "Task"), ("expert_start", "Logic Expert"),
+          ("expert_token", "Logic Expert", "Think."), ("done", "")]
+
+
+class ReversibleCipher:
+    """Stands in for Fernet: encrypt/decrypt round-trip, output unreadable as text."""
+
+    def encrypt(self, data):
+        return base64.b64encode(bytes(b ^ 0x5A for b in data))
+
+    def decrypt(self, token):
+        return bytes(b ^ 0x5A for b in base64.b64decode(token))
+
+
+class TestCouncilCache(unittest.TestCase):
+    """Test keying, replay, eviction and on-disk privacy of the council cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_normalized_prompts_share_a_key(self):
+        from council_cache import make_key
+        a = make_key("Should I  move to the woods?", ["b", "a"], "fp")
+        b = make_key("should i move to the woods", ["a", "b"], "fp")
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, make_key("should i move to the woods", ["a"], "fp"))
+        self.assertNotEqual(a, make_key("should i move to the woods", ["a", "b"], "other"))
+
+    def test_round_trip_and_nothing_readable(self):
+        from council_cache import CouncilCache
+        cache = CouncilCache(ReversibleCipher(), self.tmp.name)
+        cache.put("k", EVENTS)
+        self.assertEqual(CouncilCache(ReversibleCipher(), self.tmp.name).get("k"), EVENTS)
+        for name in os.listdir(self.tmp.name):
+            with open(os.path.join(self.tmp.name, name), "rb") as f:
+                self.assertNotIn(b"Logic Expert", f.read())
+
+    def test_lru_eviction_under_cap(self):
+        from council_cache import CouncilCache
+        cache = CouncilCache(ReversibleCipher(), self.tmp.name)
+        cache.put("a", EVENTS)
+        size = cache.stats()["bytes"]
+        cache.max_bytes = size * 2
+        cache.put("b", EVENTS)
+        cache.get("a")  # a is now more recent than b
+        cache.put("c", EVENTS)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_council_replays_and_force_refresh_reruns(self):
+        from Everything_else import ai_council
+        from Everything_else.expert_router import ExpertRouter
+        from council_cache import CouncilCache
+
+        calls = []
+
+        class Persona:
+            config, stop = {}, []
+
+            def __call__(self, prompt, cancel=None, **kwargs):
+                calls.append(prompt)
+                return iter([{"choices": [{"text": "ok "}]}])
+
+        cache = CouncilCache(ReversibleCipher(), os.path.join(self.tmp.name, "council"))
+        router = ExpertRouter(ai_council.FIELD_DESCRIPTIONS, history_path=os.path.join(self.tmp.name, "h.json"))
+        with mock.patch.object(ai_council, "get_persona", return_value=Persona()), \
+                mock.patch.object(ai_council, "get_router", return_value=router), \
+                mock.patch.object(ai_council, "prefetch_model"):
+            first = list(ai_council.run_council_streaming("budget my money", mode="chain", cache=cache))
+            n_calls = len(calls)
+            second = list(ai_council.run_council_streaming("Budget my money?", mode="chain", cache=cache))
+            self.assertEqual(len(calls), n_calls)
+            self.assertEqual(second, [("cache_hit", "")] + first)
+            list(ai_council.run_council_streaming("budget my money", mode="chain", cache=cache, force_refresh=True))
+            self.assertGreater(len(calls), n_calls)
+
+    @unittest.skipUnless(HAS_CRYPTOGRAPHY, "cryptography not installed")
+    def test_wrong_key_starts_fresh(self):
+        from council_cache import CouncilCache
+        CouncilCache(Fernet(Fernet.generate_key()), self.tmp.name).put("k", EVENTS)
+        self.assertIsNone(CouncilCache(Fernet(Fernet.generate_key()), self.tmp.name).get("k"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
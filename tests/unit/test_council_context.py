@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Council Context
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+
+def count_words(text):
+    return len(text.split())
+
+
+LONG_ANSWER = (
+    "Water comes before everything else. "
+    + "The weather was nice and the trail went on for a long while. " * 30
+    + "You should always carry 2 litres and a filter."
+)
+
+
+class TestCouncilContext(unittest.TestCase):
+    """Test note compression and prompt fitting."""
+
+    def test_short_text_kept_whole(self):
+        from Everything_else.council_context import compress
+        self.assertEqual(compress("  Keep it simple.  ", 50, count_words), "Keep it simple.")
+
+    def test_compress_keeps_key_sentences_within_budget(self):
+        from Everything_else.council_context import compress
+        result = compress(LONG_ANSWER, 25, count_words)
+        self.assertLessEqual(count_words(result), 25)
+        self.assertIn("Water comes before everything else.", result)
+        self.assertIn("You should always carry 2 litres", result)
+
+    def test_truncates_when_no_sentences(self):
+        from Everything_else.council_context import compress
+        result = compress("word " * 100, 10, count_words)
+        self.assertLessEqual(count_words(result), 10)
+        self.assertTrue(result.endswith("…"))
+
+    def test_notes_stay_within_budget_as_experts_add_up(self):
+        from Everything_else.council_context import CouncilNotes
+        notes = CouncilNotes(budget=120)
+        sizes = []
+        for i in range(4):
+            notes.add(f"Expert {i} says:", LONG_ANSWER)
+            sizes.append(count_words(notes.render(count_words)))
+        self.assertLessEqual(max(sizes), 120 + 3 * 4)
+
+    def test_notes_are_compressed_once_per_share(self):
+        from Everything_else import council_context
+        notes = council_context.CouncilNotes(budget=120)
+        for i in range(3):
+            notes.add(f"Expert {i} says:", LONG_ANSWER)
+        with mock.patch.object(council_context, "compress", wraps=council_context.compress) as compress:
+            # Callers build a new counter closure for every prompt
+            first = notes.render(lambda text: count_words(text))
+            second = notes.render(lambda text: count_words(text))
+        self.assertEqual(first, second)
+        self.assertEqual(compress.call_count, 3)
+
+    def test_fit_prompt_respects_context(self):
+        from Everything_else.council_context import CouncilNotes, fit_prompt
+        notes = CouncilNotes(budget=1000)
+        for i in range(4):
+            notes.add(f"Expert {i} says:", LONG_ANSWER)
+        prompt = fit_prompt(lambda text: f"Question\n{text}\nVerdict:", notes, count_words, n_ctx=300, reserve=100)
+        self.assertLessEqual(count_words(prompt), 200)
+        self.assertTrue(prompt.endswith("Verdict:"))
+
+    def test_fit_prompt_keeps_tail_when_nothing_else_fits(self):
+        from Everything_else.council_context import CouncilNotes, fit_prompt
+        prompt = fit_prompt(lambda text: "filler " * 500 + "Answer now:", CouncilNotes(),
+                            count_words, n_ctx=60, reserve=10)
+        self.assertLessEqual(count_words(prompt), 50)
+        self.assertTrue(prompt.endswith("Answer now:"))
+
+    def test_counter_only_uses_resident_weights(self):
+        from Everything_else import model_registry
+        from Everything_else.council_context import token_counter, estimate_tokens, fit_prompt, CouncilNotes
+        from Everything_else.fake_llama import FakeLoader, FakeProfile
+
+        loader = FakeLoader(FakeProfile(prompt_tps=0, decode_tps=0))
+        model_registry.set_llama_loader(loader)
+        try:
+            persona = model_registry.get_local_persona("jynx_expert_math")
+            with token_counter(persona) as count:
+                self.assertIs(count, estimate_tokens)
+            self.assertEqual(loader.loads, 0)
+
+            model_registry.acquire_llm("jynx_expert_math")
+            notes = CouncilNotes(budget=400)
+            notes.add("Expert says:", LONG_ANSWER)
+            with mock.patch.object(model_registry, "acquire_llm") as acquire, \
+                    token_counter(persona) as count:
+                fit_prompt(lambda text: f"Q\n{text}\nA:", notes, count, n_ctx=200, reserve=50)
+            acquire.assert_not_called()
+            pool = model_registry.get_model_pool()
+            self.assertEqual(pool.get_entry(persona.pool_key).users, 0)
+        finally:
+            model_registry.set_llama_loader(None)
+
+    def test_chain_prompts_stay_flat_and_verdict_fits(self):
+        from Everything_else import ai_council
+        from Everything_else.expert_router import ExpertRouter
+
+        prompts = []
+
+        class Persona:
+            stop = []
+            config = {"n_ctx": 2048, "generation_token_limit": 400, "max_tokens": 1024}
+
+            def count_tokens(self, text):
+                return count_words(text)
+
+            def __call__(self, prompt, cancel=None, **kwargs):
+                prompts.append(prompt)
+                return iter([{"choices": [{"text": LONG_ANSWER}]}])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            router = ExpertRouter(ai_council.FIELD_DESCRIPTIONS, history_path=os.path.join(tmp, "h.json"))
+            router.route = lambda prompt: ["jynx_expert_survival", "jynx_expert_finance",
+                                           "jynx_expert_logic", "jynx_expert_math"]
+            with mock.patch.object(ai_council, "get_persona", return_value=Persona()), \
+                    mock.patch.object(ai_council, "get_router", return_value=router), \
+                    mock.patch.object(ai_council, "prefetch_model"), \
+                    mock.patch.object(ai_council, "get_config_section",
+                                      return_value={"mode": "chain", "skip_summary": True,
+                                                    "notes_tokens": 120}):
+                events = list(ai_council.run_council_streaming("Plan a week-long hike", mode="chain"))
+
+        self.assertEqual(events[-1], ("done", ""))
+        expert_sizes = [count_words(p) for p in prompts[:-1]]
+        self.assertEqual(len(expert_sizes), 4)
+        # Later experts read more answers but not a longer prompt than the budget allows
+        self.assertLessEqual(expert_sizes[-1] - expert_sizes[1], 20)
+        self.assertLessEqual(count_words(prompts[-1]), 2048 - 512)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Council Scheduler
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+GB = 1024 ** 3
+
+
+class FakePersona:
+    stop = []
+
+    def __init__(self, tokens, pool_key="shared"):
+        self.tokens = tokens
+        self.pool_key = pool_key
+        self.config = {"generation_token_limit": 50}
+        self.llm = object()
+
+    def __call__(self, prompt, stream_override=None, max_tokens=None, temperature=None, stop=None, cancel=None):
+        return iter([{"choices": [{"text": t}]} for t in self.tokens])
+
+    def sequence_request(self, prompt, max_tokens=None, temperature=None, stop=None):
+        from Everything_else.batched_decode import SequenceRequest
+        return SequenceRequest(prompt, max_tokens=max_tokens, temperature=temperature)
+
+
+class FakeDecoder:
+    """Two sequences whose tokens arrive interleaved."""
+    prompt_tokens = 10
+    tokens_saved = 0
+
+    def stream(self, cancel=None):
+        yield 0, "a1"
+        yield 1, "b1"
+        yield 1, "b2"
+        yield 1, None
+        yield 0, "a2"
+        yield 0, None
+
+
+class FakePool:
+    def __init__(self, budget):
+        self.ram_budget_bytes = budget
+
+    def used_bytes(self):
+        return 0
+
+    def contains(self, key):
+        return False
+
+
+def run_round(scheduler, jobs):
+    events, gen = [], scheduler.run_round(jobs)
+    try:
+        while True:
+            events.append(next(gen))
+    except StopIteration as stop:
+        return events, stop.value
+
+
+class TestCouncilScheduler(unittest.TestCase):
+    """Test round schedulers and worker planning."""
+
+    def _jobs(self):
+        from Everything_else.council_scheduler import ExpertJob
+        return [ExpertJob("jynx_expert_logic", "Logic Expert", "p1"),
+                ExpertJob("jynx_expert_math", "Math Expert", "p2")]
+
+    def test_batched_round_interleaves(self):
+        from Everything_else import council_scheduler
+        personas = {"jynx_expert_logic": FakePersona([]), "jynx_expert_math": FakePersona([])}
+        with mock.patch.object(council_scheduler, "get_persona", side_effect=personas.get), \
+                mock.patch.object(council_scheduler, "open_batch", return_value=FakeDecoder()):
+            events, buffers = run_round(council_scheduler.BatchedScheduler(), self._jobs())
+        tokens = [e[1:] for e in events if e[0] == "expert_token"]
+        self.assertEqual(tokens[:2], [("Logic Expert", "a1"), ("Math Expert", "b1")])
+        self.assertEqual(buffers, {"Logic Expert": "a1a2", "Math Expert": "b1b2"})
+
+    def test_batched_round_holds_the_decode_lock(self):
+        import threading
+        from Everything_else import council_scheduler
+        from Everything_else.model_registry import get_model_pool
+        personas = {"jynx_expert_logic": FakePersona([]), "jynx_expert_math": FakePersona([])}
+        lock = get_model_pool().decode_lock("shared")
+        free = []
+
+        def probe():
+            if lock.acquire(blocking=False):
+                lock.release()
+                free.append(True)
+            else:
+                free.append(False)
+
+        class ProbingDecoder(FakeDecoder):
+            def stream(self, cancel=None):
+                thread = threading.Thread(target=probe)
+                thread.start()
+                thread.join()
+                yield from FakeDecoder.stream(self, cancel)
+
+        with mock.patch.object(council_scheduler, "get_persona", side_effect=personas.get), \
+                mock.patch.object(council_scheduler, "open_batch", return_value=ProbingDecoder()):
+            run_round(council_scheduler.BatchedScheduler(), self._jobs())
+        probe()
+        self.assertEqual(free, [False, True])
+
+    def test_batched_round_falls_back_to_sequential(self):
+        from Everything_else import council_scheduler
+        from Everything_else.batched_decode import BatchedDecodeUnavailable
+        personas = {"jynx_expert_logic": FakePersona(["x"]), "jynx_expert_math": FakePersona(["y"])}
+        with mock.patch.object(council_scheduler, "get_persona", side_effect=personas.get), \
+                mock.patch.object(council_scheduler, "open_batch", side_effect=BatchedDecodeUnavailable("no")):
+            events, _ = run_round(council_scheduler.BatchedScheduler(), self._jobs())
+        done = [e[1:] for e in events if e[0] == "expert_done"]
+        self.assertEqual(done, [("Logic Expert", "x"), ("Math Expert", "y")])
+
+    def test_plan_workers_respects_ram_budget(self):
+        from Everything_else import council_scheduler
+        ids = ["jynx_expert_logic", "jynx_expert_math"]
+        with mock.patch.object(council_scheduler, "physical_cores", return_value=16), \
+                mock.patch.object(council_scheduler, "memory_plan", return_value=(4 * GB, 1 * GB)), \
+                mock.patch.object(council_scheduler, "get_pool_key", side_effect=lambda m: m):
+            with mock.patch.object(council_scheduler, "get_model_pool", return_value=FakePool(14 * GB)):
+                workers, threads, _ = council_scheduler.plan_workers(ids)
+                self.assertEqual((workers, threads), (2, 8))
+            with mock.patch.object(council_scheduler, "get_model_pool", return_value=FakePool(11 * GB)):
+                self.assertEqual(council_scheduler.plan_workers(ids)[0], 1)
+
+    def test_unknown_mode_rejected(self):
+        from Everything_else.council_scheduler import get_scheduler
+        self.assertEqual(get_scheduler("batched").name, "batched")
+        for mode in ("warp", "independent"):
+            with self.assertRaises(ValueError):
+                get_scheduler(mode)
+
+    def test_council_runs_opening_and_rebuttal(self):
+        from Everything_else import ai_council, council_scheduler
+        from Everything_else.expert_router import ExpertRouter
+        persona = FakePersona(["Logic and math "], pool_key=None)
+        with tempfile.TemporaryDirectory() as tmp:
+            router = ExpertRouter(ai_council.FIELD_DESCRIPTIONS, history_path=os.path.join(tmp, "h.json"))
+            with mock.patch.object(ai_council, "get_persona", return_value=persona), \
+                    mock.patch.object(council_scheduler, "get_persona", return_value=persona), \
+                    mock.patch.object(ai_council, "get_router", return_value=router), \
+                    mock.patch.object(ai_council, "prefetch_model"):
+                events = list(ai_council.run_council_streaming(
+                    "Calculate the probability, then decide logically", mode="sequential"))
+        starts = [e[1] for e in events if e[0] == "expert_start"]
+        self.assertEqual(starts, ["Math Expert", "Logic Expert",
+                                  "Math Expert (Rebuttal)", "Logic Expert (Rebuttal)"])
+        self.assertEqual(events[-1], ("done", ""))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Expert Router
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import base64
+import tempfile
+import time
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+DESCRIPTIONS = {
+    "jynx_expert_logic": "logical decision-making and structured analysis",
+    "jynx_expert_math": "mathematics and abstract numerical reasoning",
+    "jynx_expert_finance": "personal finance, economics, and money management",
+    "jynx_expert_survival": "practical off-grid skills, survival, and physical strategy",
+}
+
+EXPERT_MAP = {
+    "logic": "jynx_expert_logic",
+    "math": "jynx_expert_math",
+    "finance": "jynx_expert_finance",
+    "mental health": "jynx_expert_mental_health",
+}
+
+
+class ReversibleCipher:
+    """Stands in for Fernet: encrypt/decrypt round-trip, output unreadable as text."""
+
+    def encrypt(self, data):
+        return base64.b64encode(bytes(b ^ 0x5A for b in data))
+
+    def decrypt(self, token):
+        return bytes(b ^ 0x5A for b in base64.b64decode(token, validate=True))
+
+
+class TestExpertRouter(unittest.TestCase):
+    """Test local expert routing and whole-word summary matching."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.history = os.path.join(self.tmp.name, "routing_history.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_routes_by_topic(self):
+        from expert_router import ExpertRouter
+        router = ExpertRouter(DESCRIPTIONS, history_path=self.history)
+        self.assertEqual(router.route("How should I budget my money and pay off debt?")[0], "jynx_expert_finance")
+        self.assertEqual(router.route("Where do I find water in the wilderness?")[0], "jynx_expert_survival")
+
+    def test_short_list_padded_with_logic(self):
+        from expert_router import ExpertRouter
+        router = ExpertRouter(DESCRIPTIONS, history_path=self.history)
+        self.assertEqual(router.route("unrelated words entirely"), ["jynx_expert_logic"])
+        self.assertIn("jynx_expert_logic", router.route("pay off my debt"))
+
+    def test_history_shifts_routing(self):
+        import hashlib
+        from expert_router import ExpertRouter
+        cipher = ReversibleCipher()
+        router = ExpertRouter(DESCRIPTIONS, history_path=self.history, fernet=cipher)
+        for _ in range(5):
+            router.record("garden harvest yields", ["jynx_expert_math"])
+        reloaded = ExpertRouter(DESCRIPTIONS, history_path=self.history, fernet=cipher)
+        self.assertEqual(reloaded.route("garden harvest yields")[0], "jynx_expert_math")
+        with open(self.history, "rb") as f:
+            data = f.read()
+        # Neither the words nor a dictionary-attackable hash of them are on disk
+        self.assertNotIn(b"garden", data)
+        self.assertNotIn(hashlib.sha256(b"garden").hexdigest()[:12].encode(), data)
+
+    def test_history_without_key_stays_in_memory(self):
+        from expert_router import ExpertRouter
+        router = ExpertRouter(DESCRIPTIONS, history_path=self.history)
+        router.record("garden harvest yields", ["jynx_expert_math"])
+        self.assertEqual(router.route("garden harvest yields")[0], "jynx_expert_math")
+        self.assertFalse(os.path.exists(self.history))
+
+    def test_unreadable_history_starts_fresh(self):
+        from expert_router import ExpertRouter
+        with open(self.history, "wb") as f:
+            f.write(b"not a token")
+        router = ExpertRouter(DESCRIPTIONS, history_path=self.history, fernet=ReversibleCipher())
+        self.assertEqual(router.route("How should I budget my money?")[0], "jynx_expert_finance")
+
+    def test_whole_word_matching(self):
+        from expert_router import match_experts
+        self.assertEqual(match_experts("In the aftermath of the flood", EXPERT_MAP), [])
+        self.assertEqual(match_experts("**Experts:** Finance, Math, Mental Health", EXPERT_MAP),
+                         ["jynx_expert_finance", "jynx_expert_math", "jynx_expert_mental_health"])
+
+    def test_routing_is_fast(self):
+        from expert_router import ExpertRouter
+        router = ExpertRouter(DESCRIPTIONS, history_path=self.history)
+        start = time.perf_counter()
+        for _ in range(100):
+            router.route("Should I invest my savings or keep an emergency fund for survival?")
+        self.assertLess((time.perf_counter() - start) / 100, 0.005)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Fake Llama
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+
+def text_of(stream):
+    return "".join(c["choices"][0].get("text") or c["choices"][0].get("delta", {}).get("content", "")
+                   for c in stream)
+
+
+class TestFakeLlama(unittest.TestCase):
+    """Test the deterministic Llama stand-in."""
+
+    def _llm(self, **rates):
+        from fake_llama import FakeLlama, FakeProfile
+        return FakeLlama(profile=FakeProfile(prompt_tps=0, decode_tps=0, **rates))
+
+    def test_same_prompt_same_reply(self):
+        llm = self._llm(reply_tokens=12)
+        first = text_of(llm("Where do I find water?", stream=True))
+        second = text_of(self._llm(reply_tokens=12)("Where do I find water?", stream=True))
+        self.assertEqual(first, second)
+        self.assertEqual(len(first.split()), 12)
+
+    def test_max_tokens_and_chat_completion(self):
+        llm = self._llm(reply_tokens=50)
+        result = llm.create_chat_completion([{"role": "user", "content": "hi"}], max_tokens=5)
+        self.assertEqual(len(result["choices"][0]["message"]["content"].split()), 5)
+        streamed = text_of(llm.create_chat_completion([{"role": "user", "content": "hi"}], stream=True, max_tokens=3))
+        self.assertEqual(len(streamed.split()), 3)
+
+    def test_prefix_is_not_evaluated_twice(self):
+        llm = self._llm()
+        llm.eval(llm.tokenize(b"System prompt here. "))
+        evaluated = []
+        llm.eval = lambda tokens, _eval=llm.eval: (evaluated.append(len(tokens)), _eval(tokens))
+        list(llm("System prompt here. And the question?", stream=True))
+        self.assertLess(evaluated[0], len(llm.tokenize(b"System prompt here. And the question?")))
+
+    def test_rates_are_modelled(self):
+        llm = self._llm()
+        llm.profile.decode_tps = 1000
+        list(llm("hello", stream=True, max_tokens=20))
+        self.assertAlmostEqual(llm.busy_s, 0.02, places=3)
+
+    def test_profile_parse(self):
+        from fake_llama import FakeProfile
+        profile = FakeProfile.parse("load_s=2, decode_tps=30,reply_tokens=8")
+        self.assertEqual((profile.load_s, profile.decode_tps, profile.reply_tokens), (2.0, 30.0, 8))
+        with self.assertRaises(ValueError):
+            FakeProfile.parse("speed=9")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: GGUF Catalog
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import struct
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+
+def _string(text):
+    data = text.encode("utf-8")
+    return struct.pack("<Q", len(data)) + data
+
+
+def write_fake_gguf(path, chat_template):
+    """Minimal GGUF v3 file: a few metadata keys and one Q4_K tensor."""
+    kvs = [
+        _string("general.architecture") + struct.pack("<I", 8) + _string("llama"),
+        _string("general.file_type") + struct.pack("<I", 4) + struct.pack("<I", 15),
+        _string("llama.context_length") + struct.pack("<I", 4) + struct.pack("<I", 32768),
+        _string("llama.embedding_length") + struct.pack("<I", 4) + struct.pack("<I", 4096),
+        _string("llama.block_count") + struct.pack("<I", 4) + struct.pack("<I", 32),
+        _string("llama.attention.head_count") + struct.pack("<I", 4) + struct.pack("<I", 32),
+        _string("llama.attention.head_count_kv") + struct.pack("<I", 4) + struct.pack("<I", 8),
+        _string("tokenizer.ggml.scores") + struct.pack("<I", 9) + struct.pack("<IQ", 6, 3)
+        + struct.pack("<3f", 0.0, 0.1, 0.2),
+        _string("tokenizer.chat_template") + struct.pack("<I", 8) + _string(chat_template),
+    ]
+    tensor = _string("blk.0.attn_q.weight") + struct.pack("<I", 2) + struct.pack("<QQ", 256, 4) \
+        + struct.pack("<I", 12) + struct.pack("<Q", 0)
+    with open(path, "wb") as f:
+        f.write(b"GGUF" + struct.pack("<IQQ", 3, 1, len(kvs)))
+        for kv in kvs:
+            f.write(kv)
+        f.write(tensor)
+
+
+class TestGGUFCatalog(unittest.TestCase):
+    """Test header-only metadata extraction."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model = os.path.join(self.tmp.name, "fake.gguf")
+        write_fake_gguf(self.model, "{{ '[INST] ' + message['content'] + ' [/INST]' }}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_summary_fields(self):
+        from gguf_catalog import read_gguf_header, summarize
+        record = summarize(read_gguf_header(self.model))
+        self.assertEqual(record["architecture"], "llama")
+        self.assertEqual(record["context_length"], 32768)
+        self.assertEqual(record["quantization"], "Q4_K_M")
+        self.assertEqual(record["tensor_bytes"], 4 * 144)
+
+    def test_template_family(self):
+        from gguf_catalog import read_gguf_header, summarize, template_family
+        record = summarize(read_gguf_header(self.model))
+        self.assertEqual(template_family(record), "inst")
+        self.assertEqual(template_family({"chat_template": "<|im_start|>system"}), "chatml")
+        self.assertIsNone(template_family(None))
+
+    def test_kv_cache_bytes(self):
+        from gguf_catalog import read_gguf_header, summarize, kv_cache_bytes
+        record = summarize(read_gguf_header(self.model))
+        # 2 (K+V) * 32 layers * 4096 ctx * 1024 kv dims * 2 bytes
+        self.assertEqual(kv_cache_bytes(record, 4096), 2 * 32 * 4096 * 1024 * 2)
+
+    def test_catalog_caches_and_handles_missing_file(self):
+        from gguf_catalog import GGUFCatalog
+        catalog = GGUFCatalog(os.path.join(self.tmp.name, "catalog.json"))
+        self.assertEqual(catalog.get(self.model)["architecture"], "llama")
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "catalog.json")))
+        self.assertIsNone(catalog.get(os.path.join(self.tmp.name, "missing.gguf")))
+
+    def test_rejects_non_gguf(self):
+        from gguf_catalog import read_gguf_header, GGUFError
+        bogus = os.path.join(self.tmp.name, "bogus.gguf")
+        with open(bogus, "wb") as f:
+            f.write(b"NOPE" + b"\0" * 32)
+        with self.assertRaises(GGUFError):
+            read_gguf_header(bogus)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Hardware Tuner
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from Everything_else import hw_tuner
+
+# Two cores with two hyperthreads each
+CPUINFO = "".join(
+    f"processor\t: {n}\nmodel name\t: Test CPU\nphysical id\t: 0\ncore id\t\t: {n // 2}\n\n"
+    for n in range(4)
+)
+
+
+class FakeClock:
+    """Time that only moves when a fake model works."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TimedModel:
+    """Stands in for Llama: eval() advances the clock by a cost set per setting."""
+
+    def __init__(self, clock, prompt_s, decode_s, built, **kwargs):
+        self.clock = clock
+        self.prompt_s = prompt_s
+        self.decode_s = decode_s
+        self.closed = False
+        built.append(self)
+        self.kwargs = kwargs
+
+    def tokenize(self, data):
+        return list(range(len(data.split())))
+
+    def reset(self):
+        pass
+
+    def eval(self, tokens):
+        per_token = self.prompt_s if len(tokens) > 1 else self.decode_s
+        self.clock.now += per_token * len(tokens)
+
+    def close(self):
+        self.closed = True
+
+
+class TunerTestCase(unittest.TestCase):
+    """Profiles go to a temporary file; the core count is fixed."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.tmp.name, "model.gguf")
+        with open(self.model_path, "wb") as f:
+            f.write(b"weights" * 16)
+        patches = [
+            mock.patch.object(hw_tuner, "PROFILE_PATH", os.path.join(self.tmp.name, "profiles.json")),
+            mock.patch.object(hw_tuner, "_profiles", None),
+            mock.patch.object(hw_tuner, "physical_cores", return_value=4),
+            mock.patch.object(hw_tuner.os, "cpu_count", return_value=8),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def reload_profiles(self):
+        hw_tuner._profiles = None
+
+
+class TestPhysicalCores(unittest.TestCase):
+    """Test counting physical cores without psutil."""
+
+    def setUp(self):
+        hw_tuner.physical_cores.cache_clear()
+        self.addCleanup(hw_tuner.physical_cores.cache_clear)
+
+    def test_hyperthreads_are_not_counted(self):
+        with mock.patch.dict(sys.modules, {"psutil": None}), \
+                mock.patch("builtins.open", mock.mock_open(read_data=CPUINFO)):
+            self.assertEqual(hw_tuner.physical_cores(), 2)
+
+    def test_falls_back_to_logical_cpus(self):
+        with mock.patch.dict(sys.modules, {"psutil": None}), \
+                mock.patch("builtins.open", side_effect=OSError("no /proc")), \
+                mock.patch.object(hw_tuner.os, "cpu_count", return_value=6):
+            self.assertEqual(hw_tuner.physical_cores(), 6)
+
+
+class TestProfiles(TunerTestCase):
+    """Test saving and loading machine profiles."""
+
+    def test_saved_profile_is_loaded_from_disk(self):
+        settings = {"n_threads": 4, "n_threads_batch": 8, "n_batch": 256}
+        hw_tuner.save_profile(self.model_path, settings, [{"prompt_tps": 100.0}])
+        self.reload_profiles()
+        self.assertEqual(hw_tuner.get_tuned_settings(self.model_path), settings)
+
+    def test_other_model_file_has_no_profile(self):
+        hw_tuner.save_profile(self.model_path, {"n_threads": 4}, [])
+        with open(self.model_path, "ab") as f:
+            f.write(b"new weights")
+        self.assertIsNone(hw_tuner.get_tuned_settings(self.model_path))
+
+    def test_profiles_saved_by_other_processes_are_kept(self):
+        other = self.model_path + ".other"
+        with open(other, "wb") as f:
+            f.write(b"weights")
+        hw_tuner.save_profile(self.model_path, {"n_threads": 4}, [])
+        # Another process writes its profile; this one still has the old copy in memory
+        saved = hw_tuner._profiles
+        hw_tuner._profiles = None
+        hw_tuner.save_profile(other, {"n_threads": 2}, [])
+        hw_tuner._profiles = saved
+        hw_tuner.save_profile(self.model_path, {"n_threads": 8}, [])
+        self.reload_profiles()
+        self.assertEqual(hw_tuner.get_tuned_settings(other), {"n_threads": 2})
+        self.assertEqual(hw_tuner.get_tuned_settings(self.model_path), {"n_threads": 8})
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["model.gguf", "model.gguf.other", "profiles.json"])
+
+    def test_unreadable_file_means_no_profiles(self):
+        with open(hw_tuner.PROFILE_PATH, "w") as f:
+            f.write("{not json")
+        self.assertIsNone(hw_tuner.get_tuned_settings(self.model_path))
+
+
+class TestCalibration(TunerTestCase):
+    """Test the settings grid and picking its fastest entry."""
+
+    def test_candidate_grid(self):
+        self.assertEqual(hw_tuner.candidate_grid(), ([2, 4, 8], [128, 256, 512]))
+        self.assertEqual(hw_tuner.candidate_grid(quick=True), ([4, 8], [512]))
+
+    def loader(self, clock, built):
+        # Four threads decode fastest; batch 256 evaluates prompts fastest
+        def build(n_threads, n_batch, **kwargs):
+            decode_s = {2: 0.08, 4: 0.04, 8: 0.06}[n_threads]
+            prompt_s = {128: 0.004, 256: 0.002, 512: 0.003}[n_batch]
+            return TimedModel(clock, prompt_s, decode_s, built,
+                              n_threads=n_threads, n_batch=n_batch, **kwargs)
+        return build
+
+    def test_fastest_settings_win_and_are_saved(self):
+        clock, built = FakeClock(), []
+        settings = hw_tuner.calibrate(self.model_path, loader=self.loader(clock, built), clock=clock)
+        self.assertEqual(settings, {"n_threads": 4, "n_threads_batch": 8, "n_batch": 256})
+        self.assertEqual(len(built), 9)
+        self.assertTrue(all(llm.closed for llm in built))
+        self.reload_profiles()
+        self.assertEqual(hw_tuner.get_tuned_settings(self.model_path), settings)
+
+    def test_cancelled_run_saves_nothing(self):
+        from Everything_else.cancellation import CancelToken
+        clock, built, cancel = FakeClock(), [], CancelToken()
+        build = self.loader(clock, built)
+
+        def loader(**kwargs):
+            if built:
+                cancel.cancel()
+            return build(**kwargs)
+        self.assertIsNone(hw_tuner.calibrate(self.model_path, loader=loader, clock=clock, cancel=cancel))
+        self.assertEqual(len(built), 2)
+        self.assertIsNone(hw_tuner.get_tuned_settings(self.model_path))
+
+
+class TestIdleCalibration(TunerTestCase):
+    """Test model_registry.calibrate_idle against a pool of fake models."""
+
+    def setUp(self):
+        super().setUp()
+        from Everything_else import model_registry
+        from Everything_else.model_config import ConfigStore
+        from Everything_else.fake_llama import FakeLoader, FakeProfile
+
+        config_path = os.path.join(self.tmp.name, "models.yaml")
+        with open(config_path, "w") as f:
+            f.write(f"models:\n  tuned:\n    path: '{self.model_path}'\n    n_ctx: 2048\n")
+        patches = [
+            mock.patch.object(model_registry, "CONFIG_STORE", ConfigStore(config_path)),
+            mock.patch.object(model_registry, "CALIBRATION_IDLE_S", 0.0),
+            mock.patch.dict(model_registry._PERSONAS, clear=True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.loader = FakeLoader(FakeProfile(prompt_tps=0, decode_tps=0))
+        model_registry.set_llama_loader(self.loader)
+        self.addCleanup(model_registry.set_llama_loader, None)
+        self.registry = model_registry
+        self.pool = model_registry.get_model_pool()
+        patch = mock.patch.object(self.pool, "ram_budget_bytes", 64 * 1024 ** 3)
+        patch.start()
+        self.addCleanup(patch.stop)
+        model_registry.acquire_llm("tuned")
+
+    def cancel_after(self, seconds):
+        from Everything_else.cancellation import CancelToken
+        cancel = CancelToken()
+        timer = threading.Timer(seconds, cancel.cancel)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        return cancel
+
+    def test_idle_pool_calibrates_loaded_model(self):
+        self.assertEqual(self.registry.calibrate_idle(), [self.model_path])
+        # One pooled instance plus the quick grid (two thread counts)
+        self.assertEqual(self.loader.loads, 3)
+        self.assertIsNotNone(hw_tuner.get_tuned_settings(self.model_path))
+        self.assertEqual(self.pool._reserved, {})
+        self.assertEqual(self.registry.calibrate_idle(), [])
+
+    def test_busy_pool_is_left_alone(self):
+        with self.registry.borrowed_llm("tuned"):
+            self.assertEqual(self.registry.calibrate_idle(self.cancel_after(0.3)), [])
+        self.assertEqual(self.loader.loads, 1)
+        self.assertIsNone(hw_tuner.get_tuned_settings(self.model_path))
+
+    def test_generation_interrupts_and_run_is_retried(self):
+        build = self.loader
+
+        def loader(**kwargs):
+            if build.loads == 1:
+                # A prompt arrives while the first calibration instance loads
+                self.registry.acquire_llm("tuned")
+            return build(**kwargs)
+        self.pool.loader = loader
+        self.assertEqual(self.registry.calibrate_idle(self.cancel_after(5)), [self.model_path])
+        # The interrupted run measured once and was thrown away
+        self.assertEqual(build.loads, 4)
+        self.assertIsNotNone(hw_tuner.get_tuned_settings(self.model_path))
+
+    def test_calibration_counts_against_the_budget(self):
+        self.pool.ram_budget_bytes = self.pool.used_bytes() + 1
+        self.assertEqual(self.registry.calibrate_idle(), [])
+        self.assertEqual(self.loader.loads, 1)
+
+    def test_council_workers_never_calibrate(self):
+        from Everything_else.council_scheduler import _init_worker
+        with mock.patch.object(self.registry, "AUTO_CALIBRATE", True), \
+                mock.patch.object(self.registry, "DAEMON_CLIENT_ENABLED", True), \
+                mock.patch.dict(self.registry.LOAD_OVERRIDES, clear=True):
+            _init_worker(None, threading.Event(), 2, self.pool.ram_budget_bytes)
+            self.assertEqual(self.registry.calibrate_idle(), [])
+        self.assertEqual(self.loader.loads, 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
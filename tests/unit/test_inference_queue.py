@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Inference Queue
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import threading
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+class Gate:
+    """A job body that blocks until released, recording when it ran."""
+
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, cancel):
+        self.log.append(self.name)
+        self.entered.set()
+        while not self.release.wait(0.01):
+            if cancel.cancelled:
+                self.log.append(f"{self.name} stopped")
+                return
+
+
+class TestInferenceQueue(unittest.TestCase):
+    """Test job order, queue positions and cancellation."""
+
+    def setUp(self):
+        from Everything_else.inference_queue import InferenceQueue
+        self.queue = InferenceQueue()
+        self.log = []
+
+    def tearDown(self):
+        self.queue.shutdown()
+
+    def job(self, name, **kwargs):
+        from Everything_else.inference_queue import InferenceJob
+        gate = Gate(name, self.log)
+        positions = []
+        job = InferenceJob(gate, on_position=positions.append, label=name, **kwargs)
+        return job, gate, positions
+
+    def test_jobs_run_one_at_a_time_in_order(self):
+        first, gate1, _ = self.job("first")
+        second, gate2, _ = self.job("second")
+        third, gate3, _ = self.job("third")
+        for job in (first, second, third):
+            self.queue.submit("jynx", job)
+        self.assertTrue(gate1.entered.wait(2))
+        self.assertFalse(gate2.entered.wait(0.05))
+        for gate in (gate1, gate2, gate3):
+            gate.release.set()
+        self.assertTrue(third.wait(2))
+        self.assertEqual(self.log, ["first", "second", "third"])
+        self.assertEqual(third.state, "done")
+
+    def test_interactive_jumps_background(self):
+        from Everything_else.inference_queue import PRIORITY_BACKGROUND
+        blocker, gate0, _ = self.job("blocker")
+        warmup, gate1, _ = self.job("warmup", priority=PRIORITY_BACKGROUND)
+        chat, gate2, _ = self.job("chat")
+        self.queue.submit("jynx", blocker)
+        self.assertTrue(gate0.entered.wait(2))
+        self.queue.submit("jynx", warmup)
+        self.queue.submit("jynx", chat)
+        for gate in (gate0, gate1, gate2):
+            gate.release.set()
+        self.assertTrue(warmup.wait(2))
+        self.assertEqual(self.log, ["blocker", "chat", "warmup"])
+
+    def test_positions_count_down(self):
+        first, gate1, _ = self.job("first")
+        second, gate2, positions = self.job("second")
+        self.queue.submit("jynx", first)
+        self.assertTrue(gate1.entered.wait(2))
+        self.queue.submit("jynx", second)
+        self.assertEqual(positions, [1])
+        gate1.release.set()
+        self.assertTrue(gate2.entered.wait(2))
+        gate2.release.set()
+        second.wait(2)
+        self.assertEqual(positions, [1, 0])
+
+    def test_cancelled_queued_job_is_skipped(self):
+        first, gate1, _ = self.job("first")
+        second, _, _ = self.job("second")
+        third, gate3, positions = self.job("third")
+        self.queue.submit("jynx", first)
+        self.assertTrue(gate1.entered.wait(2))
+        self.queue.submit("jynx", second)
+        self.queue.submit("jynx", third)
+        self.assertEqual(positions, [2])
+        second.cancel()
+        self.assertEqual(positions, [2, 1])
+        # Finished at once, not when the running job lets go of the worker
+        self.assertTrue(second.wait(0))
+        self.assertEqual(second.state, "cancelled")
+        gate1.release.set()
+        gate3.release.set()
+        self.assertTrue(third.wait(2))
+        self.assertEqual(self.log, ["first", "third"])
+        self.assertEqual(second.state, "cancelled")
+
+    def test_cancel_returns_while_a_long_job_runs(self):
+        import time
+        load, gate, _ = self.job("load")
+        prompt, _, _ = self.job("prompt")
+        self.queue.submit("jynx", load)
+        self.assertTrue(gate.entered.wait(2))
+        self.queue.submit("jynx", prompt)
+        started = time.perf_counter()
+        prompt.cancel()
+        self.assertTrue(prompt.wait(0))
+        self.assertLess(time.perf_counter() - started, 0.5)
+        # The load is untouched and still running
+        self.assertEqual(load.state, "running")
+        gate.release.set()
+        self.assertTrue(load.wait(2))
+        self.assertEqual(self.log, ["load"])
+
+    def test_cancel_stops_running_job(self):
+        job, gate, _ = self.job("long")
+        self.queue.submit("jynx", job)
+        self.assertTrue(gate.entered.wait(2))
+        job.cancel()
+        self.assertTrue(job.wait(2))
+        self.assertEqual((self.log, job.state), (["long", "long stopped"], "cancelled"))
+
+    def test_separate_weights_run_side_by_side(self):
+        a, gate_a, _ = self.job("a")
+        b, gate_b, _ = self.job("b")
+        self.queue.submit("jynx", a)
+        self.queue.submit("logic", b)
+        self.assertTrue(gate_a.entered.wait(2))
+        self.assertTrue(gate_b.entered.wait(2))
+        self.assertTrue(self.queue.busy())
+        self.queue.cancel_all()
+        self.assertTrue(a.wait(2) and b.wait(2))
+        self.assertFalse(self.queue.busy())
+
+    def test_failing_job_keeps_worker_alive(self):
+        from Everything_else.inference_queue import InferenceJob
+
+        def boom(cancel):
+            raise RuntimeError("bad weights")
+        self.queue.submit("jynx", InferenceJob(boom))
+        after, gate, _ = self.job("after")
+        gate.release.set()
+        self.queue.submit("jynx", after)
+        self.assertTrue(after.wait(2))
+        self.assertEqual(self.log, ["after"])
+
+    def test_submit_after_shutdown_fails(self):
+        worker = self.queue.worker("jynx")
+        worker.shutdown()
+        job, _, _ = self.job("late")
+        with self.assertRaises(RuntimeError):
+            worker.submit(job)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Inference Telemetry
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import time
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+
+def fake_stream(tokens, delay=0.0):
+    for token in tokens:
+        time.sleep(delay)
+        yield {"choices": [{"text": token}]}
+
+
+class TestInferenceTelemetry(unittest.TestCase):
+    """Test per-call metric collection and the ring buffer."""
+
+    def test_stream_metrics_recorded(self):
+        from inference_telemetry import TelemetryRecorder
+        recorder = TelemetryRecorder()
+        metrics = {"kind": "call", "model_id": "m"}
+        out = list(recorder.track_stream(fake_stream(["a", "b", "c"], 0.01), metrics, time.perf_counter()))
+        self.assertEqual(len(out), 3)
+        record = recorder.recent("call")[0]
+        self.assertEqual(record["completion_tokens"], 3)
+        self.assertGreater(record["ttft_s"], 0)
+        self.assertGreater(record["decode_tps"], 0)
+
+    def test_prompt_eval_without_counters_is_an_estimate(self):
+        from inference_telemetry import TelemetryRecorder
+        recorder = TelemetryRecorder()
+        metrics = {"kind": "call", "model_id": "m"}
+        list(recorder.track_stream(fake_stream(["a", "b"], 0.01), metrics, time.perf_counter()))
+        record = recorder.recent("call")[0]
+        self.assertNotIn("prompt_eval_s", record)
+        self.assertGreaterEqual(record["prompt_eval_est_s"], 0)
+
+    def test_measured_prompt_eval_is_kept(self):
+        from inference_telemetry import TelemetryRecorder, measure_prompt_eval
+        self.assertIsNone(measure_prompt_eval(object()))
+        recorder = TelemetryRecorder()
+        metrics = {"kind": "call", "model_id": "m", "prompt_eval_s": 0.25}
+        list(recorder.track_stream(fake_stream(["a", "b"]), metrics, time.perf_counter()))
+        record = recorder.recent("call")[0]
+        self.assertEqual(record["prompt_eval_s"], 0.25)
+        self.assertNotIn("prompt_eval_est_s", record)
+
+    def test_early_close_still_records(self):
+        from inference_telemetry import TelemetryRecorder
+        recorder = TelemetryRecorder()
+        stream = recorder.track_stream(fake_stream(["a", "b", "c"]), {"kind": "call", "model_id": "m"},
+                                       time.perf_counter())
+        next(stream)
+        stream.close()
+        self.assertEqual(recorder.recent("call")[0]["completion_tokens"], 1)
+
+    def test_ring_buffer_is_bounded(self):
+        from inference_telemetry import TelemetryRecorder
+        recorder = TelemetryRecorder(ring_size=3)
+        for i in range(5):
+            recorder.record({"kind": "call", "model_id": str(i)})
+        self.assertEqual([r["model_id"] for r in recorder.recent()], ["2", "3", "4"])
+
+    def test_perf_report_summarises(self):
+        import inference_telemetry
+        inference_telemetry.TELEMETRY.clear()
+        self.assertIn("No inference calls", inference_telemetry.perf_report())
+        inference_telemetry.TELEMETRY.record({"kind": "call", "model_id": "jynx_default",
+                                              "ttft_s": 0.5, "decode_tps": 9.0})
+        self.assertIn("jynx_default", inference_telemetry.perf_report())
+
+    def test_perf_report_marks_estimates(self):
+        import inference_telemetry
+        inference_telemetry.TELEMETRY.clear()
+        inference_telemetry.TELEMETRY.record({"kind": "call", "model_id": "m", "prompt_eval_est_s": 0.4})
+        self.assertIn("~0.40s (est.)", inference_telemetry.perf_report())
+        inference_telemetry.TELEMETRY.record({"kind": "call", "model_id": "m", "prompt_eval_s": 0.3})
+        self.assertNotIn("est.", inference_telemetry.perf_report())
+        inference_telemetry.TELEMETRY.clear()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Model Configuration
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+YAML_V1 = """
+pool:
+  ram_budget_gb: 12
+models:
+  good:
+    name: "Good"
+    path: 'model.gguf'
+    temperature: 0.4
+    max_tokens: 512
+  bad:
+    path: 'model.gguf'
+    temperature: "hot"
+"""
+
+YAML_V2 = YAML_V1.replace("temperature: 0.4", "temperature: 0.9")
+
+
+class TestModelConfig(unittest.TestCase):
+    """Test validation and mtime-based reloading of models.yaml."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "models.yaml")
+        self._write(YAML_V1, mtime=1_000_000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, text, mtime):
+        with open(self.path, "w") as f:
+            f.write(text)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_valid_entry_is_typed_and_dict_compatible(self):
+        from model_config import ConfigStore
+        config = ConfigStore(self.path).get("good")
+        self.assertEqual(config.temperature, 0.4)
+        self.assertEqual(config.get("max_tokens"), 512)
+        self.assertEqual(config["name"], "Good")
+        self.assertEqual(config.get("missing", 7), 7)
+
+    def test_invalid_entry_reported_at_load(self):
+        from model_config import ConfigStore, ConfigError
+        store = ConfigStore(self.path)
+        self.assertTrue(any(p.startswith("bad:") for p in store.problems()))
+        with self.assertRaises(ConfigError):
+            store.get("bad")
+
+    def test_unknown_model_raises_value_error(self):
+        from model_config import ConfigStore
+        with self.assertRaises(ValueError):
+            ConfigStore(self.path).get("nope")
+
+    def test_sections_available(self):
+        from model_config import ConfigStore
+        self.assertEqual(ConfigStore(self.path).section("pool")["ram_budget_gb"], 12)
+
+    def test_reloads_when_mtime_changes(self):
+        from model_config import ConfigStore
+        store = ConfigStore(self.path)
+        reloads = []
+        store.on_reload(lambda: reloads.append(True))
+        self.assertEqual(store.get("good").temperature, 0.4)
+        self._write(YAML_V2, mtime=1_000_100)
+        self.assertEqual(store.get("good").temperature, 0.9)
+        self.assertEqual(len(reloads), 2)
+
+    def test_stray_keys_in_prompt_warned(self):
+        from model_config import validate_entry
+        errors, warnings = validate_entry("x", {"path": "m.gguf", "system_prompt": "Hi\n    max_tokens: 10\n"})
+        self.assertFalse(errors)
+        self.assertTrue(any("indentation" in w for w in warnings))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Model Daemon
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from Everything_else import model_daemon, model_registry
+
+
+class EchoPersona:
+    """Replies with the prompt, streamed a word at a time when asked to."""
+    pool_key = "echo"
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def __call__(self, prompt, stream_override=None, **kwargs):
+        if prompt == "fail":
+            raise ValueError("bad prompt")
+        if not stream_override:
+            return {"choices": [{"text": prompt}]}
+        return self._stream(prompt)
+
+    def _stream(self, prompt):
+        try:
+            for word in prompt.split():
+                yield {"choices": [{"text": word}]}
+        finally:
+            self.closed.set()
+
+
+class FakeRegistry:
+    """What the daemon calls in model_registry, without any weights."""
+
+    def __init__(self):
+        self.persona = EchoPersona()
+        self.loaded = []
+
+    def get_local_persona(self, model_id):
+        return self.persona
+
+    def acquire_llm(self, model_id):
+        self.loaded.append(model_id)
+
+    def get_model_pool(self):
+        return mock.Mock(stats=lambda: {"loaded": len(self.loaded)})
+
+
+class DaemonTestCase(unittest.TestCase):
+    """A daemon on a socket in a private temporary directory."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.socket_dir = os.path.join(self.tmp.name, "run")
+        self.socket_path = os.path.join(self.socket_dir, "jynx.sock")
+        patch = mock.patch.object(model_registry, "DAEMON_CLIENT_ENABLED", True)
+        patch.start()
+        self.addCleanup(patch.stop)
+        model_daemon._availability.clear()
+        self.addCleanup(model_daemon._availability.clear)
+
+    def start_daemon(self):
+        daemon = model_daemon.ModelDaemon(self.socket_path)
+        daemon.registry = FakeRegistry()
+        # In real use the daemon is another process; this one stays a client
+        model_registry.DAEMON_CLIENT_ENABLED = True
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+
+        def stop():
+            daemon.shutdown()
+            daemon.server_close()
+            thread.join(2)
+        self.addCleanup(stop)
+        return daemon
+
+    def stop_daemon(self, daemon):
+        daemon.shutdown()
+        daemon.server_close()
+        os.remove(self.socket_path)
+
+
+class TestProtocol(DaemonTestCase):
+    """Test single-reply requests over the socket."""
+
+    def test_ping_and_stats(self):
+        daemon = self.start_daemon()
+        self.assertEqual(model_daemon.daemon_request({"op": "ping"}, self.socket_path)["pid"], os.getpid())
+        model_daemon.daemon_request({"op": "load", "model_id": "jynx_default"}, self.socket_path)
+        self.assertEqual(daemon.registry.loaded, ["jynx_default"])
+        stats = model_daemon.daemon_request({"op": "stats"}, self.socket_path)
+        self.assertEqual(stats["pool"], {"loaded": 1})
+
+    def test_unknown_op_is_an_error(self):
+        self.start_daemon()
+        with self.assertRaisesRegex(model_daemon.DaemonError, "Unknown op"):
+            model_daemon.daemon_request({"op": "format_disk"}, self.socket_path)
+
+    def test_socket_is_private(self):
+        self.start_daemon()
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+        self.assertEqual(os.stat(self.socket_dir).st_mode & 0o777, 0o700)
+
+    def test_second_daemon_refuses_a_live_socket(self):
+        self.start_daemon()
+        with self.assertRaisesRegex(model_daemon.DaemonError, "already listening"):
+            model_daemon.ModelDaemon(self.socket_path)
+
+
+class TestSocketDirectory(DaemonTestCase):
+    """Test refusing socket directories other users could tamper with."""
+
+    def test_open_directory_is_refused(self):
+        os.makedirs(self.socket_dir, mode=0o755)
+        os.chmod(self.socket_dir, 0o755)
+        with self.assertRaisesRegex(model_daemon.DaemonError, "mode 755"):
+            model_daemon.ModelDaemon(self.socket_path)
+        with self.assertRaisesRegex(model_daemon.DaemonError, "mode 755"):
+            model_daemon.daemon_request({"op": "ping"}, self.socket_path)
+
+    def test_directory_of_another_user_is_refused(self):
+        self.start_daemon()
+        with mock.patch.object(model_daemon.os, "getuid", return_value=os.getuid() + 1):
+            with self.assertRaisesRegex(model_daemon.DaemonError, "owned by uid"):
+                model_daemon.daemon_request({"op": "ping"}, self.socket_path)
+            self.assertFalse(model_daemon.daemon_available(self.socket_path))
+
+    def test_symlinked_directory_is_refused(self):
+        real = os.path.join(self.tmp.name, "real")
+        os.makedirs(real, mode=0o700)
+        os.symlink(real, self.socket_dir)
+        with self.assertRaisesRegex(model_daemon.DaemonError, "not a directory"):
+            model_daemon.ModelDaemon(self.socket_path)
+
+
+class TestRemotePersona(DaemonTestCase):
+    """Test generation through the daemon."""
+
+    def persona(self, stream):
+        return model_daemon.RemotePersona("jynx_default", {"stream": stream}, [], self.socket_path)
+
+    def test_blocking_call_returns_the_result(self):
+        self.start_daemon()
+        result = self.persona(stream=False)("hello there")
+        self.assertEqual(result["choices"][0]["text"], "hello there")
+
+    def test_stream_yields_chunks(self):
+        self.start_daemon()
+        chunks = list(self.persona(stream=True)("one two three", stream_override=True))
+        self.assertEqual([c["choices"][0]["text"] for c in chunks], ["one", "two", "three"])
+
+    def test_cancel_closes_the_daemon_generator(self):
+        from Everything_else.cancellation import CancelToken
+        daemon = self.start_daemon()
+        cancel = CancelToken()
+        stream = self.persona(stream=True)(" ".join(["word"] * 100000), stream_override=True, cancel=cancel)
+        next(stream)
+        cancel.cancel()
+        self.assertEqual(list(stream), [])
+        self.assertTrue(daemon.registry.persona.closed.wait(2))
+
+    def test_daemon_errors_reach_the_caller(self):
+        self.start_daemon()
+        with self.assertRaisesRegex(model_daemon.DaemonError, "bad prompt"):
+            self.persona(stream=False)("fail")
+
+
+class TestFallback(DaemonTestCase):
+    """Test use_daemon() caching and falling back to in-process personas."""
+
+    def setUp(self):
+        super().setUp()
+        section = model_registry.CONFIG_STORE.section
+
+        def with_daemon(name):
+            if name == "daemon":
+                return {"enabled": True, "socket": self.socket_path}
+            return section(name)
+        patch = mock.patch.object(model_registry.CONFIG_STORE, "section", side_effect=with_daemon)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_no_daemon_means_local_persona(self):
+        self.assertFalse(model_registry.use_daemon())
+        persona = model_registry.get_persona("jynx_default")
+        self.assertIsInstance(persona, model_registry.Persona)
+
+    def test_ping_is_reused_within_the_ttl(self):
+        self.start_daemon()
+        with mock.patch.object(model_daemon, "_ping", wraps=model_daemon._ping) as ping:
+            for _ in range(5):
+                self.assertTrue(model_registry.use_daemon())
+            self.assertEqual(ping.call_count, 1)
+            with mock.patch.object(model_daemon.time, "monotonic",
+                                   return_value=model_daemon.time.monotonic() + model_daemon.DAEMON_CHECK_TTL_S):
+                self.assertTrue(model_registry.use_daemon())
+            self.assertEqual(ping.call_count, 2)
+        self.assertIsInstance(model_registry.get_persona("jynx_default"), model_daemon.RemotePersona)
+
+    def test_stopped_daemon_falls_back_to_local(self):
+        daemon = self.start_daemon()
+        remote = model_registry.get_persona("jynx_default")
+        self.assertIsInstance(remote, model_daemon.RemotePersona)
+        self.stop_daemon(daemon)
+        with self.assertRaises(OSError):
+            model_daemon.daemon_request({"op": "ping"}, remote.socket_path)
+        # The failed connection dropped the cached ping
+        self.assertFalse(model_registry.use_daemon())
+        self.assertIsInstance(model_registry.get_persona("jynx_default"), model_registry.Persona)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
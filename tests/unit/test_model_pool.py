@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Model Pool
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+
+class FakeLlama:
+    """Stand-in for llama_cpp.Llama that records load/close calls."""
+    loads = 0
+
+    def __init__(self, **kwargs):
+        FakeLlama.loads += 1
+        self.kwargs = kwargs
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+GB = 1024 ** 3
+
+
+class TestModelPool(unittest.TestCase):
+    """Test LRU reuse, eviction, pinning and in-use protection."""
+
+    def setUp(self):
+        FakeLlama.loads = 0
+
+    def _pool(self, budget_gb):
+        from model_pool import ModelPool
+        return ModelPool(loader=FakeLlama, ram_budget_bytes=budget_gb * GB)
+
+    def test_same_key_reuses_instance(self):
+        from model_pool import make_pool_key
+        pool = self._pool(10)
+        key = make_pool_key("a.gguf", 4096, -1, False)
+        first = pool.acquire(key, {"model_path": "a.gguf"}, 4 * GB)
+        second = pool.acquire(key, {"model_path": "a.gguf"}, 4 * GB)
+        self.assertIs(first, second)
+        self.assertEqual(FakeLlama.loads, 1)
+
+    def test_different_ctx_is_separate_instance(self):
+        from model_pool import make_pool_key
+        pool = self._pool(10)
+        a = pool.acquire(make_pool_key("a.gguf", 4096, -1, False), {}, 1 * GB)
+        b = pool.acquire(make_pool_key("a.gguf", 2048, -1, False), {}, 1 * GB)
+        self.assertIsNot(a, b)
+
+    def test_lru_eviction_over_budget(self):
+        from model_pool import make_pool_key
+        pool = self._pool(8)
+        key_a = make_pool_key("a.gguf", 4096, -1, False)
+        key_b = make_pool_key("b.gguf", 4096, -1, False)
+        key_c = make_pool_key("c.gguf", 4096, -1, False)
+        a = pool.acquire(key_a, {}, 4 * GB)
+        pool.acquire(key_b, {}, 4 * GB)
+        pool.acquire(key_a, {}, 4 * GB)   # a becomes most recent
+        pool.acquire(key_c, {}, 4 * GB)   # b must go
+        self.assertFalse(pool.contains(key_b))
+        self.assertTrue(pool.contains(key_a))
+        self.assertFalse(a.closed)
+
+    def test_pinned_entry_survives_eviction(self):
+        from model_pool import make_pool_key
+        pool = self._pool(4)
+        key_a = make_pool_key("a.gguf", 4096, -1, False)
+        key_b = make_pool_key("b.gguf", 4096, -1, False)
+        a = pool.acquire(key_a, {}, 4 * GB, pin=True)
+        pool.acquire(key_b, {}, 4 * GB)
+        self.assertTrue(pool.contains(key_a))
+        self.assertFalse(a.closed)
+
+    def test_borrowed_entry_is_evicted_after_release(self):
+        from model_pool import make_pool_key
+        pool = self._pool(6)
+        key_a = make_pool_key("a.gguf", 4096, -1, False)
+        key_b = make_pool_key("b.gguf", 4096, -1, False)
+        a = pool.acquire(key_a, {}, 4 * GB, borrow=True)
+        b = pool.acquire(key_b, {}, 4 * GB)
+        self.assertFalse(a.closed)
+        self.assertTrue(pool.contains(key_a) and pool.contains(key_b))
+        # Over budget while a was busy; the release settles it
+        pool.release(key_a)
+        self.assertTrue(a.closed)
+        self.assertFalse(b.closed)
+
+    def test_entry_with_held_decode_lock_is_skipped(self):
+        import threading
+        from model_pool import make_pool_key
+        pool = self._pool(6)
+        key_a = make_pool_key("a.gguf", 4096, -1, False)
+        key_b = make_pool_key("b.gguf", 4096, -1, False)
+        a = pool.acquire(key_a, {}, 4 * GB)
+        locked, done = threading.Event(), threading.Event()
+
+        def decode():
+            with pool.decode_lock(key_a):
+                locked.set()
+                done.wait(5)
+        thread = threading.Thread(target=decode)
+        thread.start()
+        locked.wait(5)
+        pool.acquire(key_b, {}, 4 * GB)
+        self.assertFalse(a.closed)
+        done.set()
+        thread.join()
+
+    def test_decode_lock_holder_does_not_evict_its_own_model(self):
+        from model_pool import make_pool_key
+        pool = self._pool(6)
+        key_a = make_pool_key("a.gguf", 4096, -1, False)
+        key_b = make_pool_key("b.gguf", 4096, -1, False)
+        a = pool.acquire(key_a, {}, 4 * GB)
+        with pool.decode_lock(key_a):
+            # Same thread, as when a batched round resolves another persona
+            pool.acquire(key_b, {}, 4 * GB)
+            self.assertFalse(pool.evict(key_a))
+            self.assertEqual(pool.clear(), 1)
+            self.assertFalse(a.closed)
+        self.assertTrue(pool.evict(key_a))
+        self.assertTrue(a.closed)
+
+    def test_evict_skips_borrowed_entry(self):
+        from model_pool import make_pool_key
+        pool = self._pool(10)
+        key = make_pool_key("a.gguf", 4096, -1, False)
+        a = pool.acquire(key, {}, 4 * GB, borrow=True)
+        self.assertFalse(pool.evict(key))
+        pool.release(key)
+        self.assertTrue(pool.evict(key))
+        self.assertTrue(a.closed)
+
+    def test_loads_in_flight_count_against_budget(self):
+        import threading
+        from model_pool import ModelPool, make_pool_key
+        gate = threading.Event()
+
+        def slow_loader(**kwargs):
+            gate.wait(5)
+            return FakeLlama(**kwargs)
+        pool = ModelPool(loader=slow_loader, ram_budget_bytes=10 * GB)
+        key_a = make_pool_key("a.gguf", 4096, -1, False)
+        thread = threading.Thread(target=pool.acquire, args=(key_a, {}, 6 * GB))
+        thread.start()
+        for _ in range(500):
+            if pool._reserved:
+                break
+            gate.wait(0.01)
+        # The 6 GB load in flight counts, so a second 6 GB model no longer fits
+        self.assertEqual(pool.used_bytes(), 6 * GB)
+        self.assertGreater(pool.used_bytes() + 6 * GB, pool.ram_budget_bytes)
+        gate.set()
+        thread.join()
+        self.assertEqual(pool.used_bytes(), 6 * GB)
+
+    def test_clear_keeps_pinned(self):
+        from model_pool import make_pool_key
+        pool = self._pool(10)
+        pool.acquire(make_pool_key("a.gguf", 4096, -1, False), {}, 1 * GB, pin=True)
+        pool.acquire(make_pool_key("b.gguf", 4096, -1, False), {}, 1 * GB)
+        self.assertEqual(pool.clear(), 1)
+        self.assertEqual(len(pool.stats()), 1)
+
+    def test_prefetch_loads_in_background_when_it_fits(self):
+        from model_pool import make_pool_key
+        pool = self._pool(10)
+        key = make_pool_key("a.gguf", 4096, -1, False)
+        thread = pool.prefetch(key, {}, 4 * GB)
+        thread.join(timeout=5)
+        self.assertTrue(pool.contains(key))
+        pool.acquire(key, {}, 4 * GB)
+        self.assertEqual(FakeLlama.loads, 1)
+
+    def test_prefetch_skips_resident_model(self):
+        from model_pool import make_pool_key
+        pool = self._pool(10)
+        key = make_pool_key("a.gguf", 4096, -1, False)
+        pool.acquire(key, {}, 4 * GB)
+        self.assertIsNone(pool.prefetch(key, {}, 4 * GB))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
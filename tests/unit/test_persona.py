@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Personas
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+MODELS_YAML = """
+models:
+  council_logic:
+    name: "Logic Expert"
+    path: 'mistral-7b-instruct-v0.2.Q4_K_M.gguf'
+    system_prompt: |
+      You reason step by step.
+    temperature: 0.4
+    stream: false
+
+  council_math:
+    name: "Math Expert"
+    path: 'mistral-7b-instruct-v0.2.Q4_K_M.gguf'
+    system_prompt: |
+      You solve equations.
+    temperature: 0.5
+    stream: false
+
+  council_judge:
+    name: "Judge"
+    path: 'qwen2-1.5b-instruct.Q4_K_M.gguf'
+    system_prompt: |
+      You pick the best answer.
+    stream: false
+"""
+
+
+class TestPersonas(unittest.TestCase):
+    """Test council roles sharing one pooled Llama with their own prompts."""
+
+    def setUp(self):
+        from Everything_else import model_registry
+        from Everything_else.model_config import ConfigStore
+        from Everything_else.prompt_cache import PromptStateCache
+        from Everything_else.fake_llama import FakeLoader, FakeProfile
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        path = os.path.join(self.tmp.name, "models.yaml")
+        with open(path, "w") as f:
+            f.write(MODELS_YAML)
+
+        patches = [
+            mock.patch.object(model_registry, "CONFIG_STORE", ConfigStore(path)),
+            mock.patch.object(model_registry, "_PROMPT_CACHE",
+                              PromptStateCache(cache_dir=os.path.join(self.tmp.name, "states"))),
+            mock.patch.dict(model_registry._PERSONAS, clear=True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.loader = FakeLoader(FakeProfile(prompt_tps=0, decode_tps=0, reply_tokens=5))
+        model_registry.set_llama_loader(self.loader)
+        self.addCleanup(model_registry.set_llama_loader, None)
+        self.registry = model_registry
+
+    def test_roles_on_one_file_share_a_pool_entry(self):
+        logic = self.registry.get_persona("council_logic")
+        math = self.registry.get_persona("council_math")
+        judge = self.registry.get_persona("council_judge")
+        self.assertTrue(logic.shares_weights_with(math))
+        self.assertFalse(logic.shares_weights_with(judge))
+        # Resolving personas loads nothing
+        self.assertEqual(self.loader.loads, 0)
+
+    def test_switching_roles_reuses_the_loaded_llama(self):
+        from Everything_else.fake_llama import FakeLlama
+        logic = self.registry.get_persona("council_logic")
+        math = self.registry.get_persona("council_math")
+
+        with mock.patch.object(FakeLlama, "__call__", autospec=True, side_effect=FakeLlama.__call__) as call:
+            logic("Is every square a rectangle?")
+            math("What is 2 + 2?")
+            logic("And every rectangle a square?")
+
+        self.assertEqual(self.loader.loads, 1)
+        llms = {c.args[0] for c in call.call_args_list}
+        self.assertEqual(llms, set(self.loader.instances))
+        prompts = [c.kwargs["prompt"] for c in call.call_args_list]
+        self.assertIn("You reason step by step.", prompts[0])
+        self.assertNotIn("You solve equations.", prompts[0])
+        self.assertIn("You solve equations.", prompts[1])
+        self.assertIn("What is 2 + 2?", prompts[1])
+        self.assertEqual([c.kwargs["temperature"] for c in call.call_args_list], [0.4, 0.5, 0.4])
+
+    def test_each_persona_uses_its_own_template(self):
+        from Everything_else.fake_llama import FakeLlama
+        logic = self.registry.get_persona("council_logic")
+        judge = self.registry.get_persona("council_judge")
+        self.assertEqual((logic.template, judge.template), ("inst", "chatml"))
+        self.assertIn("[INST]", logic.prefix)
+
+        with mock.patch.object(FakeLlama, "create_chat_completion", autospec=True,
+                               side_effect=FakeLlama.create_chat_completion) as chat:
+            judge("Which answer is best?")
+        messages = chat.call_args.kwargs["messages"]
+        self.assertEqual(messages[0], {"role": "system", "content": "You pick the best answer.\n"})
+        self.assertEqual(messages[-1], {"role": "user", "content": "Which answer is best?"})
+        self.assertEqual(self.loader.loads, 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Prompt State Cache
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+
+class FakeLlama:
+    """Character-level tokenizer with a KV cache made of Python lists."""
+
+    def __init__(self):
+        self.input_ids = []
+        self.n_tokens = 0
+        self.evaluated = 0
+
+    def tokenize(self, data, special=False):
+        return list(data)
+
+    def reset(self):
+        self.n_tokens = 0
+
+    def eval(self, tokens):
+        self.input_ids = self.input_ids[:self.n_tokens] + list(tokens)
+        self.n_tokens = len(self.input_ids)
+        self.evaluated += len(tokens)
+
+    def save_state(self):
+        return {"input_ids": list(self.input_ids[:self.n_tokens])}
+
+    def load_state(self, state):
+        self.input_ids = list(state["input_ids"])
+        self.n_tokens = len(self.input_ids)
+
+
+class Planted:
+    """Pickles to a call that creates `marker`, like a hostile cache file would."""
+
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __reduce__(self):
+        return (open, (self.marker, "w"))
+
+
+class TestPromptStateCache(unittest.TestCase):
+    """Test saving, restoring and evicting prompt states."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_depends_on_system_prompt(self):
+        from prompt_cache import PromptStateCache
+        a = PromptStateCache.make_key(("m.gguf", 4096), "inst", "You are A.")
+        b = PromptStateCache.make_key(("m.gguf", 4096), "inst", "You are B.")
+        self.assertNotEqual(a, b)
+
+    def test_first_prime_saves_then_fresh_context_restores(self):
+        from prompt_cache import PromptStateCache
+        cache = PromptStateCache(self.tmp.name)
+        key = cache.make_key(("m.gguf", 4096), "inst", "sys")
+
+        first = FakeLlama()
+        self.assertEqual(cache.prime(first, key, "[INST] sys [/INST]"), "saved")
+
+        second = FakeLlama()
+        self.assertEqual(cache.prime(second, key, "[INST] sys [/INST]"), "restored")
+        self.assertEqual(second.evaluated, 0)
+
+    def test_resident_prefix_is_a_hit(self):
+        from prompt_cache import PromptStateCache
+        cache = PromptStateCache(self.tmp.name)
+        llm = FakeLlama()
+        cache.prime(llm, "k", "prefix")
+        self.assertEqual(cache.prime(llm, "k", "prefix"), "hit")
+
+    def test_eviction_respects_size_cap(self):
+        from prompt_cache import PromptStateCache
+        cache = PromptStateCache(self.tmp.name, max_bytes=1)
+        cache.save("a", {"blob": b"x" * 100})
+        cache.save("b", {"blob": b"y" * 100})
+        files = [f for f in os.listdir(self.tmp.name) if f.endswith(".state")]
+        self.assertLessEqual(len(files), 1)
+
+    def test_state_fields_round_trip(self):
+        from prompt_cache import PromptStateCache
+        cache = PromptStateCache(self.tmp.name)
+        state = {"input_ids": [1, 2, 3], "n_tokens": 3, "llama_state": b"\0kv\xff", "seed": -1}
+        cache.save("k", state)
+        self.assertEqual(cache.load("k"), state)
+
+    def test_pickled_file_is_discarded_not_loaded(self):
+        import pickle
+        from prompt_cache import PromptStateCache
+        cache = PromptStateCache(self.tmp.name)
+        marker = os.path.join(self.tmp.name, "ran")
+        path = os.path.join(self.tmp.name, "k.state")
+        with open(path, "wb") as f:
+            pickle.dump(Planted(marker), f)
+        self.assertIsNone(cache.load("k"))
+        self.assertFalse(os.path.exists(marker))
+        self.assertFalse(os.path.exists(path))
+
+    def test_unsupported_state_is_refused(self):
+        from prompt_cache import PromptStateCache
+        cache = PromptStateCache(self.tmp.name)
+        with self.assertRaises(TypeError):
+            cache.save("k", {"input_ids": object()})
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
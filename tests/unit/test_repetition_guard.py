@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Repetition Guard
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+VARIED = ("Boil water for one minute before drinking it. Store fuel away from the tent. "
+          "Keep a paper map because phones die in the cold. Tell someone your route and "
+          "the day you expect to return. Pack layers rather than one heavy coat.")
+
+
+def feed_words(guard, text):
+    """Stream `text` a word at a time, like a model would."""
+    for i, word in enumerate(text.split(" ")):
+        if guard.feed(word + " "):
+            return i + 1
+    return None
+
+
+def stream_of(text):
+    for word in text.split(" "):
+        yield {"choices": [{"text": word + " "}]}
+
+
+class TestRepetitionGuard(unittest.TestCase):
+    """Test loop detection and the streaming wrapper."""
+
+    def test_varied_text_passes(self):
+        from Everything_else.repetition_guard import RepetitionGuard
+        self.assertIsNone(feed_words(RepetitionGuard(), VARIED))
+
+    def test_repeated_sentence_is_stopped(self):
+        from Everything_else.repetition_guard import RepetitionGuard
+        looping = VARIED + " " + "You must stay calm and think about the next step. " * 20
+        stopped_at = feed_words(RepetitionGuard(), looping)
+        self.assertIsNotNone(stopped_at)
+        # Caught within the third repeat, not after twenty
+        self.assertLess(stopped_at, len(VARIED.split()) + 10 * 3)
+
+    def test_single_word_loop_and_blank_run(self):
+        from Everything_else.repetition_guard import RepetitionGuard
+        self.assertIsNotNone(feed_words(RepetitionGuard(), "the " * 60))
+        guard = RepetitionGuard()
+        self.assertFalse(guard.feed("Hello there"))
+        self.assertTrue(any(guard.feed("\n") for _ in range(300)))
+
+    def test_long_words_are_not_a_gap(self):
+        from Everything_else.repetition_guard import RepetitionGuard
+        guard = RepetitionGuard()
+        blob = "aGVsbG8gd29ybGQ" * 40
+        url = "https://example.org/" + "/".join(f"section{i}" for i in range(60))
+        for text in ("Download it from ", url, " and check ", blob, " then go on."):
+            self.assertFalse(guard.feed(text))
+        # Punctuation broken up by words never adds up either
+        self.assertFalse(any(guard.feed("=" * 150 + " ok ") for _ in range(5)))
+        self.assertTrue(guard.feed("=" * 250))
+
+    def test_min_words_delays_stop(self):
+        from Everything_else.repetition_guard import RepetitionGuard
+        guard = RepetitionGuard(ngram=2, max_repeats=2, min_words=50)
+        self.assertIsNone(feed_words(guard, "go on " * 20))
+
+    def test_settings_per_model(self):
+        from Everything_else.repetition_guard import guard_settings, DEFAULTS
+        self.assertEqual(guard_settings({}), DEFAULTS)
+        self.assertIsNone(guard_settings({"repetition": False}))
+        self.assertEqual(guard_settings({"repetition": {"ngram": 5}})["ngram"], 5)
+
+    def test_guarded_stream_records_tokens_saved(self):
+        from Everything_else.repetition_guard import RepetitionGuard, guarded
+        metrics = {}
+        text = "again and again and again " * 40
+        chunks = list(guarded(stream_of(text), RepetitionGuard(), metrics, max_tokens=400))
+        self.assertTrue(metrics["repetition_stop"])
+        self.assertLess(len(chunks), 60)
+        self.assertEqual(metrics["tokens_saved"], 400 - len(chunks))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Speculative Decoding
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+
+class FixedDraft:
+    """Always guesses the same continuation."""
+
+    def __init__(self, guess):
+        self.guess = guess
+
+    def __call__(self, input_ids, **kwargs):
+        return list(self.guess)
+
+
+class TestSpeculative(unittest.TestCase):
+    """Test draft settings, acceptance tracking and reporting."""
+
+    def test_draft_spec_forms(self):
+        from speculative import draft_spec, draft_key
+        self.assertIsNone(draft_spec({}))
+        self.assertEqual(draft_spec({"draft": "prompt_lookup"}), {"type": "prompt_lookup", "tokens": 10})
+        spec = draft_spec({"draft": {"model": "tiny.gguf", "tokens": 4}})
+        self.assertEqual(spec["type"], "model")
+        self.assertTrue(spec["path"].endswith(os.path.join("models", "tiny.gguf")))
+        self.assertNotEqual(draft_key(spec), draft_key(draft_spec({"draft": "prompt_lookup"})))
+        with self.assertRaises(ValueError):
+            draft_spec({"draft": "medusa"})
+
+    def test_draft_changes_pool_key(self):
+        from model_pool import make_pool_key
+        self.assertNotEqual(make_pool_key("a.gguf", 4096, -1, False),
+                            make_pool_key("a.gguf", 4096, -1, False, "prompt_lookup:10"))
+
+    def test_tracker_counts_accepted_guesses(self):
+        from speculative import DraftTracker
+        tracker = DraftTracker(FixedDraft([7, 8, 9]), "prompt_lookup")
+        metrics = {}
+        finish = tracker.measure(metrics)
+
+        tracker([1, 2, 3])
+        # Target kept 7 and 8, then sampled 5 instead of 9
+        tracker([1, 2, 3, 7, 8, 5])
+        # Nothing from the second guess matched
+        tracker([1, 2, 3, 7, 8, 5, 4])
+        finish(metrics)
+
+        self.assertEqual(metrics["draft"], "prompt_lookup")
+        self.assertEqual(metrics["draft_proposed"], 9)
+        self.assertEqual(metrics["draft_accepted"], 2)
+        self.assertEqual(metrics["draft_passes"], 3)
+
+    def test_new_call_does_not_score_against_old_prompt(self):
+        from speculative import DraftTracker
+        tracker = DraftTracker(FixedDraft([7]), "prompt_lookup")
+        tracker.measure({})
+        tracker([1])
+        metrics = {}
+        finish = tracker.measure(metrics)
+        tracker([1, 7])
+        finish(metrics)
+        self.assertEqual(metrics["draft_accepted"], 0)
+
+    def test_perf_report_shows_speedup(self):
+        from inference_telemetry import TELEMETRY, perf_report
+        TELEMETRY.clear()
+        TELEMETRY.record({"kind": "call", "model_id": "jynx_default", "decode_tps": 10.0,
+                          "completion_tokens": 30, "draft": "prompt_lookup",
+                          "draft_proposed": 40, "draft_accepted": 20, "draft_passes": 10})
+        TELEMETRY.record({"kind": "call", "model_id": "jynx_default", "decode_tps": 5.0,
+                          "completion_tokens": 30})
+        report = perf_report()
+        TELEMETRY.clear()
+        self.assertIn("speculative (prompt_lookup): 50% of drafted tokens accepted, 3.00 tokens per pass", report)
+        self.assertIn("vs 5.00 tok/s without", report)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
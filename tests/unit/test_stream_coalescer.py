@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Stream Coalescer
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStreamCoalescer(unittest.TestCase):
+    """Test token frame batching."""
+
+    def setUp(self):
+        from ui.stream_coalescer import TokenCoalescer
+        self.frames = []
+        self.clock = FakeClock()
+        self.make = lambda **kw: TokenCoalescer(self.frames.append, clock=self.clock, **kw)
+
+    def test_first_token_is_not_delayed(self):
+        coalescer = self.make()
+        coalescer.push("Hello")
+        self.assertEqual(self.frames, [["Hello"]])
+
+    def test_fast_tokens_share_a_frame(self):
+        coalescer = self.make(interval_s=0.025)
+        coalescer.push("a")
+        for token in "bcde":
+            self.clock.now += 0.005
+            coalescer.push(token)
+        self.assertEqual(self.frames, [["a"]])
+        self.clock.now += 0.01
+        coalescer.push("f")
+        self.assertEqual(self.frames, [["a"], ["b", "c", "d", "e", "f"]])
+
+    def test_max_items_forces_a_frame(self):
+        coalescer = self.make(max_items=3)
+        coalescer.push("a")
+        for token in "bcd":
+            coalescer.push(token)
+        self.assertEqual(self.frames, [["a"], ["b", "c", "d"]])
+
+    def test_finish_flushes_remainder(self):
+        coalescer = self.make()
+        coalescer.push("a")
+        coalescer.push("b")
+        coalescer.finish()
+        self.assertEqual(self.frames, [["a"], ["b"]])
+        coalescer.finish()
+        self.assertEqual(coalescer.frames, 2)
+
+    def test_council_events_merge_and_boundaries_flush(self):
+        from ui.stream_coalescer import merge_council_events, is_council_boundary
+        coalescer = self.make(merge=merge_council_events)
+        events = [
+            ("expert_start", "Logic Expert"),
+            ("expert_token", "Logic Expert", "Think "),
+            ("expert_token", "Logic Expert", "first."),
+            ("expert_token", "Math Expert", "Count."),
+            ("expert_done", "Logic Expert", "Think first."),
+        ]
+        for event in events:
+            coalescer.push(event, urgent=is_council_boundary(event))
+        coalescer.finish()
+        self.assertEqual(self.frames, [
+            [("expert_start", "Logic Expert")],
+            [("expert_token", "Logic Expert", "Think first."),
+             ("expert_token", "Math Expert", "Count."),
+             ("expert_done", "Logic Expert", "Think first.")],
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+GhostDrive Linux - Unit Tests: Transcript Store
+Version: 1.0.0
+Created: 2026-10-18
+"""
+
+import sys
+import os
+import base64
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Everything_else"))
+
+
+class ReversibleCipher:
+    """Stands in for Fernet: encrypt/decrypt round-trip, output unreadable as text."""
+
+    def __init__(self):
+        self.decrypts = 0
+
+    def encrypt(self, data):
+        return base64.b64encode(bytes(b ^ 0x5A for b in data))
+
+    def decrypt(self, token):
+        self.decrypts += 1
+        return bytes(b ^ 0x5A for b in base64.b64decode(token))
+
+
+class TestTranscriptStore(unittest.TestCase):
+    """Test segment paging, streaming appends and cleanup."""
+
+    def setUp(self):
+        from transcript_store import TranscriptStore
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cipher = ReversibleCipher()
+        self.session_dir = os.path.join(self.tmp.name, "session")
+        self.store = TranscriptStore(self.cipher, self.session_dir, segment_size=10, resident_segments=2)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fill(self, n):
+        for i in range(n):
+            self.store.add(f"<b>Entry {i}:</b>", f"secret body {i}")
+
+    def test_streamed_text_extends_last_entry(self):
+        self.store.add("<b>Jynx:</b>")
+        self.store.extend("Hello")
+        self.store.extend(" there\nfriend")
+        self.assertEqual(self.store.get(0), ("<b>Jynx:</b>", "Hello there\nfriend"))
+        self.assertEqual(self.store.size(0), (len("<b>Jynx:</b>Hello there\nfriend"), 2))
+
+    def test_extend_on_empty_transcript_adds_entry(self):
+        self.store.extend("orphan")
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(self.store.get(0), ("", "orphan"))
+
+    def test_old_segments_page_out_encrypted(self):
+        self.fill(55)
+        stats = self.store.stats()
+        self.assertEqual(stats["segments_on_disk"], 5)
+        self.assertEqual(stats["resident_segments"], 2)
+        self.assertFalse(self.store.is_resident(0))
+        self.assertTrue(self.store.is_resident(54))
+
+        for name in os.listdir(self.session_dir):
+            with open(os.path.join(self.session_dir, name), "rb") as f:
+                self.assertNotIn(b"secret", f.read())
+
+    def test_paged_out_entries_load_back(self):
+        self.fill(55)
+        self.assertEqual(self.store.get(3), ("<b>Entry 3:</b>", "secret body 3"))
+        self.assertTrue(self.store.is_resident(3))
+        decrypts = self.cipher.decrypts
+        self.store.get(7)
+        self.assertEqual(self.cipher.decrypts, decrypts)
+        self.assertEqual(self.store.stats()["resident_segments"], 2)
+
+    def test_sizes_known_without_loading(self):
+        self.fill(45)
+        self.assertFalse(self.store.is_resident(0))
+        self.assertEqual(self.store.size(0), (len("<b>Entry 0:</b>secret body 0"), 1))
+        self.assertEqual(self.cipher.decrypts, 0)
+
+    def test_sealed_entry_can_still_change(self):
+        self.store.add("<b>Jynx:</b>", "Hel")
+        self.store.add("<b>You:</b> next (queued)")
+        self.fill(40)
+        self.assertFalse(self.store.is_resident(0))
+        self.store.extend("lo", row=0)
+        self.store.set_head(1, "<b>You:</b> next")
+        self.assertEqual(self.store.size(0), (len("<b>Jynx:</b>Hello"), 1))
+        # Page segment 0 out again; the change must survive the round trip
+        self.store.get(25)
+        self.store.get(35)
+        self.assertFalse(self.store.is_resident(0))
+        self.assertEqual(self.store.get(0), ("<b>Jynx:</b>", "Hello"))
+        self.assertEqual(self.store.get(1), ("<b>You:</b> next", ""))
+
+    def test_close_deletes_segments(self):
+        self.fill(25)
+        self.store.close()
+        self.assertEqual(len(self.store), 0)
+        self.assertFalse(os.path.exists(self.session_dir))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -11,39 +11,63 @@ from .style_config import (
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QTextEdit, QLineEdit, QPushButton,
-    QHBoxLayout, QMessageBox, QInputDialog, QLabel, QApplication,
-    QDialog, QDialogButtonBox
+    QHBoxLayout, QMessageBox, QInputDialog, QLabel,
+    QDialog, QDialogButtonBox, QCheckBox
 )
 from PySide6.QtCore import Qt, QThread, Signal, QObject, QEvent
-from PySide6.QtGui import QTextCursor, QTextOption, QFont
+from PySide6.QtGui import QTextOption, QFont
 import sys, os, gc
 
 # ─── System Imports ──────────────────────────────────────────────
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'Everything_else'))
 from Everything_else.command_checker import check_for_commands
 from Everything_else.jynx_operator_ui import execute_command, get_random_prompt
-from Everything_else.model_registry import load_model_from_config
-from Everything_else.ai_council import run_council_streaming
+from Everything_else.model_registry import (
+    load_model_from_config, preload_models, calibrate_idle, validate_models, get_persona, get_config_section
+)
+from Everything_else.inference_telemetry import enable_encrypted_log
+from Everything_else.cancellation import CancelToken
+from Everything_else.ai_council import run_council_streaming, set_router, FIELD_DESCRIPTIONS
+from Everything_else.expert_router import ExpertRouter
+from Everything_else.council_cache import CouncilCache
+from Everything_else.transcript_store import TranscriptStore
+from Everything_else.chat_session import ChatSession
+from Everything_else.inference_queue import (
+    InferenceQueue, InferenceJob, QUEUED, RUNNING, CANCELLED, PRIORITY_BACKGROUND
+)
+from .stream_coalescer import TokenCoalescer, merge_council_events, is_council_boundary
+from .chat_renderer import ChatRenderer, RoleTagFilter
+from .transcript_view import TranscriptView
 
 
 # =====================================================================
 # Normal Chat Streaming Worker
 # =====================================================================
 class StreamWorker(QObject):
-    token_received = Signal(str)
+    """One chat reply; run() is executed by the model's inference worker thread."""
+    # A frame: list of tokens, at most one every ~25 ms (see stream_coalescer)
+    frame_received = Signal(list)
+    started = Signal()
+    queue_position = Signal(int)
     finished = Signal()
     error = Signal(str)
 
-    def __init__(self, llm_fn, prompt, max_tokens=2048, temperature=0.7):
+    def __init__(self, llm_fn, prompt, max_tokens=2048, temperature=0.7, cancel=None):
         super().__init__()
         self.llm_fn = llm_fn
         self.prompt = prompt
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.cancel = cancel
+        self.queued = False  # shown as queued when it was sent
 
-    def run(self):
+    def run(self, cancel=None):
+        cancel = cancel or self.cancel
+        self.started.emit()
+        coalescer = TokenCoalescer(self.frame_received.emit)
         try:
-            for chunk in self.llm_fn(self.prompt, max_tokens=self.max_tokens, temperature=self.temperature):
+            for chunk in self.llm_fn(self.prompt, max_tokens=self.max_tokens,
+                                     temperature=self.temperature, cancel=cancel):
                 token = ""
                 if isinstance(chunk, dict):
                     choices = chunk.get("choices", [])
@@ -57,9 +81,11 @@ class StreamWorker(QObject):
                 else:
                     token = str(chunk)
                 if token:
-                    self.token_received.emit(token)
+                    coalescer.push(token)
+            coalescer.finish()
             self.finished.emit()
         except Exception as e:
+            coalescer.finish()
             self.error.emit(str(e))
 
 
@@ -67,23 +93,56 @@ class StreamWorker(QObject):
 # AI Council Streaming Worker
 # =====================================================================
 class CouncilStreamWorker(QObject):
-    token_received = Signal(object)
+    # A frame: list of council events, adjacent text events of a stage joined
+    frame_received = Signal(list)
     finished = Signal()
     error = Signal(str)
 
-    def __init__(self, user_prompt):
+    def __init__(self, user_prompt, cancel=None, skip_summary=None, cache=None, force_refresh=False):
         super().__init__()
         self.user_prompt = user_prompt
+        self.cancel = cancel
+        self.skip_summary = skip_summary
+        self.cache = cache
+        self.force_refresh = force_refresh
 
     def run(self):
+        coalescer = TokenCoalescer(self.frame_received.emit, merge=merge_council_events)
         try:
-            for event in run_council_streaming(self.user_prompt):
-                self.token_received.emit(event)
+            for event in run_council_streaming(self.user_prompt, cancel=self.cancel,
+                                               skip_summary=self.skip_summary,
+                                               cache=self.cache, force_refresh=self.force_refresh):
+                coalescer.push(event, urgent=is_council_boundary(event))
+            coalescer.finish()
             self.finished.emit()
         except Exception as e:
+            coalescer.finish()
             self.error.emit(str(e))
 
 
+# =====================================================================
+# Background Model Loader
+# =====================================================================
+class ModelLoader(QObject):
+    """Loads a model's weights on its inference worker, ahead of queued prompts."""
+    loaded = Signal(str)
+    failed = Signal(str)
+
+    def __init__(self, model_id):
+        super().__init__()
+        self.model_id = model_id
+
+    def run(self, cancel=None):
+        if cancel is not None and cancel.cancelled:
+            return
+        try:
+            load_model_from_config(self.model_id)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.loaded.emit(self.model_id)
+
+
 # =====================================================================
 # Main ChatPage UI
 # =====================================================================
@@ -93,9 +152,35 @@ class ChatPage(QWidget):
         self.username = username
         self.passphrase = passphrase
         self.fernet = fernet
+        self.cancel_token = None
+        self.reasoning_thread = None
+        self.reasoning_worker = None
+        self.council_threads = []  # running council threads, kept referenced until they end
+        # One persistent worker per loaded model; chat replies queue there in order
+        self.inference = InferenceQueue()
+        self.chat_jobs = []  # (InferenceJob, StreamWorker), queued or running
+        self.stopped_workers = []  # cancelled replies still winding down on their worker
+        self.model_loader = None
+        self.model_job = None
+        self.preload_pending = True  # other `preload: true` models, once chat is ready
 
         # ─── Model Setup ──────────────────────────────────────────────
-        self.llm, self.model_config = load_model_from_config("jynx_default")
+        if get_config_section("telemetry").get("encrypted_log", False):
+            enable_encrypted_log(self.fernet, self.username)
+        council_config = get_config_section("council")
+        self.council_cache = None
+        if council_config.get("cache", True):
+            self.council_cache = CouncilCache.for_user(
+                self.username, self.fernet,
+                max_bytes=int(council_config.get("cache_max_mb", 64)) * 1024 * 1024,
+            )
+        # Routing history is encrypted with this user's key, like the council cache
+        set_router(ExpertRouter.for_user(FIELD_DESCRIPTIONS, self.username, self.fernet))
+        # Only the persona here; the weights load in the background after the window shows
+        self.llm = get_persona("jynx_default")
+        self.model_config = self.llm.config
+        # Conversation memory for normal chat; the council doesn't see it
+        self.chat_session = ChatSession.from_config(self.llm)
         self.max_tokens = self.model_config.get("max_tokens", 4096)
         self.temperature = self.model_config.get("temperature", 0.7)
 
@@ -106,18 +191,19 @@ class ChatPage(QWidget):
         self.setWindowTitle(f"GhostDrive Chat – {self.model_config['name']}")
 
         # Chat Display
-        self.chat_area = QTextEdit()
-        self.chat_area.setReadOnly(True)
-        self.chat_area.setLineWrapMode(QTextEdit.WidgetWidth)
-        self.chat_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.chat_area.setWordWrapMode(QTextOption.WordWrap)
+        # Only visible entries are laid out; older segments page out to encrypted files
+        self.chat_area = TranscriptView(TranscriptStore.for_user(self.username, self.fernet))
         self.chat_area.setFont(QFont(FONT_FAMILY, FONT_SIZE))
-        self.chat_area.setStyleSheet(f"background-color: {COLOR_BG}; color: {COLOR_FG};")
+        # All transcript writes go through the renderer, applied once per frame
+        self.renderer = ChatRenderer(self.chat_area)
+        self.tag_filter = RoleTagFilter()
 
         # Input Area
         self.input_line = QTextEdit()
         self.input_line.installEventFilter(self)
-        self.input_line.setPlaceholderText("Type a message and press [Enter] to send. Ctrl+Enter for Reason.")
+        self.input_line.setPlaceholderText(
+            "Type a message and press [Enter] to send. Ctrl+Enter for Reason, Ctrl+Shift+Enter for a fresh Reason."
+        )
         self.input_line.setLineWrapMode(QTextEdit.WidgetWidth)
         self.input_line.setWordWrapMode(QTextOption.WordWrap)
         self.input_line.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
@@ -135,7 +221,21 @@ class ChatPage(QWidget):
 
         self.reason_button = QPushButton("Reason")
         self.reason_button.setStyleSheet(STYLE_BUTTON)
-        self.reason_button.clicked.connect(self.handle_reason)
+        self.reason_button.clicked.connect(lambda: self.handle_reason())
+
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setStyleSheet(STYLE_BUTTON)
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_generation)
+
+        self.new_chat_button = QPushButton("New Chat")
+        self.new_chat_button.setStyleSheet(STYLE_BUTTON)
+        self.new_chat_button.clicked.connect(self.new_chat)
+
+        # Council: route experts locally and skip the summarizer call
+        self.fast_council_box = QCheckBox("Skip summary")
+        self.fast_council_box.setStyleSheet(STYLE_LABEL)
+        self.fast_council_box.setChecked(get_config_section("council").get("skip_summary", False))
 
         self.loading_label = QLabel("")
         self.loading_label.setStyleSheet(STYLE_LABEL)
@@ -145,6 +245,9 @@ class ChatPage(QWidget):
         btns.addWidget(self.send_button)
         btns.addWidget(self.protocol_button)
         btns.addWidget(self.reason_button)
+        btns.addWidget(self.stop_button)
+        btns.addWidget(self.new_chat_button)
+        btns.addWidget(self.fast_council_box)
 
         layout.addWidget(self.chat_area)
         layout.addWidget(self.input_line)
@@ -152,15 +255,20 @@ class ChatPage(QWidget):
         layout.addWidget(self.loading_label)
         self.setLayout(layout)
 
+        # ─── Startup Model Check (GGUF headers only) ──────────────────
+        for problem in validate_models():
+            self.log(problem)
+        self._load_default_model()
+
     # =================================================================
     # Keyboard Handling (Enter / Ctrl+Enter)
     # =================================================================
     def eventFilter(self, obj, event):
         if obj == self.input_line and event.type() == QEvent.KeyPress:
             if event.key() in (Qt.Key_Return, Qt.Key_Enter):
-                # Ctrl + Enter → Reasoning
+                # Ctrl + Enter → Reasoning (Shift skips the council cache)
                 if event.modifiers() & Qt.ControlModifier:
-                    self.handle_reason()
+                    self.handle_reason(force_refresh=bool(event.modifiers() & Qt.ShiftModifier))
                 # Enter → Normal Send
                 elif event.modifiers() == Qt.NoModifier:
                     self.handle_prompt()
@@ -172,81 +280,259 @@ class ChatPage(QWidget):
     # UI Methods
     # =================================================================
     def log(self, text):
-        self.chat_area.append(f"<span style='color:{COLOR_HIGHLIGHT};'>[log]</span> {text}")
-        QApplication.processEvents()
+        self.renderer.append(f"<span style='color:{COLOR_HIGHLIGHT};'>[log]</span> {text}")
 
     def append_message(self, sender, text):
         if sender in ["⚙️ Protocol", "🔒 Soul Vent"]:
-            self.chat_area.append(f"<span style='color:{COLOR_PROTOCOL};'><b>{sender}:</b> {text}</span>")
+            self.renderer.append(f"<span style='color:{COLOR_PROTOCOL};'><b>{sender}:</b> {text}</span>")
         elif sender == "You":
-            self.chat_area.append(f"<span style='color:{COLOR_FG};'><b>{sender}:</b> {text}</span>")
+            self.renderer.append(f"<span style='color:{COLOR_FG};'><b>{sender}:</b> {text}</span>")
         else:
             if text.strip() == "":
-                self.chat_area.append(f"<b style='color:{COLOR_ACCENT};'>{sender}:</b>")
+                self.renderer.append(f"<b style='color:{COLOR_ACCENT};'>{sender}:</b>")
             else:
-                self.chat_area.append(f"<b style='color:{COLOR_ACCENT};'>{sender}:</b> {text}")
+                self.renderer.append(f"<b style='color:{COLOR_ACCENT};'>{sender}:</b> {text}")
+
 
+    def shutdown(self):
+        """Stop generating and delete this session's paged-out transcript."""
+        self._cancel_generation()
+        if self.model_job is not None:
+            self.model_job.cancel()
+        # A load in progress can't be interrupted; its daemon thread ends with the app
+        self.inference.shutdown(wait=False)
+        # A council thread still running when Qt tears down aborts the process; give it a moment
+        for thread in list(self.council_threads):
+            thread.wait(3000)
+        self.chat_area.close_session()
 
     def restore_default_model(self):
-        self.llm, self.model_config = load_model_from_config("jynx_default")
+        """Bring Jynx's weights back after a council run without blocking the UI."""
+        self._refresh_persona()
         gc.collect()
+        self._load_default_model()
+
+    def _load_default_model(self):
+        if self._model_loading():
+            return
+        loader = ModelLoader("jynx_default")
+        job = InferenceJob(loader.run, label="load jynx_default")
+        loader.loaded.connect(self._on_model_loaded)
+        loader.failed.connect(self._on_model_failed)
+        self.model_loader, self.model_job = loader, job
+        # Prompts sent meanwhile queue behind this job on the same worker
+        self.inference.submit(self._inference_key(), job)
+        self._show_queue()
+
+    def _model_loading(self):
+        return self.model_job is not None and self.model_job.state in (QUEUED, RUNNING)
+
+    def _on_model_loaded(self, model_id):
+        self.model_job = None
+        print(f"[Jynx] {model_id} ready")
+        self._show_queue()
+        if self.preload_pending:
+            # Own worker, so queued chat prompts don't wait for council weights
+            self.preload_pending = False
+            self.inference.submit("preload", InferenceJob(lambda cancel: preload_models(),
+                                                          priority=PRIORITY_BACKGROUND, label="preload"))
+            # Waits for an idle pool and gives way to any prompt
+            self.inference.submit("preload", InferenceJob(calibrate_idle, priority=PRIORITY_BACKGROUND,
+                                                          label="calibrate"))
+
+    def _on_model_failed(self, err_msg):
+        self.model_job = None
+        self.log(f"⚠️ Could not load {self.model_config['name']}: {err_msg}")
+        self._show_queue()
+
+    def _inference_key(self):
+        # Personas sharing weights share a worker, so only one decode runs per context
+        return getattr(self.llm, "pool_key", None) or self.llm.model_id
+
+    def _refresh_persona(self):
+        """Pick up models.yaml edits (prompt, temperature) without reloading weights."""
+        self.llm = get_persona("jynx_default")
+        self.chat_session.persona = self.llm
+        self.model_config = self.llm.config
+        self.max_tokens = self.model_config.get("max_tokens", 4096)
+        self.temperature = self.model_config.get("temperature", 0.7)
 
     # =================================================================
-    # Chat Handling
+    # Cancellation
     # =================================================================
-    def _append_streamed_token(self, token):
-        if not self.response_buffer:
-            token = token.strip()
-            for t in ("user:", "assistant:", "system:", "you:"):
-                if token.lower().startswith(t):
-                    token = token[len(t):].strip()
-
-        if any(tag in token.lower() for tag in ("user:", "assistant:", "system:", "you:")):
+    def _new_cancel_token(self):
+        """Cancel whatever is still generating and hand out a fresh token."""
+        self._cancel_generation()
+        self.cancel_token = CancelToken()
+        self._update_stop_button()
+        return self.cancel_token
+
+    def _cancel_generation(self):
+        self._cancel_chat_jobs()
+        self._cancel_council()
+
+    def _cancel_council(self):
+        """Stop the council run without waiting; its thread winds down on its own."""
+        if self.cancel_token is None:
             return
+        self.cancel_token.cancel()
+        # Decoding stops at the next token. Nothing waits for that here: the next
+        # request on the same weights queues on the pool's decode lock instead
+        worker = self.reasoning_worker
+        if worker is not None:
+            for signal, slot in ((worker.frame_received, self._handle_council_frame),
+                                 (worker.finished, self._handle_council_finished),
+                                 (worker.error, self._handle_reason_error)):
+                try:
+                    signal.disconnect(slot)
+                except (RuntimeError, TypeError):
+                    pass  # already disconnected or deleted
+            self.reasoning_worker = None
+            self.reasoning_thread = None
+        self._release_cancel_token(self.cancel_token)
+
+    def _cancel_chat_jobs(self):
+        """Drop queued chat prompts and stop the one being answered, without waiting."""
+        jobs, self.chat_jobs = self.chat_jobs, []
+        for job, worker in jobs:
+            job.cancel()
+            # Queued prompts are gone now; a running reply stops at its next token and
+            # its worker is kept until it signals, so late frames find it and are ignored
+            if job.state == CANCELLED and job.started_at is None:
+                self.renderer.head((worker, "prompt"), self._prompt_html(worker.prompt, "not sent"))
+                self._release_entries(worker)
+            else:
+                self.stopped_workers.append(worker)
+        self._show_queue()
+        self._update_stop_button()
+
+    def _release_cancel_token(self, token):
+        # Late signals from an already-replaced run must not clear the new token
+        if token is self.cancel_token:
+            self.cancel_token = None
+            self._update_stop_button()
+
+    def _update_stop_button(self):
+        self.stop_button.setEnabled(self.cancel_token is not None or bool(self.chat_jobs))
+
+    def new_chat(self):
+        """Forget the conversation so the next prompt starts fresh."""
+        self._cancel_generation()
+        self.chat_session.reset()
+        self.log("New conversation — earlier messages are no longer sent to the model.")
+
+    def stop_generation(self):
+        if self.cancel_token is None and not self.chat_jobs:
+            return
+        self._cancel_generation()
+        self.renderer.append("🛑 Stopped.\n")
+        self._show_queue()
 
-        self.response_buffer += token
-        self.chat_area.insertPlainText(token)
-        self.chat_area.moveCursor(QTextCursor.End)
-        QApplication.processEvents()
-
+    # =================================================================
+    # Chat Handling
+    # =================================================================
+    def _live_worker(self):
+        """The StreamWorker behind the current signal, or None once its job was stopped."""
+        worker = self.sender()
+        return worker if any(w is worker for _job, w in self.chat_jobs) else None
+
+    def _prompt_html(self, prompt, status=None):
+        """The "You:" entry; `status` marks a prompt that hasn't reached the model."""
+        note = f" <i style='color:{COLOR_HIGHLIGHT};'>({status})</i>" if status else ""
+        return f"<span style='color:{COLOR_FG};'><b>You:</b> {prompt}{note}</span>"
+
+    def _release_entries(self, worker):
+        self.renderer.release((worker, "prompt"))
+        self.renderer.release((worker, "reply"))
+
+    def _append_streamed_frame(self, tokens):
+        """Queue one frame of coalesced tokens, minus any role tags."""
+        worker = self._live_worker()
+        if worker is None:
+            return
+        text = self.tag_filter.feed("".join(tokens))
+        self.response_buffer += text
+        # Into this reply's own row: prompts queued meanwhile sit below it
+        self.renderer.text(text, key=(worker, "reply"))
+
+    def _on_stream_started(self):
+        """A queued prompt reached the model: clear its mark and open its reply."""
+        worker = self._live_worker()
+        if worker is None:
+            return
+        if worker.queued:
+            self.renderer.head((worker, "prompt"), self._prompt_html(worker.prompt))
+        # Bold header properly using HTML
+        self.renderer.append(f"<b style='color:{COLOR_ACCENT};'>{self.model_config['name']}:</b>",
+                             key=(worker, "reply"))
+        self.response_buffer = ""
+        self.tag_filter = RoleTagFilter()
+        self._show_queue()
 
     def _on_stream_finished(self):
-        self.chat_area.append("")
+        worker = self._live_worker()
+        if worker is not None:
+            self.renderer.text(self.tag_filter.finish(), key=(worker, "reply"))
+            # The spacer would land under prompts still waiting
+            if not any(job.state == QUEUED for job, _w in self.chat_jobs):
+                self.renderer.append("")
+        self._chat_job_done(self.sender())
 
     def _handle_stream_error(self, err_msg):
-        QMessageBox.critical(self, "Stream Error", f"Jynx failed:\n{err_msg}")
+        if self._live_worker() is not None:
+            QMessageBox.critical(self, "Stream Error", f"Jynx failed:\n{err_msg}")
+        self._chat_job_done(self.sender())
+
+    def _chat_job_done(self, worker):
+        self._release_entries(worker)
+        self.chat_jobs = [(j, w) for j, w in self.chat_jobs if w is not worker]
+        self.stopped_workers = [w for w in self.stopped_workers if w is not worker]
+        self._show_queue()
+        self._update_stop_button()
+
+    def _show_queue(self, _position=None):
+        waiting = sum(1 for job, _worker in self.chat_jobs if job.state == QUEUED)
+        queued = f"{waiting} prompt{'s' if waiting > 1 else ''}"
+        if self._model_loading():
+            detail = f"{queued} queued." if waiting else "You can type while it warms up."
+            self.loading_label.setText(f"Loading {self.model_config['name']}... {detail}")
+        elif waiting:
+            self.loading_label.setText(f"{queued} waiting for the model...")
+        elif self.cancel_token is None:
+            self.loading_label.setText("")
 
     def handle_prompt(self):
         prompt = self.input_line.toPlainText().strip()
         if not prompt:
             return
 
-        self.append_message("You", prompt)
         self.input_line.clear()
-
-        # Bold header properly using HTML
-        self.chat_area.moveCursor(QTextCursor.End)
-        self.chat_area.insertHtml(f"<br> <b style='color:{COLOR_ACCENT};'>{self.model_config['name']}:</b> ")
-        self.chat_area.moveCursor(QTextCursor.End)
-
-        self.response_buffer = ""
-
-        self.thread = QThread()
-        self.worker = StreamWorker(self.llm, prompt, max_tokens=self.max_tokens, temperature=self.temperature)
-        self.worker.moveToThread(self.thread)
-        self.worker.token_received.connect(self._append_streamed_token)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self._on_stream_finished)
-        self.worker.error.connect(self._handle_stream_error)
-        self.thread.started.connect(self.worker.run)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.thread.start()
+        # A running council gives way to the prompt; queued prompts stay queued
+        self._cancel_council()
+        self._refresh_persona()
+
+        worker = StreamWorker(self.chat_session.send, prompt, max_tokens=self.max_tokens,
+                              temperature=self.temperature)
+        # Shown now, marked while something is ahead of it, so the input never seems lost
+        worker.queued = bool(self.chat_jobs) or self._model_loading()
+        self.renderer.append(self._prompt_html(prompt, "queued" if worker.queued else None),
+                             key=(worker, "prompt"))
+        job = InferenceJob(worker.run, on_position=worker.queue_position.emit, label="chat")
+        # Signals arrive from the worker thread; slots find their reply through sender()
+        worker.started.connect(self._on_stream_started)
+        worker.queue_position.connect(self._show_queue)
+        worker.frame_received.connect(self._append_streamed_frame)
+        worker.finished.connect(self._on_stream_finished)
+        worker.error.connect(self._handle_stream_error)
+        self.chat_jobs.append((job, worker))
+        self._update_stop_button()
+        self.inference.submit(self._inference_key(), job)
 
 
     # =================================================================
     # Council (Reasoning)
     # =================================================================
-    def handle_reason(self):
+    def handle_reason(self, force_refresh=False):
         user_prompt = self.input_line.toPlainText().strip()
         if not user_prompt:
             return
@@ -254,20 +540,43 @@ class ChatPage(QWidget):
         # Log user message
         self.append_message("You", user_prompt)
         self.input_line.clear()
+        cancel = self._new_cancel_token()
         self.append_message("Council", "AI Council Summoned...\n")
         self.loading_label.setText("Reasoning in progress...")
 
         # Initialize council stream
-        self.chat_area.append("<b>Summary:</b>")
-        self.reasoning_thread = QThread()
-        self.reasoning_worker = CouncilStreamWorker(user_prompt)
-        self.reasoning_worker.moveToThread(self.reasoning_thread)
-        self.reasoning_thread.started.connect(self.reasoning_worker.run)
-        self.reasoning_worker.token_received.connect(self._handle_council_event)
-        self.reasoning_worker.finished.connect(self._handle_council_finished)
-        self.reasoning_worker.error.connect(self._handle_reason_error)
-        self.reasoning_thread.finished.connect(self.reasoning_thread.deleteLater)
-        self.reasoning_thread.start()
+        self._reset_expert_sections()
+        self.renderer.append("<b>Summary:</b>")
+        thread = QThread()
+        worker = CouncilStreamWorker(user_prompt, cancel=cancel,
+                                     skip_summary=self.fast_council_box.isChecked(),
+                                     cache=self.council_cache,
+                                     force_refresh=force_refresh)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.frame_received.connect(self._handle_council_frame)
+        worker.finished.connect(self._handle_council_finished)
+        worker.error.connect(self._handle_reason_error)
+        # The thread ends itself once run() returns, whether it finished or was stopped
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(self._forget_council_thread)
+        self.reasoning_thread, self.reasoning_worker = thread, worker
+        self.council_threads.append(thread)
+        thread.start()
+
+    def _forget_council_thread(self):
+        thread = self.sender()
+        self.council_threads = [t for t in self.council_threads if t is not thread]
+
+    def _handle_council_frame(self, events):
+        # Frames queued by a run that was stopped meanwhile are dropped
+        if self.sender() is not self.reasoning_worker:
+            return
+        for event in events:
+            self._handle_council_event(event)
 
     def _handle_council_event(self, event):
         """
@@ -276,66 +585,106 @@ class ChatPage(QWidget):
         ("summary_done", "")
         ("expert_start", expert_name)
         ("expert_token", expert_name, token)
-        ("expert_done", expert_name)
+        ("expert_done", expert_name, text)
         ("verdict_start", "")
         ("verdict_token", token)
         ("verdict_done", "")
         ("done", "")
+        ("cancelled", "")
+        ("cache_hit", "")
         """
         etype = event[0]
 
+        if etype == "cache_hit":
+            self.log("Replaying a stored council answer (Ctrl+Shift+Enter for a fresh run).")
+            return
+
         # Handle summary and verdict tokens normally
         if etype == "summary":
             token = event[1]
-            self.chat_area.insertPlainText(token)
-            self.chat_area.moveCursor(QTextCursor.End)
+            self.renderer.text(token)
 
         elif etype == "expert_start":
             expert_name = event[1]
-            self.chat_area.append(f"\n<b>{expert_name}:</b>\n")
+            self._expert_order.append(expert_name)
+            self._expert_buffers[expert_name] = ""
+            if self._expert_shown is None:
+                self._show_next_expert()
 
         elif etype == "expert_token":
-            # FIXED: properly unpack expert_name and token
+            # Independent rounds interleave experts; only the shown one is printed live
             if len(event) >= 3:
                 expert_name, token = event[1], event[2]
-                self.chat_area.insertPlainText(token)
-                self.chat_area.moveCursor(QTextCursor.End)
+                if expert_name == self._expert_shown:
+                    self.renderer.text(token)
+                else:
+                    self._expert_buffers[expert_name] = self._expert_buffers.get(expert_name, "") + token
+
+        elif etype == "expert_done":
+            expert_name = event[1]
+            self._experts_done.add(expert_name)
+            if expert_name == self._expert_shown:
+                self.renderer.append("")
+                self._show_next_expert()
 
         elif etype == "verdict_start":
-            self.chat_area.append("\n<b>Final Verdict:</b>\n")
+            self.renderer.append("\n<b>Final Verdict:</b>\n")
 
         elif etype == "verdict_token":
             token = event[1]
-            self.chat_area.insertPlainText(token)
-            self.chat_area.moveCursor(QTextCursor.End)
+            self.renderer.text(token)
 
         # Add spacing after sections finish
-        elif etype in ["summary_done", "expert_done", "verdict_done"]:
-            self.chat_area.append("")
+        elif etype in ["summary_done", "verdict_done"]:
+            self.renderer.append("")
 
         # End of council
         elif etype == "done":
-            self.chat_area.append("🧠 Council ended.\n")
+            self.renderer.append("🧠 Council ended.\n")
             self.loading_label.setText("")
             self.restore_default_model()
 
+        elif etype == "cancelled":
+            self.renderer.append("🛑 Council stopped.\n")
+            self.loading_label.setText("")
+
+    def _reset_expert_sections(self):
+        self._expert_order = []
+        self._expert_buffers = {}
+        self._experts_done = set()
+        self._expert_shown = None
+        self._experts_printed = 0
+
+    def _show_next_expert(self):
+        """Print the next expert section in order, including anything it buffered."""
+        self._expert_shown = None
+        for expert_name in self._expert_order[self._experts_printed:]:
+            self._experts_printed += 1
+            self.renderer.append(f"\n<b>{expert_name}:</b>\n")
+            self.renderer.text(self._expert_buffers.pop(expert_name, ""))
+            if expert_name not in self._experts_done:
+                self._expert_shown = expert_name
+                return
+            self.renderer.append("")
+
     def _handle_reason_error(self, err_msg):
+        worker = self.sender()
+        if worker is not self.reasoning_worker:
+            return
         self.append_message("❌ Council Error", err_msg)
-        self.loading_label.setText("")
-        try:
-            self.reasoning_thread.quit()
-            self.reasoning_thread.wait()
-        except:
-            pass
-        self.restore_default_model()
+        self._end_council(worker)
 
     def _handle_council_finished(self):
+        worker = self.sender()
+        if worker is not self.reasoning_worker:
+            return
+        self._end_council(worker)
+
+    def _end_council(self, worker):
         self.loading_label.setText("")
-        try:
-            self.reasoning_thread.quit()
-            self.reasoning_thread.wait()
-        except:
-            pass
+        self.reasoning_worker = None
+        self.reasoning_thread = None
+        self._release_cancel_token(worker.cancel)
         self.restore_default_model()
 
 
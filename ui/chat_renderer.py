@@ -0,0 +1,162 @@
+# =====================================================================
+# chat_renderer.py — Timer-Flushed Rendering of the Chat Transcript
+# =====================================================================
+#
+# Every write to the transcript (streamed text, headers, log lines) is
+# queued here and applied to the TranscriptView at most once per
+# `interval_ms`, so rows are added and re-measured once per frame instead
+# of once per token. Nothing re-enters the event loop: the view repaints
+# when the GUI thread gets back to it.
+#
+# RoleTagFilter strips role tags ("User:", "Assistant:" ...) that a model
+# writes at the start of a line, even when a tag is split across tokens.
+# Both are free of Qt at import time so they can be tested on their own.
+
+DEFAULT_INTERVAL_MS = 33
+
+ROLE_TAGS = ("user:", "assistant:", "system:", "you:")
+
+
+class RoleTagFilter:
+    """
+    feed() streamed text and get back what should be shown. Text at the
+    start of a line is held until it can't be a role tag any more; tags
+    (and the spaces after them) are dropped, as is leading whitespace of
+    the reply. finish() returns anything still held.
+    """
+
+    START, LINE_START, AFTER_TAG, IN_LINE = range(4)
+
+    def __init__(self, tags=ROLE_TAGS):
+        self.tags = tuple(t.lower() for t in tags)
+        self.state = self.START
+        self._held = ""
+
+    def feed(self, text):
+        out = []
+        i, n = 0, len(text)
+        while i < n:
+            if self.state == self.IN_LINE:
+                end = text.find("\n", i)
+                if end < 0:
+                    out.append(text[i:])
+                    break
+                out.append(text[i:end + 1])
+                i = end + 1
+                self.state = self.LINE_START
+                continue
+
+            ch = text[i]
+            i += 1
+            word = self._held.lstrip()
+            if ch.isspace() and not word:
+                if self.state == self.LINE_START:
+                    # Indentation: shown unless a tag follows
+                    self._held += ch
+                    if ch == "\n":
+                        out.append(self._held)
+                        self._held = ""
+                continue  # at the start of the reply or after a tag: dropped
+
+            candidate = (word + ch).lower()
+            if candidate in self.tags:
+                self._held = ""
+                self.state = self.AFTER_TAG
+            elif any(tag.startswith(candidate) for tag in self.tags):
+                self._held += ch
+            else:
+                out.append(self._held + ch)
+                self._held = ""
+                self.state = self.LINE_START if ch == "\n" else self.IN_LINE
+        return "".join(out)
+
+    def finish(self):
+        held, self._held = self._held, ""
+        self.state = self.START
+        return held
+
+
+class ChatRenderer:
+    """
+    Queue of transcript writes for `view` (a TranscriptView). append()
+    starts a new entry with an HTML head, like QTextEdit.append; text()
+    adds plain text to the newest entry. An entry appended with a `key`
+    can be written to later by key, even after newer entries were added,
+    until release(key). The queue is applied by a single-shot timer, or
+    at once with flush().
+    """
+
+    def __init__(self, view, interval_ms=DEFAULT_INTERVAL_MS, timer=None):
+        self.view = view
+        self.frames = 0
+        self._ops = []
+        self._rows = {}  # key → row, for entries appended with a key
+        if timer is None:
+            from PySide6.QtCore import QTimer
+            timer = QTimer(view)
+        self._timer = timer
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def text(self, text, key=None):
+        if not text:
+            return
+        op = ("text", text) if key is None else ("text", text, key)
+        last = self._ops[-1] if self._ops else None
+        if last and last[0] == "text" and last[2:] == op[2:]:
+            self._ops[-1] = ("text", last[1] + text) + op[2:]
+        else:
+            self._ops.append(op)
+        self._schedule()
+
+    def append(self, html="", key=None):
+        self._ops.append(("append", html) if key is None else ("append", html, key))
+        self._schedule()
+
+    def head(self, key, html):
+        """Replace the head of the entry appended with `key`."""
+        self._ops.append(("head", html, key))
+        self._schedule()
+
+    def release(self, key):
+        """Stop tracking `key`; later writes to it are dropped."""
+        self._ops.append(("release", None, key))
+        self._schedule()
+
+    @property
+    def pending(self):
+        return len(self._ops)
+
+    def _schedule(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        self._timer.stop()
+        if not self._ops:
+            return
+        ops, self._ops = self._ops, []
+        self.frames += 1
+        self._apply(ops)
+
+    def _apply(self, ops):
+        # Stay at the bottom unless the user scrolled up to read
+        follow = self.view.at_bottom()
+        for kind, payload, *key in ops:
+            key = key[0] if key else None
+            if kind == "append":
+                row = self.view.add(payload)
+                if key is not None:
+                    self._rows[key] = row
+            elif kind == "release":
+                self._rows.pop(key, None)
+            elif key is None:
+                self.view.extend(payload)
+            elif key in self._rows:
+                if kind == "text":
+                    self.view.extend(payload, self._rows[key])
+                else:
+                    self.view.set_head(self._rows[key], payload)
+        if follow:
+            self.view.scrollToBottom()
@@ -73,6 +73,10 @@ class GhostDriveMainWindow(QMainWindow):
         root_layout.addWidget(self.stack)
         self.stack.setCurrentWidget(self.pages["Chat"])
 
+    def closeEvent(self, event):
+        self.pages["Chat"].shutdown()
+        super().closeEvent(event)
+
     # ─── Page Switching Logic ────────────────────────────
     def change_page(self):
         clicked_button = self.sender()
@@ -2,7 +2,7 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QListWidget, QLabel, QPushButton, QInputDialog, QMessageBox,
     QListWidgetItem, QHBoxLayout, QProgressBar
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread, QObject, Signal
 from project_manager import list_project_files, load_project_file, save_project_file, delete_project_file, PROJECTS_DIR
 import os
 from .style_config import (
@@ -12,6 +12,39 @@ from .style_config import (
 )
 
 
+class SuggestionWorker(QObject):
+    """Runs the AI suggestion prompt off the GUI thread; stops when `cancel` fires."""
+    finished = Signal(str)
+    error = Signal(str)
+
+    def __init__(self, prompt, cancel):
+        super().__init__()
+        self.prompt = prompt
+        self.cancel = cancel
+
+    def run(self):
+        try:
+            from Everything_else.model_registry import load_model_from_config, get_stop_sequence
+            llm_fn, cfg = load_model_from_config("jynx_expert_math")
+
+            buffer = ""
+            for chunk in llm_fn(
+                self.prompt,
+                stream_override=True,
+                max_tokens=cfg.get("generation_token_limit", 300),
+                temperature=0.7,
+                stop=get_stop_sequence("jynx_expert_math"),
+                cancel=self.cancel,
+            ):
+                token = chunk.get("choices", [{}])[0].get("text") or \
+                        chunk.get("choices", [{}])[0].get("delta", {}).get("content", "")
+                buffer += token or ""
+
+            self.finished.emit(buffer.strip())
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class ProjectsPage(QWidget):
     def __init__(self, username, passphrase, fernet):
         super().__init__()
@@ -19,6 +52,7 @@ class ProjectsPage(QWidget):
         self.username = username
         self.passphrase = passphrase
         self.fernet = fernet
+        self.suggest_cancel = None
 
         self.setWindowTitle("Projects")
 
@@ -381,6 +415,11 @@ class ProjectsPage(QWidget):
 
 
     def generate_ai_suggestions(self):
+        # A second click while generating stops the running request
+        if self.suggest_cancel is not None:
+            self.suggest_cancel.cancel()
+            return
+
         if not hasattr(self, "current_project_data"):
             QMessageBox.warning(self, "No Project", "Open a project first.")
             return
@@ -436,24 +475,32 @@ DO NOT WRITE ANYTHING ELSE — only use the format above.
 
 
 
-        try:
-            from Everything_else.model_registry import load_model_from_config, get_stop_sequence
-            llm_fn, cfg = load_model_from_config("jynx_expert_math")
+        from Everything_else.cancellation import CancelToken
 
-            buffer = ""
-            for chunk in llm_fn(
-                prompt,
-                stream_override=True,
-                max_tokens=cfg.get("generation_token_limit", 300),
-                temperature=0.7,
-                stop=get_stop_sequence("jynx_expert_math"),
-            ):
-                token = chunk.get("choices", [{}])[0].get("text") or \
-                        chunk.get("choices", [{}])[0].get("delta", {}).get("content", "")
-                buffer += token or ""
+        self.suggest_cancel = CancelToken()
+        self.ai_suggest_btn.setText("Stop AI")
 
-            QMessageBox.information(self, "AI Suggestions", buffer.strip())
+        self.suggest_thread = QThread()
+        self.suggest_worker = SuggestionWorker(prompt, self.suggest_cancel)
+        self.suggest_worker.moveToThread(self.suggest_thread)
+        self.suggest_thread.started.connect(self.suggest_worker.run)
+        self.suggest_worker.finished.connect(self.suggest_thread.quit)
+        self.suggest_worker.error.connect(self.suggest_thread.quit)
+        self.suggest_worker.finished.connect(self._on_suggestions_ready)
+        self.suggest_worker.error.connect(self._on_suggestions_error)
+        self.suggest_thread.finished.connect(self.suggest_thread.deleteLater)
+        self.suggest_thread.start()
 
-        except Exception as e:
-            QMessageBox.critical(self, "AI Error", f"Something went wrong:\n\n{str(e)}")
+    def _on_suggestions_ready(self, text):
+        cancelled = self.suggest_cancel is not None and self.suggest_cancel.cancelled
+        self._reset_suggest_button()
+        if not cancelled:
+            QMessageBox.information(self, "AI Suggestions", text)
+
+    def _on_suggestions_error(self, err_msg):
+        self._reset_suggest_button()
+        QMessageBox.critical(self, "AI Error", f"Something went wrong:\n\n{err_msg}")
 
+    def _reset_suggest_button(self):
+        self.suggest_cancel = None
+        self.ai_suggest_btn.setText("AI Suggestions")
@@ -0,0 +1,174 @@
+# =====================================================================
+# transcript_view.py — Model/View Chat Transcript
+# =====================================================================
+#
+# A QListView over a TranscriptStore: one row per entry, drawn by a
+# delegate that lays out rich text only for rows on screen. Rows whose
+# segment is paged out are sized from their stored character and line
+# counts, so scrolling a long session never loads the whole transcript.
+
+import html
+
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView, QApplication, QStyle
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize
+from PySide6.QtGui import QTextDocument, QAbstractTextDocumentLayout, QColor, QFontMetrics, QKeySequence
+
+from .style_config import COLOR_BG, COLOR_FG
+
+ENTRY_ROLE = Qt.UserRole + 1
+ROW_PADDING = 4
+
+
+def entry_html(head, body):
+    """Rich text for one entry: the HTML head, then the body as plain text."""
+    text = html.escape(body).replace("\n", "<br>")
+    if head and text:
+        return f"{head} {text}"
+    return head or text or "&nbsp;"
+
+
+def entry_plain(head, body):
+    doc = QTextDocument()
+    doc.setHtml(head)
+    head = doc.toPlainText()
+    return f"{head} {body}".strip() if head else body
+
+
+class TranscriptModel(QAbstractListModel):
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == ENTRY_ROLE:
+            return self.store.get(index.row())
+        if role == Qt.DisplayRole:
+            return entry_plain(*self.store.get(index.row()))
+        return None
+
+    def add(self, head, body=""):
+        row = len(self.store)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.store.add(head, body)
+        self.endInsertRows()
+        return row
+
+    def extend(self, text, row=None):
+        if not len(self.store):
+            self.add("", text)
+            return None
+        index = self.index(self.store.extend(text, row))
+        self.dataChanged.emit(index, index)
+        return index
+
+    def set_head(self, row, head):
+        self.store.set_head(row, head)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+        return index
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.close()
+        self.endResetModel()
+
+
+class TranscriptDelegate(QStyledItemDelegate):
+    """Lays out and paints entries; exact heights for loaded rows, estimates otherwise."""
+
+    def __init__(self, store, parent):
+        super().__init__(parent)
+        self.store = store
+        self._heights = {}  # row → (width, chars, height)
+
+    def _document(self, index, font, width):
+        doc = QTextDocument()
+        doc.setDefaultFont(font)
+        doc.setDocumentMargin(ROW_PADDING)
+        doc.setHtml(entry_html(*index.data(ENTRY_ROLE)))
+        doc.setTextWidth(width)
+        return doc
+
+    def _width(self):
+        return max(50, self.parent().viewport().width())
+
+    def paint(self, painter, option, index):
+        doc = self._document(index, option.font, option.rect.width())
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(context.palette.ColorRole.Text, QColor(COLOR_FG))
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        painter.translate(option.rect.topLeft())
+        doc.documentLayout().draw(painter, context)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        row = index.row()
+        width = self._width()
+        chars, lines = self.store.size(row)
+        cached = self._heights.get(row)
+        if cached and cached[:2] == (width, chars):
+            return QSize(width, cached[2])
+        if self.store.is_resident(row):
+            height = int(self._document(index, option.font, width).size().height())
+            self._heights[row] = (width, chars, height)
+            return QSize(width, height)
+        # Paged out and never measured at this width: estimate from the counts
+        metrics = QFontMetrics(option.font)
+        per_line = max(1, width // max(1, metrics.averageCharWidth()))
+        wrapped = max(lines, -(-chars // per_line))
+        return QSize(width, wrapped * metrics.lineSpacing() + 2 * ROW_PADDING)
+
+    def forget(self):
+        self._heights.clear()
+
+
+class TranscriptView(QListView):
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.transcript = TranscriptModel(store, self)
+        self.delegate = TranscriptDelegate(store, self)
+        self.setModel(self.transcript)
+        self.setItemDelegate(self.delegate)
+        self.setUniformItemSizes(False)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(50)
+        self.setResizeMode(QListView.Adjust)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setStyleSheet(f"background-color: {COLOR_BG}; color: {COLOR_FG}; border: none;")
+
+    def add(self, head, body=""):
+        return self.transcript.add(head, body)
+
+    def extend(self, text, row=None):
+        index = self.transcript.extend(text, row)
+        if index is not None:
+            # The row grew; QListView only re-measures rows on this signal
+            self.delegate.sizeHintChanged.emit(index)
+
+    def set_head(self, row, head):
+        self.delegate.sizeHintChanged.emit(self.transcript.set_head(row, head))
+
+    def at_bottom(self):
+        bar = self.verticalScrollBar()
+        return bar.value() >= bar.maximum() - 4
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            rows = sorted(index.row() for index in self.selectedIndexes())
+            QApplication.clipboard().setText("\n".join(
+                self.transcript.index(row).data(Qt.DisplayRole) for row in rows))
+            return
+        super().keyPressEvent(event)
+
+    def close_session(self):
+        self.delegate.forget()
+        self.transcript.clear()